@@ -67,8 +67,10 @@ class CPUProfiler:
 
         try:
             while not self.cpu.halted and cycles < max_cycles:
-                self.cpu.step()
-                cycles += 1
+                result = self.cpu.run(min(1000, max_cycles - cycles))
+                cycles += result.cycles
+                if result.reason == cpu.RunResult.EXCEPTION:
+                    raise result.error
 
                 if cycles % 1000 == 0:
                     print(f"Executed {cycles} cycles...")
@@ -97,8 +99,10 @@ class CPUProfiler:
         cycles = 0
         try:
             while not self.cpu.halted and cycles < max_cycles:
-                self.cpu.step()
-                cycles += 1
+                result = self.cpu.run(min(1000, max_cycles - cycles))
+                cycles += result.cycles
+                if result.reason == cpu.RunResult.EXCEPTION:
+                    raise result.error
 
                 if cycles % 1000 == 0:
                     print(f"Executed {cycles} cycles...")
@@ -144,9 +148,10 @@ class CPUProfiler:
         start_time = time.time()
         cycles = 0
 
-        while not self.cpu.halted and cycles < 1000:
-            self.cpu.step()
-            cycles += 1
+        result = self.cpu.run(1000)
+        cycles = result.cycles
+        if result.reason == cpu.RunResult.EXCEPTION:
+            raise result.error
 
         end_time = time.time()
         total_time = end_time - start_time
@@ -188,7 +193,9 @@ class CPUProfiler:
         start_time = time.time()
 
         while not self.cpu.halted:
-            self.cpu.step()
+            result = self.cpu.run(1000)
+            if result.reason == cpu.RunResult.EXCEPTION:
+                raise result.error
 
         end_time = time.time()
         total_time = end_time - start_time
@@ -20,7 +20,7 @@ from nova_cpu import CPU
 from nova_memory import Memory
 from nova_gfx import GFX
 from nova_keyboard import NovaKeyboard
-from nova_sound import NovaSound
+from nova_sound import NovaSound, NullAudioBackend
 
 # Import the optimizer
 try:
@@ -42,7 +42,7 @@ class ForthCompiler:
         self.memory = Memory(0x10000)
         self.gfx = GFX()
         self.keyboard = NovaKeyboard()
-        self.sound = NovaSound()
+        self.sound = NovaSound(backend=NullAudioBackend())  # Reference only, never plays
         self.sound.set_memory_reference(self.memory)
         self.cpu = CPU(self.memory, self.gfx, self.keyboard, self.sound)
 
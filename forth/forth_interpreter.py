@@ -272,22 +272,22 @@ class ForthInterpreter:
     def word_set_tt(self):
         # Usage: value TT!
         value = self.pop_param()
-        self.cpu.timer[0] = value & 0xFF
+        self.cpu._set_operand_value('TT', 0, value)  # Keeps the timer schedule in sync
 
     def word_set_tm(self):
         # Usage: value TM!
         value = self.pop_param()
-        self.cpu.timer[1] = value & 0xFF
+        self.cpu._set_operand_value('TM', 0, value)  # Keeps the timer schedule in sync
 
     def word_set_tc(self):
         # Usage: value TC!
         value = self.pop_param()
-        self.cpu.timer[2] = value & 0xFF
+        self.cpu._set_operand_value('TC', 0, value)  # Keeps the timer schedule in sync
 
     def word_set_ts(self):
         # Usage: value TS!
         value = self.pop_param()
-        self.cpu.timer[3] = value & 0xFF
+        self.cpu._set_operand_value('TS', 0, value)  # Keeps the timer schedule in sync
 
     # --- File I/O Word Implementations ---
     def word_open_file(self):
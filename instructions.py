@@ -1,6 +1,9 @@
 from opcodes import opcodes
 import math
 
+# Opcodes encoded without a mode byte (no operands in the opcode table)
+NO_OPERAND_OPCODES = frozenset(int(code, 16) for name, code, count in opcodes if count == 0)
+
 class BaseInstruction:
     """Base class for all instructions"""
     def __init__(self, name, opcode):
@@ -13,6 +16,15 @@ class BaseInstruction:
     def execute(self, cpu):
         raise NotImplementedError("Subclasses must implement execute method")
 
+class UnknownOpcode(BaseInstruction):
+    """Trap shared by all opcodes that have no instruction"""
+    def __init__(self):
+        super().__init__("???", None)
+    
+    def execute(self, cpu):
+        opcode = cpu.memory.read_byte((cpu.pc - 1) & 0xFFFF)  # Opcode was already fetched
+        raise Exception(f"Unknown opcode: {opcode:02X}")
+
 # No-operand instructions
 class Hlt(BaseInstruction):
     def __init__(self):
@@ -137,7 +149,7 @@ class Add(BaseInstruction):
         result = dest_value + source_value
         cpu.set_operand_value(operands[0], result)
         # Set flags based on destination operand type and masked result
-        if operands[0]['type'] == 'register' and operands[0]['reg_type'] == 'R':
+        if operands[0].byte_register:
             masked_result = result & 0xFF
             cpu._set_flags_8bit(masked_result, result)
         else:
@@ -157,7 +169,7 @@ class Sub(BaseInstruction):
         result = dest_value - source_value
         cpu.set_operand_value(operands[0], result)
         # Set flags based on destination operand type and masked result
-        if operands[0]['type'] == 'register' and operands[0]['reg_type'] == 'R':
+        if operands[0].byte_register:
             masked_result = result & 0xFF
             cpu._set_flags_8bit(masked_result, result)
         else:
@@ -337,7 +349,7 @@ class Shl(BaseInstruction):
         shift_amount = cpu.get_operand_value(operands[1]) & 0x1F  # Mask to 0-31
         
         # Determine if this is an 8-bit or 16-bit operation based on destination register type
-        if operands[0]['type'] == 'register' and operands[0]['reg_type'] == 'R':
+        if operands[0].byte_register:
             # 8-bit shift for R registers
             bit_width = 8
             mask = 0xFF
@@ -365,7 +377,7 @@ class Shr(BaseInstruction):
         shift_amount = cpu.get_operand_value(operands[1]) & 0x1F  # Mask to 0-31
         
         # Determine if this is an 8-bit or 16-bit operation based on destination register type
-        if operands[0]['type'] == 'register' and operands[0]['reg_type'] == 'R':
+        if operands[0].byte_register:
             # 8-bit shift for R registers
             bit_width = 8
             mask = 0xFF
@@ -393,7 +405,7 @@ class Rol(BaseInstruction):
         rotate_amount = cpu.get_operand_value(operands[1]) & 0x0F  # Mask to 0-15
         
         # Determine if this is an 8-bit or 16-bit operation based on destination register type
-        if operands[0]['type'] == 'register' and operands[0]['reg_type'] == 'R':
+        if operands[0].byte_register:
             # 8-bit rotate for R registers
             bit_width = 8
             mask = 0xFF
@@ -419,7 +431,7 @@ class Ror(BaseInstruction):
         rotate_amount = cpu.get_operand_value(operands[1]) & 0x0F  # Mask to 0-15
         
         # Determine if this is an 8-bit or 16-bit operation based on destination register type
-        if operands[0]['type'] == 'register' and operands[0]['reg_type'] == 'R':
+        if operands[0].byte_register:
             # 8-bit rotate for R registers
             bit_width = 8
             mask = 0xFF
@@ -1194,7 +1206,7 @@ class Char(BaseInstruction):
         color = cpu.get_operand_value(operands[1])
         x = cpu.gfx.Vregisters[0]
         y = cpu.gfx.Vregisters[1]
-        cpu.gfx.draw_char(x, y, char_code, color)
+        cpu.gfx.draw_char(char_code, x, y, color)
 
 class Text(BaseInstruction):
     """TEXT instruction - draw text"""
@@ -1311,10 +1323,18 @@ class Memcpy(BaseInstruction):
         dest_addr = cpu.get_operand_value(operands[0])
         source_addr = cpu.get_operand_value(operands[1])
         length = cpu.get_operand_value(operands[2])
+        if length == 0:
+            return
         
-        for i in range(length):
-            data = cpu.memory.read((source_addr + i) & 0xFFFF, 1)[0]
-            cpu.memory.write((dest_addr + i) & 0xFFFF, data, 1)
+        # Forward byte-copy semantics: a destination starting inside the source
+        # repeats the first (dest - source) bytes across the whole destination
+        offset = (dest_addr - source_addr) & 0xFFFF
+        if 0 < offset < length:
+            pattern = cpu.memory.read_block(source_addr, offset)
+            data = (pattern * (length // offset + 1))[:length]
+        else:
+            data = cpu.memory.read_block(source_addr, length)
+        cpu.memory.write_block(dest_addr, data)
 
 class Memset(BaseInstruction):
     """MEMSET instruction - memory set"""
@@ -1328,10 +1348,11 @@ class Memset(BaseInstruction):
         fill_value = cpu.get_operand_value(operands[1])
         length = cpu.get_operand_value(operands[2])
         
-        for i in range(length):
-            cpu.memory.write((dest_addr + i) & 0xFFFF, fill_value, 1)
+        cpu.memory.write_block(dest_addr, bytes((fill_value & 0xFF,)) * length)
 
 # String operations
+# Strings are read in full before the destination is written, so overlapping
+# source and destination behave like a copy through a temporary buffer
 class Strcpy(BaseInstruction):
     """STRCPY instruction - string copy"""
     def __init__(self):
@@ -1343,13 +1364,8 @@ class Strcpy(BaseInstruction):
         dest_addr = cpu.get_operand_value(operands[0])
         source_addr = cpu.get_operand_value(operands[1])
         
-        i = 0
-        while True:
-            char = cpu.memory.read((source_addr + i) & 0xFFFF, 1)[0]
-            cpu.memory.write((dest_addr + i) & 0xFFFF, char, 1)
-            if char == 0:  # Null terminator
-                break
-            i += 1
+        string = cpu.memory.read_string(source_addr)
+        cpu.memory.write_block(dest_addr, string + b'\x00')
 
 class Strcat(BaseInstruction):
     """STRCAT instruction - string concatenate"""
@@ -1362,19 +1378,10 @@ class Strcat(BaseInstruction):
         dest_addr = cpu.get_operand_value(operands[0])
         source_addr = cpu.get_operand_value(operands[1])
         
-        # Find end of destination string
-        i = 0
-        while cpu.memory.read((dest_addr + i) & 0xFFFF, 1)[0] != 0:
-            i += 1
-        
-        # Copy source string to end of destination
-        j = 0
-        while True:
-            char = cpu.memory.read((source_addr + j) & 0xFFFF, 1)[0]
-            cpu.memory.write((dest_addr + i + j) & 0xFFFF, char, 1)
-            if char == 0:  # Null terminator
-                break
-            j += 1
+        # Copy source string over the terminator of the destination
+        end = len(cpu.memory.read_string(dest_addr))
+        string = cpu.memory.read_string(source_addr)
+        cpu.memory.write_block((dest_addr + end) & 0xFFFF, string + b'\x00')
 
 class Strcmp(BaseInstruction):
     """STRCMP instruction - string compare"""
@@ -1388,16 +1395,17 @@ class Strcmp(BaseInstruction):
         str2_addr = cpu.get_operand_value(operands[1])
         max_length = cpu.get_operand_value(operands[2])
         
-        result = 0
-        for i in range(max_length):
-            char1 = cpu.memory.read((str1_addr + i) & 0xFFFF, 1)[0]
-            char2 = cpu.memory.read((str2_addr + i) & 0xFFFF, 1)[0]
-            
-            if char1 != char2:
-                result = 1 if char1 > char2 else -1
-                break
-            if char1 == 0:  # End of string
-                break
+        # Compare up to max_length bytes, stopping after the first string's terminator
+        str1 = cpu.memory.read_block(str1_addr, max_length)
+        end = str1.find(0)
+        if end != -1:
+            str1 = str1[:end + 1]
+        str2 = cpu.memory.read_block(str2_addr, len(str1))
+        
+        if str1 == str2:
+            result = 0
+        else:
+            result = 1 if str1 > str2 else -1
         
         # Store result in a register (typically R0)
         cpu.Rregisters[0] = result & 0xFF
@@ -1412,13 +1420,32 @@ class Strlen(BaseInstruction):
         operands = cpu.parse_operands(1)
         str_addr = cpu.get_operand_value(operands[0])
         
-        length = 0
-        while cpu.memory.read((str_addr + length) & 0xFFFF, 1)[0] != 0:
-            length += 1
+        length = len(cpu.memory.read_string(str_addr))
         
         # Store result in R0
         cpu.Rregisters[0] = length & 0xFF
 
+def _extract_substring(cpu, dest_addr, haystack_addr, needle_addr, max_length, fold_case):
+    """Copy the haystack from the first needle match to dest (empty string if not found)"""
+    needle = cpu.memory.read_string(needle_addr, max_length)
+    if needle:
+        # Search window holds every byte a match within max_length can touch
+        window = cpu.memory.read_block(haystack_addr, max_length)
+        if fold_case:
+            start_pos = window.lower().find(needle.lower())
+        else:
+            start_pos = window.find(needle)
+        if start_pos != -1:
+            # Copy from start_pos to end of haystack
+            tail = cpu.memory.read_block(haystack_addr + start_pos, max_length)
+            end = tail.find(0)
+            if end != -1:
+                tail = tail[:end + 1]
+            cpu.memory.write_block(dest_addr, tail)
+            return
+    # Empty needle or not found - empty result
+    cpu.memory.write_block(dest_addr, b'\x00')
+
 class Strext(BaseInstruction):
     """STREXT instruction - string extract"""
     def __init__(self):
@@ -1432,49 +1459,7 @@ class Strext(BaseInstruction):
         needle_addr = cpu.get_operand_value(operands[2])
         max_length = cpu.get_operand_value(operands[3])
         
-        # Find needle in haystack
-        needle = []
-        i = 0
-        while i < max_length:
-            char = cpu.memory.read((needle_addr + i) & 0xFFFF, 1)[0]
-            if char == 0:
-                break
-            needle.append(char)
-            i += 1
-        
-        needle_len = len(needle)
-        if needle_len == 0:
-            # Empty needle - copy nothing
-            cpu.memory.write(dest_addr & 0xFFFF, 0, 1)
-            return
-        
-        # Search for needle in haystack
-        found = False
-        start_pos = 0
-        for i in range(max_length - needle_len + 1):
-            match = True
-            for j in range(needle_len):
-                h_char = cpu.memory.read((haystack_addr + i + j) & 0xFFFF, 1)[0]
-                if h_char != needle[j]:
-                    match = False
-                    break
-            if match:
-                found = True
-                start_pos = i
-                break
-        
-        if found:
-            # Copy from start_pos to end of haystack
-            i = 0
-            while i < max_length:
-                char = cpu.memory.read((haystack_addr + start_pos + i) & 0xFFFF, 1)[0]
-                cpu.memory.write((dest_addr + i) & 0xFFFF, char, 1)
-                if char == 0:
-                    break
-                i += 1
-        else:
-            # Not found - empty result
-            cpu.memory.write(dest_addr & 0xFFFF, 0, 1)
+        _extract_substring(cpu, dest_addr, haystack_addr, needle_addr, max_length, False)
 
 class Strexti(BaseInstruction):
     """STREXTI instruction - string extract case-insensitive"""
@@ -1489,54 +1474,7 @@ class Strexti(BaseInstruction):
         needle_addr = cpu.get_operand_value(operands[2])
         max_length = cpu.get_operand_value(operands[3])
         
-        # Find needle in haystack (case-insensitive)
-        needle = []
-        i = 0
-        while i < max_length:
-            char = cpu.memory.read((needleAddr + i) & 0xFFFF, 1)[0]
-            if char == 0:
-                break
-            needle.append(char)
-            i += 1
-        
-        needle_len = len(needle)
-        if needle_len == 0:
-            # Empty needle - copy nothing
-            cpu.memory.write(dest_addr & 0xFFFF, 0, 1)
-            return
-        
-        # Search for needle in haystack (case-insensitive)
-        found = False
-        start_pos = 0
-        for i in range(max_length - needle_len + 1):
-            match = True
-            for j in range(needle_len):
-                h_char = cpu.memory.read((haystack_addr + i + j) & 0xFFFF, 1)[0]
-                n_char = needle[j]
-                # Simple case-insensitive comparison
-                if h_char != n_char and not (
-                    (h_char >= 65 and h_char <= 90 and n_char == h_char + 32) or
-                    (h_char >= 97 and h_char <= 122 and n_char == h_char - 32)
-                ):
-                    match = False
-                    break
-            if match:
-                found = True
-                start_pos = i
-                break
-        
-        if found:
-            # Copy from start_pos to end of haystack
-            i = 0
-            while i < max_length:
-                char = cpu.memory.read((haystack_addr + start_pos + i) & 0xFFFF, 1)[0]
-                cpu.memory.write((dest_addr + i) & 0xFFFF, char, 1)
-                if char == 0:
-                    break
-                i += 1
-        else:
-            # Not found - empty result
-            cpu.memory.write(dest_addr & 0xFFFF, 0, 1)
+        _extract_substring(cpu, dest_addr, haystack_addr, needle_addr, max_length, True)
 
 class Strupr(BaseInstruction):
     """STRUPR instruction - string to uppercase"""
@@ -1548,15 +1486,10 @@ class Strupr(BaseInstruction):
         operands = cpu.parse_operands(1)
         str_addr = cpu.get_operand_value(operands[0])
         
-        i = 0
-        while True:
-            char = cpu.memory.read((str_addr + i) & 0xFFFF, 1)[0]
-            if char == 0:
-                break
-            if char >= 97 and char <= 122:  # lowercase a-z
-                char -= 32
-                cpu.memory.write((str_addr + i) & 0xFFFF, char, 1)
-            i += 1
+        string = cpu.memory.read_string(str_addr)
+        upper = string.upper()  # ASCII a-z only
+        if upper != string:
+            cpu.memory.write_block(str_addr, upper)
 
 class Strlwr(BaseInstruction):
     """STRLWR instruction - string to lowercase"""
@@ -1568,15 +1501,10 @@ class Strlwr(BaseInstruction):
         operands = cpu.parse_operands(1)
         str_addr = cpu.get_operand_value(operands[0])
         
-        i = 0
-        while True:
-            char = cpu.memory.read((str_addr + i) & 0xFFFF, 1)[0]
-            if char == 0:
-                break
-            if char >= 65 and char <= 90:  # uppercase A-Z
-                char += 32
-                cpu.memory.write((str_addr + i) & 0xFFFF, char, 1)
-            i += 1
+        string = cpu.memory.read_string(str_addr)
+        lower = string.lower()  # ASCII A-Z only
+        if lower != string:
+            cpu.memory.write_block(str_addr, lower)
 
 class Strrev(BaseInstruction):
     """STRREV instruction - string reverse"""
@@ -1588,17 +1516,13 @@ class Strrev(BaseInstruction):
         operands = cpu.parse_operands(1)
         str_addr = cpu.get_operand_value(operands[0])
         
-        # Find string length
-        length = 0
-        while cpu.memory.read((str_addr + length) & 0xFFFF, 1)[0] != 0:
-            length += 1
-        
         # Reverse in place
-        for i in range(length // 2):
-            left = cpu.memory.read((str_addr + i) & 0xFFFF, 1)[0]
-            right = cpu.memory.read((str_addr + length - 1 - i) & 0xFFFF, 1)[0]
-            cpu.memory.write((str_addr + i) & 0xFFFF, right, 1)
-            cpu.memory.write((str_addr + length - 1 - i) & 0xFFFF, left, 1)
+        string = cpu.memory.read_string(str_addr)
+        if len(string) > 1:
+            cpu.memory.write_block(str_addr, string[::-1])
+
+# Haystack scan limit for STRFIND/STRFINDI: matches must end within this many bytes
+STRFIND_LIMIT = 1000
 
 class Strfind(BaseInstruction):
     """STRFIND instruction - string substring exists"""
@@ -1611,41 +1535,11 @@ class Strfind(BaseInstruction):
         haystack_addr = cpu.get_operand_value(operands[0])
         needle_addr = cpu.get_operand_value(operands[1])
         
-        # Get needle
-        needle = []
-        i = 0
-        while True:
-            char = cpu.memory.read((needle_addr + i) & 0xFFFF, 1)[0]
-            if char == 0:
-                break
-            needle.append(char)
-            i += 1
-        
-        needle_len = len(needle)
-        if needle_len == 0:
-            cpu.Rregisters[0] = 1  # Empty needle always found
-            return
+        needle = cpu.memory.read_string(needle_addr)
+        haystack = cpu.memory.read_string(haystack_addr, STRFIND_LIMIT)
         
-        # Search for needle in haystack
-        found = False
-        i = 0
-        while True:
-            h_char = cpu.memory.read((haystack_addr + i) & 0xFFFF, 1)[0]
-            if h_char == 0:
-                break
-            
-            if i <= 1000 - needle_len:  # Prevent infinite loop
-                match = True
-                for j in range(needle_len):
-                    if cpu.memory.read((haystack_addr + i + j) & 0xFFFF, 1)[0] != needle[j]:
-                        match = False
-                        break
-                if match:
-                    found = True
-                    break
-            i += 1
-        
-        cpu.Rregisters[0] = 1 if found else 0
+        # Empty needle always found
+        cpu.Rregisters[0] = 1 if needle in haystack else 0
 
 class Strfindi(BaseInstruction):
     """STRFINDI instruction - string case-insensitive substring exists"""
@@ -1658,47 +1552,11 @@ class Strfindi(BaseInstruction):
         haystack_addr = cpu.get_operand_value(operands[0])
         needle_addr = cpu.get_operand_value(operands[1])
         
-        # Get needle
-        needle = []
-        i = 0
-        while True:
-            char = cpu.memory.read((needleAddr + i) & 0xFFFF, 1)[0]
-            if char == 0:
-                break
-            needle.append(char)
-            i += 1
-        
-        needle_len = len(needle)
-        if needle_len == 0:
-            cpu.Rregisters[0] = 1  # Empty needle always found
-            return
+        needle = cpu.memory.read_string(needle_addr).lower()
+        haystack = cpu.memory.read_string(haystack_addr, STRFIND_LIMIT).lower()
         
-        # Search for needle in haystack (case-insensitive)
-        found = False
-        i = 0
-        while True:
-            h_char = cpu.memory.read((haystack_addr + i) & 0xFFFF, 1)[0]
-            if h_char == 0:
-                break
-            
-            if i <= 1000 - needle_len:  # Prevent infinite loop
-                match = True
-                for j in range(needle_len):
-                    n_char = needle[j]
-                    h_cmp = cpu.memory.read((haystack_addr + i + j) & 0xFFFF, 1)[0]
-                    # Simple case-insensitive comparison
-                    if h_cmp != n_char and not (
-                        (h_cmp >= 65 and h_cmp <= 90 and n_char == h_cmp + 32) or
-                        (h_cmp >= 97 and h_cmp <= 122 and n_char == h_cmp - 32)
-                    ):
-                        match = False
-                        break
-                if match:
-                    found = True
-                    break
-            i += 1
-        
-        cpu.Rregisters[0] = 1 if found else 0
+        # Empty needle always found
+        cpu.Rregisters[0] = 1 if needle in haystack else 0
 
 # Layer operations
 class Lcpy(BaseInstruction):
@@ -1735,8 +1593,7 @@ class Lmov(BaseInstruction):
         operands = cpu.parse_operands(2)
         dest_layer = cpu.get_operand_value(operands[0])
         source_layer = cpu.get_operand_value(operands[1])
-        cpu.gfx.copy_layer(source_layer, dest_layer)
-        cpu.gfx.clear_layer(0, source_layer)  # Clear source after copy
+        cpu.gfx.move_layer(source_layer, dest_layer)  # Clears source after copy
 
 class Lshft(BaseInstruction):
     """LSHFT instruction - shift layer by axis, amount"""
@@ -2000,3 +1857,15 @@ def create_instruction_table():
         table[instruction.opcode] = instruction
     
     return table
+
+def create_dispatch_table(instruction_table=None):
+    """Create the 256-entry list of bound execute() handlers and the has-mode-byte table"""
+    if instruction_table is None:
+        instruction_table = create_instruction_table()
+    unknown = UnknownOpcode()
+    dispatch = [(instruction_table.get(opcode) or unknown).execute
+                for opcode in range(256)]
+    has_mode_byte = bytearray(
+        1 if opcode in instruction_table and opcode not in NO_OPERAND_OPCODES else 0
+        for opcode in range(256))
+    return dispatch, has_mode_byte
@@ -6,18 +6,20 @@ import nova_cpu as cpu
 import nova_memory as ram
 import nova_gfx as gpu
 import nova_sound as sound
-
-
-import nova_gui as gui
 import nova_keyboard as keyboard
 
-def run_headless(program_path, max_cycles=10000):
-    """Run a program headlessly for testing"""
+def run_headless(program_path, max_cycles=10000, interpret=False, wav_path=None):
+    """Run a program headlessly for testing (interpret=True uses the reference interpreter)
+
+    With wav_path, the program's audio is rendered at emulated time and written there.
+    """
     mem = ram.Memory()
     gfx = gpu.GFX()
     kbd = keyboard.NovaKeyboard()
-    # snd = sound.NovaSound()
-    snd = None
+    if wav_path:
+        snd = sound.NovaSound(backend=sound.OfflineAudioBackend(wav_path))
+    else:
+        snd = sound.NovaSound(backend=sound.NullAudioBackend())
     proc = cpu.CPU(mem, gfx, kbd, snd)
     
     # Ensure keyboard is properly connected
@@ -31,31 +33,24 @@ def run_headless(program_path, max_cycles=10000):
     print(f"Entry point: 0x{entry_point:04X}")
     print(f"Initial PC: 0x{proc.pc:04X}")
     
-    # Run for max_cycles or until halt
+    # Run for max_cycles or until halt, reporting progress every 1000 cycles
     cycle = 0
-    while cycle < max_cycles and not proc.halted:
-        cycle += 1
-        try:
-            old_pc = proc.pc
-            proc.step()
-            
-            # Check if CPU halted (HLT instruction executed)
-            if proc.halted:
-                print(f"Program halted at PC: 0x{proc.pc:04X}")
-                break
-            
-            # Simple infinite loop detection (only if not halted)
-            if proc.pc == old_pc:
-                print(f"Possible infinite loop detected at PC: 0x{proc.pc:04X}")
-                break
-                
-            # Print every 1000 cycles for progress
-            if cycle % 1000 == 0:
-                print(f"Cycle {cycle}, PC: 0x{proc.pc:04X}")
-                
-        except Exception as e:
-            print(f"Error at cycle {cycle}, PC: 0x{proc.pc:04X}: {e}")
+    while cycle < max_cycles:
+        result = proc.run(min(1000, max_cycles - cycle), detect_loops=True, translate=not interpret)
+        cycle += result.cycles
+        
+        if result.reason == cpu.RunResult.HALTED:
+            print(f"Program halted at PC: 0x{proc.pc:04X}")
+            break
+        if result.reason == cpu.RunResult.INFINITE_LOOP:
+            print(f"Possible infinite loop detected at PC: 0x{proc.pc:04X}")
             break
+        if result.reason == cpu.RunResult.EXCEPTION:
+            print(f"Error at cycle {cycle + 1}, PC: 0x{proc.pc:04X}: {result.error}")
+            break
+        
+        if cycle % 1000 == 0:
+            print(f"Cycle {cycle}, PC: 0x{proc.pc:04X}")
     
     print(f"Execution finished after {cycle} cycles")
     print(f"Final PC: 0x{proc.pc:04X}")
@@ -87,11 +82,13 @@ def main():
     parser.add_argument('program', nargs='?', help='Binary program file to load and run')
     parser.add_argument('--headless', action='store_true', help='Run without GUI for testing')
     parser.add_argument('--cycles', type=int, default=10000, help='Maximum cycles to run in headless mode')
+    parser.add_argument('--interpret', action='store_true', help='Use the reference interpreter instead of the block translator in headless mode')
+    parser.add_argument('--wav', metavar='PATH', help='Render the audio to a WAV file in headless mode')
     
     args = parser.parse_args()
     
     if args.headless and args.program:
-        run_headless(args.program, args.cycles)
+        run_headless(args.program, args.cycles, args.interpret, args.wav)
     else:
         mem = ram.Memory()
         gfx = gpu.GFX()
@@ -117,7 +114,8 @@ def main():
             print(f"Loaded {args.program}")
             print(f"Entry point: 0x{entry_point:04X}")
         
-        # Run GUI
+        # Run GUI (imported here so headless runs never load pygame)
+        import nova_gui as gui
         gui.main(proc, mem, gfx, kbd)
 
 if __name__ == "__main__":
@@ -2,12 +2,131 @@ import numpy as np
 import nova_memory as mem
 import nova_gfx as gpu
 import nova_sound as sound
-from instructions import create_instruction_table
+from instructions import create_instruction_table, create_dispatch_table
+from nova_translator import BlockTranslator, BLOCK_TERMINATORS, MAX_BLOCK_INSTRUCTIONS
+from nova_operands import register_operand, ImmediateOperand, MemoryOperand, RegisterMemoryOperand
 import time
 import cProfile
 import pstats
 from functools import wraps
 
+# Longest possible encoding: opcode + mode byte + 6 operands of up to 3 bytes each
+MAX_INSTRUCTION_LENGTH = 20
+
+# Cycle value meaning "no event scheduled"
+NO_EVENT = 1 << 62
+
+# 1 if the byte has an even number of set bits (parity flag value)
+PARITY_TABLE = bytes(1 if bin(i).count('1') % 2 == 0 else 0 for i in range(256))
+
+class RunResult:
+    """Outcome of CPU.run(): why execution stopped and how many instructions ran"""
+    HALTED = 'halted'
+    CYCLE_BUDGET = 'cycle_budget'
+    BREAKPOINT = 'breakpoint'
+    INFINITE_LOOP = 'infinite_loop'
+    EXCEPTION = 'exception'
+
+    def __init__(self, reason, cycles, pc, error=None, idle_cycles=0):
+        self.reason = reason
+        self.cycles = cycles
+        self.pc = pc
+        self.error = error
+        self.idle_cycles = idle_cycles  # Part of cycles skipped in a polling loop
+
+    def __repr__(self):
+        return f"RunResult({self.reason}, cycles={self.cycles}, pc=0x{self.pc:04X})"
+
+class FlagRegister(list):
+    """CPU flag list whose Z/C/S/P/O bits are evaluated lazily.
+
+    ALU operations only record their last result; the flag bits are computed
+    the first time anything reads or writes the list, so the list API seen by
+    instructions, tests and the debugger is unchanged.
+    """
+    __slots__ = ('pending', 'pending_overflow')
+
+    def __init__(self, values=()):
+        super().__init__(values)
+        self.pending = None  # (result, original_result, mask) of the last ALU op
+        self.pending_overflow = None  # (op1, op2, result, sign_bit, is_subtraction)
+
+    def resolve(self):
+        """Materialize any deferred flag bits"""
+        pending = self.pending
+        if pending is not None:
+            self.pending = None
+            result, original, mask = pending
+            store = list.__setitem__
+            store(self, 7, 0 if result & mask else 1)  # Z
+            store(self, 6, 1 if original > mask or original < 0 else 0)  # C
+            store(self, 1, 1 if result & (mask ^ (mask >> 1)) else 0)  # S
+            store(self, 8, PARITY_TABLE[result & 0xFF])  # P
+        pending = self.pending_overflow
+        if pending is not None:
+            self.pending_overflow = None
+            op1, op2, result, sign, is_subtraction = pending
+            if is_subtraction:
+                # Overflow in subtraction: (pos - neg = neg) or (neg - pos = pos)
+                overflow = ((op1 & sign) != (op2 & sign)) and ((op1 & sign) != (result & sign))
+            else:
+                # Overflow in addition: (pos + pos = neg) or (neg + neg = pos)
+                overflow = ((op1 & sign) == (op2 & sign)) and ((op1 & sign) != (result & sign))
+            list.__setitem__(self, 2, int(overflow))
+
+    def __getitem__(self, index):
+        if self.pending is not None or self.pending_overflow is not None:
+            self.resolve()
+        return list.__getitem__(self, index)
+
+    def __setitem__(self, index, value):
+        if self.pending is not None or self.pending_overflow is not None:
+            self.resolve()
+        list.__setitem__(self, index, value)
+
+    def __iter__(self):
+        self.resolve()
+        return list.__iter__(self)
+
+    def __reversed__(self):
+        self.resolve()
+        return list.__reversed__(self)
+
+    def __contains__(self, value):
+        self.resolve()
+        return list.__contains__(self, value)
+
+    def __eq__(self, other):
+        self.resolve()
+        if isinstance(other, FlagRegister):
+            other.resolve()
+        return list.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        self.resolve()
+        return list.__repr__(self)
+
+    def __array__(self, dtype=None, copy=None):
+        self.resolve()
+        return np.array(list.copy(self), dtype=dtype)
+
+    def copy(self):
+        self.resolve()
+        return list.copy(self)
+
+    def count(self, value):
+        self.resolve()
+        return list.count(self, value)
+
+    def index(self, *args):
+        self.resolve()
+        return list.index(self, *args)
+
 class CPU:
     def __init__( self, memory, gfx, keyboard=None, sound_system=None, stack_size = 65535 ):
         self.memory = memory
@@ -18,9 +137,10 @@ class CPU:
         if sound_system is None:
             self.sound = sound.NovaSound()
             # self.sound = None
-            # self.sound.set_memory_reference(memory)
         else:
             self.sound = sound_system
+        if self.sound is not None:
+            self.sound.set_memory_reference(memory)  # Memory samples (waveform 7) read from RAM
 
         self.Rregisters = [0] * 10  # R registers (8-bit)
         self.Pregisters = [0] * 10  # P registers (16-bit)
@@ -32,7 +152,7 @@ class CPU:
         self.pc = 0x0000
 
         # Internal flag array for bulk operations and compatibility
-        self._flags = [0] * 12  # CPU flags
+        self._flags = FlagRegister([0] * 12)  # CPU flags (Z/C/S/P/O evaluated lazily)
         self._flags[ 11 ] = 0 # Hacker flag (E), set to 1 if the user is a hacker (not touched by the CPU)
         self._flags[ 10 ] = 0 # BCD Carry flag (A), set to 1 if the result of an operation is greater than 9
         self._flags[ 9 ] = 0 # Direction flag (H), set to 1 if the CPU runs High to Low
@@ -61,6 +181,7 @@ class CPU:
         self.interrupts[ 2 ] = 0 # Keyboard interrupt (K) set to 1 if the Keyboard interrupt is enabled
         self.interrupts[ 3 ] = 0 # User interrupt (U1) set to 1 if the User interrupt 1 is enabled
         self.interrupts[ 4 ] = 0 # User interrupt (U2) set to 1 if the User interrupt 2 is enabled
+        self.interrupts[ 5 ] = 0 # Sprite collision interrupt (C) set to 1 if the Collision interrupt is enabled
 
         self.timer = [0] * 4  # Timer registers # Timers for the timer interrupt
         self.timer[ 0 ] = 0 # Timer counter (T)
@@ -69,8 +190,16 @@ class CPU:
         self.timer[ 3 ] = 0 # Timer speed (S)
         
         # Timer internal state
-        self.timer_cycles = 0  # Cycle counter for timer
+        self.timer_cycles = 0  # Cycles since the last timer increment
         self.timer_enabled = False  # Timer enable state
+        self.timer_sync_cycle = 0  # Cycle at which timer[0] was last brought up to date
+        self.timer_event_cycle = NO_EVENT  # Cycle of the next timer interrupt
+        
+        # Event scheduler: one instruction is one cycle
+        self.cycle_count = 0  # Instructions executed since power on
+        self.next_event_cycle = NO_EVENT  # Earliest cycle needing timer or interrupt service
+        self.event_requested = False  # Set by request_event(), possibly from another thread
+        self.idle_cycles = 0  # Cycles fast-forwarded through polling loops
         
         self.rng_seed = 0x1234  # Random number generator seed
         
@@ -86,6 +215,8 @@ class CPU:
         
         self.key_buffer = []  # Circular buffer for keyboard input (max 16 keys)
         self.key_buffer_size = 16
+        
+        self.collision_pending = False  # Sprite collision interrupt latched by the GFX unit
 
         self.halted = False
         
@@ -96,27 +227,30 @@ class CPU:
         self.register_cache = {}  # Cache register values
         self.register_cache_size = 64
         
-        # Interrupt checking optimization
-        self.interrupt_check_counter = 0
-        self.interrupt_check_frequency = 8  # Check every 8 instructions
-        self.last_interrupt_state = 0  # Cache of last interrupt state
+        # Predecoded instruction cache keyed by instruction PC
+        # Entry: (instruction, mode_byte, operands, next_pc, has_dynamic_operands)
+        self.decode_cache = {}
+        self._decode_pc = 0  # PC of the instruction currently being decoded
+        self._decode_instruction = None  # Instruction awaiting a cache entry
+        self._cached_operands = None  # Operands supplied by a cache hit
         
-        # Operand parsing cache for performance optimization
-        self.operand_cache = {}  # Cache parsed operands by (pc, mode_byte)
-        self.operand_cache_size = 256  # Maximum cache entries
+        # Translated basic blocks keyed by entry PC
+        # Entry: (function, end_pc, instruction_count)
+        self.block_cache = {}
+        self.code_generation = 0  # Bumped whenever cached code is invalidated
+        self.translator = BlockTranslator(self)
         
         # Memory prefetch optimization
-        self.prefetch_buffer = np.zeros(16, dtype=np.uint8)  # 16-byte prefetch buffer
+        self.prefetch_buffer = bytearray(16)  # 16-byte prefetch buffer
         self.prefetch_pc = 0  # PC when buffer was loaded
         self.prefetch_valid = False  # Is the buffer valid?
         
-        # Timer optimization
-        self.timer_update_counter = 0
-        self.timer_update_frequency = 4  # Update timer every 4 cycles instead of every cycle
-        
         # Initialize instruction dispatch table
         self.instruction_table = create_instruction_table()
         
+        # Opcode-indexed bound execute() handlers (unknown opcodes trap) and mode byte table
+        self.dispatch_table, self.has_mode_byte = create_dispatch_table(self.instruction_table)
+        
         # Create reverse mapping for profiling (opcode -> name)
         self.opcode_to_name = {}
         for opcode, instruction in self.instruction_table.items():
@@ -124,6 +258,11 @@ class CPU:
         
         # Connect memory system to graphics for sprite memory-mapping
         self.memory.gfx_system = self.gfx
+        self.gfx.set_memory_reference(self.memory)  # Sprites are drawn from it on each frame
+        self.gfx.collision_interrupt = self.request_collision_interrupt
+        
+        # Connect memory system to the decode cache for self-modifying code
+        self.memory.code_watcher = self
 
         # ========================================
         # PROFILING SYSTEM
@@ -659,19 +798,28 @@ class CPU:
         self.timer[:] = [0] * len(self.timer)
         self.timer_cycles = 0
         self.timer_enabled = False
+        self.timer_sync_cycle = self.cycle_count
+        self.timer_event_cycle = NO_EVENT
+        self.next_event_cycle = NO_EVENT
+        self.event_requested = False
         self.serial[:] = [0] * len(self.serial)
         self.keyboard[:] = [0] * len(self.keyboard)
         self.key_buffer = []
+        self.collision_pending = False
         self.halted = False
         self.memory.memory[:] = 0
+        self.flush_decode_cache()
+        self.gfx.memory_loaded(self.memory)  # Memory was zeroed without running the sprite/tilemap hooks
         self.gfx.vram[:] = 0
         self.gfx.screen[:] = 0
+        self.gfx.mark_layer_dirty(0)
         self.gfx.flags[:] = 0
         self.gfx.Vregisters[:] = 0
         self.gfx.vmode = 0
         
         # Reset sound system
         if self.sound:
+            self.sound.sync(self.cycle_count)  # Audio up to the reset is still heard
             self.sound.sstop()  # Stop all sounds
             self.sound.update_registers(sa=0, sf=0, sv=0, sw=0)  # Reset sound registers
         
@@ -690,8 +838,12 @@ class CPU:
         if type == 'V': return int( self.gfx.Vregisters[ idx ] )
         if type == 'SP': return int( self.sp )
         if type == 'FP': return int( self.fp )
-        if type == 'T': return int( self.timer[ idx ] )  # Generic timer register access
-        if type == 'TT': return int( self.timer[ 0 ] )  # Timer Time/Counter
+        if type == 'T':  # Generic timer register access
+            if idx == 0: self._sync_timer()
+            return int( self.timer[ idx ] )
+        if type == 'TT':  # Timer Time/Counter
+            self._sync_timer()
+            return int( self.timer[ 0 ] )
         if type == 'TM': return int( self.timer[ 1 ] )  # Timer Modulo
         if type == 'TC': return int( self.timer[ 2 ] )  # Timer Control
         if type == 'TS': return int( self.timer[ 3 ] )  # Timer Speed
@@ -753,20 +905,29 @@ class CPU:
         elif type == 'V': 
             self.gfx.Vregisters[ idx ] = int(value) & 0xFFFF
         elif type == 'T':
+            self._sync_timer()
             self.timer[ idx ] = int(value) & 0xFF
             # Update timer enabled state when control register (idx=2) is written
             if idx == 2:
                 self.set_timer_control(self.timer[ 2 ])
+            else:
+                self._schedule_timer()
         elif type == 'TT': 
+            self._sync_timer()
             self.timer[ 0 ] = int(value) & 0xFF
+            self._schedule_timer()
         elif type == 'TM': 
+            self._sync_timer()
             self.timer[ 1 ] = int(value) & 0xFF
+            self._schedule_timer()
         elif type == 'TC': 
             self.timer[ 2 ] = int(value) & 0xFF
             # Update timer enabled state when control register is written
             self.set_timer_control(self.timer[ 2 ])
         elif type == 'TS': 
+            self._sync_timer()
             self.timer[ 3 ] = int(value) & 0xFF
+            self._schedule_timer()
         elif type == 'VL': 
             self.gfx.VL = int(value) & 0xFF
             
@@ -813,70 +974,36 @@ class CPU:
             self.write_byte( self.gfx.Vregisters[ idx ], int(value) & 0xFF )
 
     def _set_flags_8bit(self, result, original_result=None):
-        """Set flags for 8-bit operations using readable property names"""
+        """Record an 8-bit result; Z/C/S/P are computed when the flags are next read"""
         if original_result is None:
             original_result = result
         
-        # Zero flag (Z) - result is zero
-        self.zero_flag = (result & 0xFF) == 0
-        
-        # Carry flag (C) - for subtraction (CMP), set when borrow occurs (val1 < val2)
-        # For other operations, overflow/underflow occurred
-        if hasattr(self, '_last_operation_was_cmp') and self._last_operation_was_cmp:
-            self.carry_flag = original_result < 0  # Borrow occurred
+        # Carry for subtraction (CMP) only reports a borrow (original < 0)
+        if self._last_operation_was_cmp:
+            original_result = min(original_result, 0)
             self._last_operation_was_cmp = False
-        else:
-            self.carry_flag = original_result > 0xFF or original_result < 0
-        
-        # Sign flag (S) - result is negative (bit 7 set)
-        self.sign_flag = (result & 0x80) != 0
         
-        # Parity flag (P) - even number of 1s in result
-        parity = bin(result & 0xFF).count('1') % 2
-        self.parity_flag = parity == 0
+        self._flags.pending = (result, original_result, 0xFF)
 
     def _set_flags_16bit(self, result, original_result=None):
-        """Set flags for 16-bit operations using readable property names"""
+        """Record a 16-bit result; Z/C/S/P are computed when the flags are next read"""
         if original_result is None:
             original_result = result
-            
-        # Zero flag (Z) - result is zero
-        self.zero_flag = (result & 0xFFFF) == 0
         
-        # Carry flag (C) - for subtraction (CMP), set when borrow occurs (val1 < val2)
-        # For other operations, overflow/underflow occurred
-        if hasattr(self, '_last_operation_was_cmp') and self._last_operation_was_cmp:
-            self.carry_flag = original_result < 0  # Borrow occurred
+        # Carry for subtraction (CMP) only reports a borrow (original < 0)
+        if self._last_operation_was_cmp:
+            original_result = min(original_result, 0)
             self._last_operation_was_cmp = False
-        else:
-            self.carry_flag = original_result > 0xFFFF or original_result < 0
         
-        # Sign flag (S) - result is negative (bit 15 set)
-        self.sign_flag = (result & 0x8000) != 0
-        
-        # Parity flag (P) - even number of 1s in low byte
-        parity = bin(result & 0xFF).count('1') % 2
-        self.parity_flag = parity == 0
+        self._flags.pending = (result, original_result, 0xFFFF)
 
     def _set_overflow_flag_8bit(self, op1, op2, result, is_subtraction=False):
-        """Set overflow flag for 8-bit operations using readable property name"""
-        if is_subtraction:
-            # Overflow in subtraction: (pos - neg = neg) or (neg - pos = pos)
-            overflow = ((op1 & 0x80) != (op2 & 0x80)) and ((op1 & 0x80) != (result & 0x80))
-        else:
-            # Overflow in addition: (pos + pos = neg) or (neg + neg = pos)
-            overflow = ((op1 & 0x80) == (op2 & 0x80)) and ((op1 & 0x80) != (result & 0x80))
-        self.overflow_flag = overflow
+        """Record operands for a lazily computed 8-bit overflow flag"""
+        self._flags.pending_overflow = (op1, op2, result, 0x80, is_subtraction)
 
     def _set_overflow_flag_16bit(self, op1, op2, result, is_subtraction=False):
-        """Set overflow flag for 16-bit operations using readable property name"""
-        if is_subtraction:
-            # Overflow in subtraction: (pos - neg = neg) or (neg - pos = pos)
-            overflow = ((op1 & 0x8000) != (op2 & 0x8000)) and ((op1 & 0x8000) != (result & 0x8000))
-        else:
-            # Overflow in addition: (pos + pos = neg) or (neg + neg = pos)
-            overflow = ((op1 & 0x8000) == (op2 & 0x8000)) and ((op1 & 0x8000) != (result & 0x8000))
-        self.overflow_flag = overflow
+        """Record operands for a lazily computed 16-bit overflow flag"""
+        self._flags.pending_overflow = (op1, op2, result, 0x8000, is_subtraction)
 
     # ========================================
     # BCD (Binary Coded Decimal) OPERATIONS
@@ -1005,6 +1132,7 @@ class CPU:
             # Trigger keyboard interrupt if enabled
             if self.interrupts[2] == 1:  # Keyboard interrupt enabled
                 self.keyboard[1] |= 0x80  # Set interrupt pending flag
+                self.request_event()
                 
     def read_key_from_buffer(self):
         """Read and remove the oldest key from the keyboard buffer"""
@@ -1039,6 +1167,17 @@ class CPU:
         self.keyboard[1] = 0  # Clear status flags
         self.keyboard[3] = 0  # Clear buffer count
 
+    def request_collision_interrupt(self):
+        """Latch a sprite collision interrupt (vector 5) raised by the GFX unit, if enabled"""
+        if self.interrupts[5] == 1:
+            self.collision_pending = True
+            self.request_event()
+    
+    def request_event(self):
+        """Service events before the next instruction; safe to call from the GUI thread"""
+        self.event_requested = True  # Set first, so _schedule_events cannot drop the request
+        self.next_event_cycle = 0
+    
     def interrupt(self, interrupt_vector):
         """Public method to trigger an interrupt"""
         if 0 <= interrupt_vector < 8:
@@ -1079,36 +1218,11 @@ class CPU:
             self.invalidate_prefetch()
     
     def _check_pending_interrupts(self):
-        """Optimized interrupt checking with batching and caching"""
-        # Increment counter and check if we should skip this check
-        self.interrupt_check_counter += 1
-        if self.interrupt_check_counter < self.interrupt_check_frequency:
+        """Deliver a pending keyboard, serial or collision interrupt; returns True if one was handled"""
+        # Interrupts stay pending while globally disabled
+        if self._flags[5] == 0:
             return False
         
-        # Reset counter for next batch
-        self.interrupt_check_counter = 0
-        
-        # Fast exit if interrupts are globally disabled
-        if self.flags[5] == 0:  # Interrupts disabled
-            return False
-        
-        # Create current interrupt state hash for change detection
-        current_state = (
-            (self.interrupts[1] << 7) |  # Serial enabled
-            (self.interrupts[2] << 6) |  # Keyboard enabled  
-            (self.interrupts[3] << 5) |  # User1 enabled
-            (self.interrupts[4] << 4) |  # User2 enabled
-            ((self.keyboard[1] & 0x80) >> 3) |  # Keyboard pending
-            ((self.serial[1] & 0x80) >> 4)      # Serial pending
-        )
-        
-        # Skip detailed check if state hasn't changed
-        if current_state == self.last_interrupt_state and current_state == 0:
-            return False
-            
-        self.last_interrupt_state = current_state
-        
-        # Explicit loop with early exit instead of generator
         # Check keyboard interrupt first (most common)
         if self.interrupts[2] == 1 and (self.keyboard[1] & 0x80):
             self.keyboard[1] &= 0x7F  # Clear interrupt pending flag
@@ -1120,87 +1234,86 @@ class CPU:
             self.serial[1] &= 0x7F  # Clear interrupt pending flag
             self._trigger_interrupt(1)
             return True
-            
-        # Check user interrupts
-        if self.interrupts[3] == 1:  # User interrupt 1
-            # User interrupt logic would go here
-            pass
-            
-        if self.interrupts[4] == 1:  # User interrupt 2
-            # User interrupt logic would go here
-            pass
+        
+        # Check sprite collision interrupt
+        if self.interrupts[5] == 1 and self.collision_pending:
+            self.collision_pending = False
+            self._trigger_interrupt(5)
+            return True
             
         return False  # No interrupt handled
     
-    def _check_timer_interrupt(self):
-        """Check if timer interrupt should be triggered"""
-        if not self.timer_enabled:
-            return False
-            
-        # Check if timer has reached or exceeded modulo value
-        if self.timer[1] > 0 and self.timer[0] >= self.timer[1]:
-            return True
-            
-        return False
+    def _device_interrupt_pending(self):
+        """True if an enabled keyboard, serial or collision interrupt is waiting for delivery"""
+        return bool((self.interrupts[2] == 1 and (self.keyboard[1] & 0x80)) or
+                    (self.interrupts[1] == 1 and (self.serial[1] & 0x80)) or
+                    (self.interrupts[5] == 1 and self.collision_pending))
     
-    def update_timer(self):
-        """Optimized timer update - batched for better performance"""
-        # Fast exit if timer is disabled
-        if not self.timer_enabled:
-            return
-            
-        # Check if we should increment timer based on speed setting
-        # Speed controls how many cycles per timer increment:
-        # Speed 0 = every cycle, 1 = every 2 cycles, 2 = every 4 cycles, etc.
-        # Use linear scaling instead of exponential for more reasonable control
-        speed_value = int(self.timer[3]) & 0xFF
-        if speed_value == 0:
-            speed_divisor = 1  # Every cycle
+    # ========================================
+    # EVENT SCHEDULER
+    # ========================================
+    
+    def _service_events(self):
+        """Deliver the interrupts due at the current cycle and schedule the next event"""
+        self.event_requested = False  # Anything requested from here on is seen below
+        self._check_pending_interrupts()
+        if self.cycle_count >= self.timer_event_cycle:
+            # Timer reached its modulo (or wrapped): reset the counter and interrupt
+            self._sync_timer()
+            self.timer[0] = 0
+            self._trigger_interrupt(0)
+            self._schedule_timer()
         else:
-            # Linear scaling: speed 1 = 2 cycles, speed 4 = 5 cycles, speed 16 = 17 cycles, etc.
-            speed_divisor = speed_value + 1
-        
-        # For high speeds where divisor > batch frequency, don't batch to avoid missing increments
-        if speed_divisor > self.timer_update_frequency:
-            # Process one cycle at a time for high speeds
-            self.timer_cycles += 1
-            cycles_to_process = self.timer_cycles
+            self._schedule_events()
+    
+    def _schedule_events(self):
+        """Recompute next_event_cycle from the timer and pending device interrupts"""
+        next_cycle = self.timer_event_cycle
+        if self._device_interrupt_pending():
+            # Masked interrupts are retried on every instruction until delivered
+            next_cycle = min(next_cycle, self.cycle_count + 1)
+        self.next_event_cycle = next_cycle
+        if self.event_requested:
+            # A device thread raised an interrupt after the check above: keep its request
+            self.next_event_cycle = 0
+    
+    def _timer_divisor(self):
+        """Cycles per timer increment: speed 0 = every cycle, speed N = every N+1 cycles"""
+        return (int(self.timer[3]) & 0xFF) + 1
+    
+    def _sync_timer(self):
+        """Bring the timer counter up to date with the cycle counter"""
+        elapsed = self.cycle_count - self.timer_sync_cycle
+        self.timer_sync_cycle = self.cycle_count
+        if not self.timer_enabled or elapsed <= 0:
+            return
+        increments, self.timer_cycles = divmod(self.timer_cycles + elapsed, self._timer_divisor())
+        if increments:
+            self.timer[0] = (int(self.timer[0]) + increments) & 0xFF
+    
+    def _schedule_timer(self):
+        """Compute the cycle of the next timer interrupt (timer must be synced)"""
+        modulo = int(self.timer[1])
+        if self.timer_enabled and self.interrupts[0] == 1 and modulo > 0:
+            # Interrupt when the counter reaches the modulo, or on wrap if already past it
+            counter = int(self.timer[0])
+            increments = modulo - counter if counter < modulo else 256 - counter
+            self.timer_event_cycle = (self.timer_sync_cycle + increments * self._timer_divisor()
+                                      - self.timer_cycles)
         else:
-            # Batch timer updates for better performance
-            self.timer_update_counter += 1
-            if self.timer_update_counter < self.timer_update_frequency:
-                return
-            
-            # Reset counter and process batched cycles
-            cycles_to_process = self.timer_update_counter
-            self.timer_update_counter = 0
-            
-            # Increment cycle counter by batch amount
-            self.timer_cycles += cycles_to_process
-        
-        if self.timer_cycles >= speed_divisor:
-            timer_increments = self.timer_cycles // speed_divisor
-            self.timer_cycles = self.timer_cycles % speed_divisor
-            
-            # Clamp timer increments to prevent overflow
-            # Limit to reasonable increments to avoid numpy overflow warnings
-            timer_increments = min(timer_increments, 255)
-            
-            # Increment timer counter by calculated amount (use Python int to avoid numpy overflow warnings)
-            old_timer_value = int(self.timer[0])
-            new_timer_value = (old_timer_value + int(timer_increments)) & 0xFF
-            self.timer[0] = new_timer_value
-            
-            # Check for timer interrupt after incrementing
-            # Trigger if: interrupt enabled AND modulo > 0 AND (timer wrapped around OR reached/exceeded modulo)
-            if (self.interrupts[0] == 1 and self.timer[1] > 0 and 
-                ((new_timer_value < old_timer_value) or (old_timer_value < self.timer[1] and new_timer_value >= self.timer[1]))):
-                # Reset timer counter when interrupt is triggered
-                self.timer[0] = 0
-                self._trigger_interrupt(0)
+            self.timer_event_cycle = NO_EVENT
+        self._schedule_events()
+    
+    def update_timer(self):
+        """Advance the cycle counter by one outside of step() and update the timer registers"""
+        self.cycle_count += 1
+        if self.cycle_count >= self.next_event_cycle:
+            self._service_events()
+        self._sync_timer()
     
     def set_timer_control(self, control_value):
         """Set timer control register and update timer state"""
+        self._sync_timer()
         self.timer[2] = control_value & 0xFF
         
         # Bit 0: Timer enable
@@ -1213,9 +1326,11 @@ class CPU:
         if not self.timer_enabled:
             self.timer_cycles = 0
             self.timer[0] = 0
+        self._schedule_timer()
     
     def get_timer_status(self):
         """Get timer status for debugging/monitoring"""
+        self._sync_timer()
         return {
             'counter': self.timer[0],
             'modulo': self.timer[1], 
@@ -1309,7 +1424,7 @@ class CPU:
             offset = self.pc - self.prefetch_pc
             value = self.prefetch_buffer[offset]
             self.pc = (self.pc + 1) & 0xFFFF
-            return int(value)
+            return value
         
         # Prefetch buffer miss - fill it and try again
         if not self.prefetch_valid:
@@ -1321,24 +1436,18 @@ class CPU:
                 offset = self.pc - self.prefetch_pc
                 value = self.prefetch_buffer[offset]
                 self.pc = (self.pc + 1) & 0xFFFF
-                return int(value)
+                return value
         
         # Fallback to direct memory access
         value = self.memory.read_byte(self.pc)
         self.pc = (self.pc + 1) & 0xFFFF
-        return int(value)
+        return value
     
     def _fill_prefetch_buffer(self):
         """Fill the prefetch buffer with 16 bytes starting from current PC"""
         self.prefetch_pc = self.pc
-        end_addr = min(self.pc + 16, len(self.memory.memory))
-        buffer_size = end_addr - self.pc
-        
-        # Fill buffer with available bytes
-        self.prefetch_buffer[:buffer_size] = self.memory.memory[self.pc:end_addr]
-        # Zero out unused buffer space
-        if buffer_size < 16:
-            self.prefetch_buffer[buffer_size:] = 0
+        # Fill buffer with available bytes, zero out unused buffer space
+        self.prefetch_buffer[:] = self.memory.data[self.pc:self.pc + 16].ljust(16, b'\x00')
         self.prefetch_valid = True
     
     def invalidate_prefetch(self):
@@ -1375,20 +1484,68 @@ class CPU:
             high = self.prefetch_buffer[offset]
             low = self.prefetch_buffer[offset + 1]
             self.pc += 2
-            return (int(high) << 8) | int(low)
+            return (high << 8) | low
         
         # Use individual byte fetches with prefetching
         high = self.fetch_byte()
         low = self.fetch_byte()
-        return (int(high) << 8) | int(low)
+        return (high << 8) | low
     
 
     def fetch_bytes(self, count):
         """Optimized multi-byte fetch returning list of ints"""
-        result = [int(self.memory.memory[self.pc + i]) for i in range(count)]
+        result = list(self.memory.data[self.pc:self.pc + count])
         self.pc += count
         return result
 
+    # ========================================
+    # PREDECODED INSTRUCTION CACHE
+    # ========================================
+
+    def _store_decoded(self, instruction, mode_byte, operands, start_pc, next_pc):
+        """Record a decoded instruction and mark its bytes as code"""
+        dynamic = operands is not None and any(operand.dynamic for operand in operands)
+        self.decode_cache[start_pc] = (instruction, mode_byte, operands, next_pc, dynamic)
+        self.memory.mark_code(start_pc, (next_pc - start_pc) & 0xFFFF)
+
+    def _materialize_operands(self, operands):
+        """Resolve register-based memory operands of a cached decode against the current registers"""
+        return [operand.resolve(self) if operand.dynamic else operand for operand in operands]
+
+    def invalidate_code(self, address, length=1):
+        """Drop cached decodes and blocks overlapping a written address range"""
+        self.prefetch_valid = False
+        self.code_generation += 1
+        cache = self.decode_cache
+        if not cache and not self.block_cache:
+            return
+        if length > MAX_INSTRUCTION_LENGTH * 4:
+            self.flush_decode_cache()
+            return
+        end = address + length
+        for pc in range(address - MAX_INSTRUCTION_LENGTH + 1, end):
+            entry = cache.get(pc & 0xFFFF)
+            if entry is not None and pc + ((entry[3] - pc) & 0xFFFF) > address:
+                del cache[pc & 0xFFFF]
+        code_map = self.memory.code_map
+        for addr in range(address, end):
+            code_map[addr & 0xFFFF] = 0
+        if self.block_cache:
+            stale = [pc for pc, block in self.block_cache.items()
+                     if pc < end and block[1] > address]
+            for pc in stale:
+                del self.block_cache[pc]
+
+    def flush_decode_cache(self):
+        """Discard every cached decode and translated block (program load, reset)"""
+        self.decode_cache.clear()
+        self.block_cache.clear()
+        self.code_generation += 1
+        self.memory.clear_code()
+        self.prefetch_valid = False
+        self._decode_instruction = None
+        self._cached_operands = None
+
     # ========================================
     # NEW PREFIXED OPERAND METHODS
     # ========================================
@@ -1450,64 +1607,39 @@ class CPU:
         if self.profiling_enabled:
             self.profile_data['operand_parses'] = self.profile_data.get('operand_parses', 0) + 1
         
-        # Check cache first
-        # cache_key = (self.pc - 1, self._current_mode_byte, num_operands)  # PC-1 because mode byte was already fetched
-        # if cache_key in self.operand_cache:
-        #     cached_operands = self.operand_cache[cache_key]
-        #     # Update PC as if we parsed the operands
-        #     for operand in cached_operands:
-        #         if operand['type'] == 'register':
-        #             self.pc = (self.pc + 1) & 0xFFFF  # Skip register code
-        #         elif operand['type'] == 'immediate':
-        #             if operand.get('size') == 16:
-        #                 self.pc = (self.pc + 2) & 0xFFFF  # Skip 16-bit immediate
-        #             else:
-        #                 self.pc = (self.pc + 1) & 0xFFFF  # Skip 8-bit immediate
-        #         elif operand['type'] == 'memory':
-        #             if operand.get('direct', False) and not operand.get('indexed', False):
-        #                 self.pc = (self.pc + 2) & 0xFFFF  # Skip direct address
-        #             elif not operand.get('direct', False) and not operand.get('indexed', False):
-        #                 self.pc = (self.pc + 1) & 0xFFFF  # Skip register code
-        #             # Handle other memory modes...
-        #     return cached_operands
+        # Operands already decoded by a decode cache hit
+        if self._cached_operands is not None:
+            operands = self._cached_operands
+            self._cached_operands = None
+            return operands
         
+        mode_byte = self._current_mode_byte
+        templates = []
         operands = []
         for i in range(num_operands):
-            mode_bits = (self._current_mode_byte >> (i * 2)) & 0x3
-            operand = {'mode': mode_bits}
+            mode_bits = (mode_byte >> (i * 2)) & 0x3
             
             if mode_bits == 0:  # Register direct
                 reg_code = self.fetch_byte()
                 idx, typ = self.reg_index(reg_code)
-                operand['type'] = 'register'
-                operand['reg_type'] = typ
-                operand['reg_idx'] = idx
+                operand = register_operand(mode_bits, typ, idx)
             elif mode_bits == 1:  # Immediate 8-bit
-                operand['type'] = 'immediate'
-                operand['value'] = self.fetch_byte()
-                operand['size'] = 8
+                operand = ImmediateOperand(mode_bits, self.fetch_byte(), 8)
             elif mode_bits == 2:  # Immediate 16-bit
-                operand['type'] = 'immediate'
-                operand['value'] = self.fetch_word()
-                operand['size'] = 16
-            elif mode_bits == 3:  # Memory reference
-                indexed = (self._current_mode_byte & (1 << 6)) != 0
-                direct = (self._current_mode_byte & (1 << 7)) != 0
-                operand['type'] = 'memory'
-                operand['indexed'] = indexed
-                operand['direct'] = direct
+                operand = ImmediateOperand(mode_bits, self.fetch_word(), 16)
+            else:  # Memory reference
+                indexed = (mode_byte & (1 << 6)) != 0
+                direct = (mode_byte & (1 << 7)) != 0
                 if direct and not indexed:
                     # Direct memory address
-                    operand['address'] = self.fetch_word()
+                    operand = MemoryOperand(mode_bits, self.fetch_word(), indexed, direct)
                 elif not direct and not indexed:
                     # Register indirect
                     reg_code = self.fetch_byte()
                     idx, typ = self.reg_index(reg_code)
                     if typ not in ['P', 'R']:
                         raise Exception(f"Invalid register type {typ} for indirect addressing")
-                    operand['address'] = self.Pregisters[idx] if typ == 'P' else self.Rregisters[idx]
-                    operand['reg_type'] = typ
-                    operand['reg_idx'] = idx
+                    operand = RegisterMemoryOperand(mode_bits, typ, idx, indexed)
                 elif not direct and indexed:
                     # Register indexed
                     reg_code = self.fetch_byte()
@@ -1515,27 +1647,21 @@ class CPU:
                     idx, typ = self.reg_index(reg_code)
                     if typ not in ['P', 'R']:
                         raise Exception(f"Invalid register type {typ} for indexed addressing")
-                    base_addr = self.Pregisters[idx] if typ == 'P' else self.Rregisters[idx]
-                    operand['address'] = (base_addr + index) & 0xFFFF
-                    operand['reg_type'] = typ
-                    operand['reg_idx'] = idx
-                    operand['index'] = index
-                elif direct and indexed:
+                    operand = RegisterMemoryOperand(mode_bits, typ, idx, indexed, index)
+                else:
                     # Direct indexed
                     addr = self.fetch_word()
                     index = self.fetch_byte()
-                    operand['address'] = (addr + index) & 0xFFFF
-                    operand['index'] = index
-            operands.append(operand)
-        
-        # Cache the parsed operands
-        # if len(self.operand_cache) < self.operand_cache_size:
-        #     self.operand_cache[cache_key] = operands.copy()
-        # elif len(self.operand_cache) >= self.operand_cache_size:
-        #     # Simple LRU: remove oldest entry
-        #     oldest_key = next(iter(self.operand_cache))
-        #     del self.operand_cache[oldest_key]
-        #     self.operand_cache[cache_key] = operands.copy()
+                    operand = MemoryOperand(mode_bits, (addr + index) & 0xFFFF, indexed, direct, index)
+            templates.append(operand)
+            # Register-based addresses are resolved on every execution
+            operands.append(operand.resolve(self) if operand.dynamic else operand)
+        
+        # Cache the decode for the instruction being executed
+        if self._decode_instruction is not None:
+            self._store_decoded(self._decode_instruction, mode_byte,
+                                tuple(templates), self._decode_pc, self.pc)
+            self._decode_instruction = None
         
         return operands
 
@@ -1543,48 +1669,11 @@ class CPU:
         """Get value from operand"""
         if self.profiling_enabled:
             self.profile_data['operand_values'] = self.profile_data.get('operand_values', 0) + 1
-        
-        if operand['type'] == 'register':
-            # Check cache first
-            # cache_key = (operand['reg_type'], operand['reg_idx'])
-            # if cache_key in self.register_cache:
-            #     return self.register_cache[cache_key]
-            
-            value = self._get_operand_value(operand['reg_type'], operand['reg_idx'])
-            
-            # Cache the value
-            # if len(self.register_cache) < self.register_cache_size:
-            #     self.register_cache[cache_key] = value
-            # elif len(self.register_cache) >= self.register_cache_size:
-            #     # Simple LRU
-            #     oldest_key = next(iter(self.register_cache))
-            #     del self.register_cache[oldest_key]
-            #     self.register_cache[cache_key] = value
-            
-            return value
-        elif operand['type'] == 'immediate':
-            return operand['value']
-        elif operand['type'] == 'memory':
-            # For memory operands, read appropriate size based on context
-            # For now, assume word (16-bit) for most operations
-            return self.memory.read_word(operand['address'])
-        else:
-            raise Exception(f"Unknown operand type: {operand['type']}")
+        return operand.get(self)
 
     def set_operand_value(self, operand, value):
         """Set value to operand"""
-        if operand['type'] == 'register':
-            self._set_operand_value(operand['reg_type'], operand['reg_idx'], value)
-            # Invalidate register cache for this register
-            # cache_key = (operand['reg_type'], operand['reg_idx'])
-            # if cache_key in self.register_cache:
-            #     del self.register_cache[cache_key]
-        elif operand['type'] == 'memory':
-            # For memory operands, write appropriate size
-            # For now, assume word (16-bit) for most operations
-            self.memory.write_word(operand['address'], value)
-        else:
-            raise Exception(f"Cannot set value for operand type: {operand['type']}")
+        operand.set(self, value)
 
     def get_register_value(self, reg_num):
         """Get register value by number (0-19)"""
@@ -1666,37 +1755,185 @@ class CPU:
                 self.profile_data['cycle_start_time'] = time.time()
             self.profile_data['total_cycles'] += 1
         
-        # Update timer first (so timer interrupt can happen before instruction execution)
-        self.update_timer()
-        
-        #prefetchpc = self.pc
-        opcode = self.fetch_byte()  # Use optimized fetch for single byte opcodes
-        #print( f"pre-fetch pc: {prefetchpc:04x} opcode: {opcode:04x}" )
-        self.execute( opcode )
+        # Service timer and pending interrupts before the instruction when due
+        self.cycle_count += 1
+        if self.cycle_count >= self.next_event_cycle:
+            self._service_events()
+        
+        entry = self.decode_cache.get(self.pc)
+        if entry is not None:
+            # Decode cache hit: skip fetch and operand parsing
+            instruction, mode_byte, operands, next_pc, dynamic = entry
+            if self.profiling_enabled:
+                self._count_instruction(instruction.opcode)
+            if dynamic:
+                self._cached_operands = self._materialize_operands(operands)
+            elif operands is not None:
+                self._cached_operands = operands
+            if mode_byte is not None:
+                self._current_mode_byte = mode_byte
+            self.pc = next_pc
+            instruction.execute(self)
+        else:
+            opcode = self.fetch_byte()  # Use optimized fetch for single byte opcodes
+            self.execute( opcode )
+
+    def run(self, max_cycles, stop_on=None, detect_loops=False, translate=True):
+        """Run up to max_cycles instructions and return a RunResult.
+
+        stop_on is a collection of breakpoint addresses checked before each
+        instruction. detect_loops stops on an instruction that jumps to itself.
+        Translated blocks are used unless translate is False, breakpoints are
+        set or profiling is enabled, in which case step() runs one instruction
+        at a time. With translated blocks, a polling loop that no longer
+        changes any state is fast-forwarded to the next event or the end of
+        the budget; the skipped cycles are reported as idle_cycles.
+        """
+        breakpoints = stop_on if stop_on else ()
+        cycles = 0
+        try:
+            if breakpoints or not translate or self.profiling_enabled:
+                step = self.step
+                while True:
+                    if self.halted:
+                        return RunResult(RunResult.HALTED, cycles, self.pc)
+                    if cycles >= max_cycles:
+                        return RunResult(RunResult.CYCLE_BUDGET, cycles, self.pc)
+                    pc = self.pc
+                    if pc in breakpoints:
+                        return RunResult(RunResult.BREAKPOINT, cycles, pc)
+                    step()
+                    cycles += 1
+                    if detect_loops and self.pc == pc and not self.halted:
+                        return RunResult(RunResult.INFINITE_LOOP, cycles, pc)
+            
+            block_cache = self.block_cache
+            idle_start = self.idle_cycles
+            while True:
+                if self.halted:
+                    return RunResult(RunResult.HALTED, cycles, self.pc,
+                                     idle_cycles=self.idle_cycles - idle_start)
+                remaining = max_cycles - cycles
+                if remaining <= 0:
+                    return RunResult(RunResult.CYCLE_BUDGET, cycles, self.pc,
+                                     idle_cycles=self.idle_cycles - idle_start)
+                pc = self.pc
+                block = block_cache.get(pc)
+                if (block is not None and block[2] <= remaining and
+                        self.cycle_count + block[2] < self.next_event_cycle):
+                    if block[3] and not (detect_loops and block[2] == 1):
+                        executed = self._run_polling_block(block, remaining)
+                    else:
+                        executed = block[0](self)
+                else:
+                    executed = self.step_block(remaining)
+                cycles += executed
+                if detect_loops and executed == 1 and self.pc == pc and not self.halted:
+                    return RunResult(RunResult.INFINITE_LOOP, cycles, pc)
+        except Exception as e:
+            return RunResult(RunResult.EXCEPTION, cycles, self.pc, e)
+        finally:
+            if self.sound:
+                self.sound.sync(self.cycle_count)  # Offline audio follows emulated time
+
+    def step_block(self, budget=MAX_BLOCK_INSTRUCTIONS):
+        """Execute one translated basic block; returns the number of instructions run"""
+        if self.halted:
+            return 0
         
-        # Check for other pending interrupts (keyboard, serial, etc.)
-        self._check_pending_interrupts()
+        # Profiling counts every instruction, so keep to the reference interpreter
+        if self.profiling_enabled:
+            self.step()
+            return 1
+        
+        block = self.block_cache.get(self.pc)
+        if block is None:
+            block = self.translator.translate(self.pc)
+            if block is None:
+                # First visit: interpret up to the end of the block to fill the decode cache
+                return self._interpret_block(budget)
+            self.block_cache[self.pc] = block
+        
+        run, end_pc, count, polling = block
+        if count > budget or self.cycle_count + count >= self.next_event_cycle:
+            # An event falls inside the block: step so it is serviced on time
+            self.step()
+            return 1
+        
+        return run(self)
+
+    def _idle_state(self):
+        """Snapshot of everything a polling block can read or write"""
+        self._sync_timer()
+        return (list(self.Rregisters), list(self.Pregisters), list(self._flags),
+                self.timer[0], list(self.keyboard), self.code_generation)
+
+    def _run_polling_block(self, block, budget):
+        """Run a polling block once and fast-forward if it left the machine unchanged"""
+        run, end_pc, count, polling = block
+        pc = self.pc
+        before = self._idle_state()
+        executed = run(self)
+        if executed != count or self.pc != pc or self._idle_state() != before:
+            return executed
+        
+        # Every further iteration repeats this one until an event fires or TT ticks
+        limit = self.next_event_cycle
+        if self.timer_enabled:
+            limit = min(limit, self.timer_sync_cycle + self._timer_divisor() - self.timer_cycles)
+        iterations = min(limit - 1 - self.cycle_count, budget - executed) // count
+        if iterations <= 0:
+            return executed
+        skipped = iterations * count
+        self.cycle_count += skipped
+        self.idle_cycles += skipped
+        return executed + skipped
+
+    def _interpret_block(self, budget):
+        """Run the interpreter until a block-ending instruction executes"""
+        executed = 0
+        while executed < budget and not self.halted:
+            entry = self.decode_cache.get(self.pc)
+            opcode = entry[0].opcode if entry is not None else self.memory.read_byte(self.pc)
+            self.step()
+            executed += 1
+            if opcode in BLOCK_TERMINATORS:
+                break
+        return executed
+
+    def _count_instruction(self, opcode):
+        """Record an executed opcode in the profile data"""
+        self.profile_data['instructions_executed'] += 1
+        if opcode not in self.profile_data['opcode_counts']:
+            self.profile_data['opcode_counts'][opcode] = 0
+        self.profile_data['opcode_counts'][opcode] += 1
 
     def execute(self, opcode):
         """Execute instruction using dispatch table"""
         if self.profiling_enabled:
-            self.profile_data['instructions_executed'] += 1
-            if opcode not in self.profile_data['opcode_counts']:
-                self.profile_data['opcode_counts'][opcode] = 0
-            self.profile_data['opcode_counts'][opcode] += 1
-        
-        instruction = self.instruction_table.get(opcode)
-        if instruction:
-            # Check if this is a no-operand instruction
-            if opcode in [0x00, 0xFF, 0x01, 0x02, 0x03, 0x04, 0x1A, 0x1B, 0x1C, 0x1D, 0x3B]:  # HLT, NOP, RET, IRET, CLI, STI, PUSHF, POPF, PUSHA, POPA, SINV
-                # No-operand instructions don't have mode byte
-                instruction.execute(self)
-            else:
-                # All other instructions use prefixed operand format
-                self._current_mode_byte = self.fetch_byte()
-                instruction.execute(self)
+            self._count_instruction(opcode)
+        
+        handler = self.dispatch_table[opcode]
+        start_pc = (self.pc - 1) & 0xFFFF  # Opcode was already fetched
+        self._cached_operands = None
+        if not self.has_mode_byte[opcode]:
+            # No-operand instructions (and the unknown opcode trap) have no mode byte;
+            # the decode is only stored once execute() has not trapped
+            next_pc = self.pc
+            handler(self)
+            self._store_decoded(handler.__self__, None, None, start_pc, next_pc)
         else:
-            raise Exception(f"Unknown opcode: {opcode:02X}")
+            # All other instructions use prefixed operand format
+            self._current_mode_byte = self.fetch_byte()
+            # parse_operands() stores the decode once the operand length is known
+            self._decode_pc = start_pc
+            self._decode_instruction = handler.__self__
+            handler(self)
+            if self._decode_instruction is not None:
+                # Instruction takes no operands beyond the mode byte
+                self._store_decoded(handler.__self__, self._current_mode_byte, None,
+                                    start_pc, (start_pc + 2) & 0xFFFF)
+                self._decode_instruction = None
 
 if __name__ == "__main__":
     print("Nova-16")
\ No newline at end of file
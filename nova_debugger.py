@@ -187,7 +187,8 @@ class NovaDebugger:
         print("P0-P9:", ' '.join(f"P{i}:0x{int(val):04X}" for i, val in enumerate(self.cpu.Pregisters[:10])))
         print(f"VM: 0x{self.gpu.Vregisters[2]:04X} VX: 0x{self.gpu.Vregisters[0]:04X} VY: 0x{self.gpu.Vregisters[1]:04X} VL: 0x{self.gpu.VL:04X}")
         print(f"SA: 0x{self.sound.SA:04X} SF: 0x{self.sound.SF:04X} SV: 0x{self.sound.SV:04X} SW: 0x{self.sound.SW:04X}")
-        print(f"TT: 0x{self.cpu.timer[0]:04X} TM: 0x{self.cpu.timer[1]:04X} TC: 0x{self.cpu.timer[2]:04X} TS: 0x{self.cpu.timer[3]:04X}")
+        timer = self.cpu.get_timer_status()  # Brings the lazily counted TT up to date
+        print(f"TT: 0x{timer['counter']:04X} TM: 0x{timer['modulo']:04X} TC: 0x{timer['control']:04X} TS: 0x{timer['speed']:04X}")
         # Show flags if available
         if hasattr(self.cpu, '_flags'):
             print("FLAGS:", ' '.join(str(int(f)) for f in self.cpu._flags))
@@ -283,27 +284,17 @@ class NovaDebugger:
     def run_until_breakpoint(self):
         """Run until a breakpoint is hit or program halts"""
         print("Running until breakpoint...")
-        steps = 0
         max_steps = 100000  # Prevent infinite loops
         
-        while steps < max_steps:
-            if self.cpu.pc in self.breakpoints:
-                print(f"Breakpoint hit at 0x{self.cpu.pc:04X}")
-                self.print_current_instruction()
-                break
-                
-            if self.cpu.halted:
-                print("Program halted")
-                break
-                
-            try:
-                self.cpu.step()
-                steps += 1
-            except Exception as e:
-                print(f"Error during execution at PC 0x{self.cpu.pc:04X}: {e}")
-                break
-                
-        if steps >= max_steps:
+        result = self.cpu.run(max_steps, stop_on=self.breakpoints)
+        if result.reason == cpu.RunResult.BREAKPOINT:
+            print(f"Breakpoint hit at 0x{self.cpu.pc:04X}")
+            self.print_current_instruction()
+        elif result.reason == cpu.RunResult.HALTED:
+            print("Program halted")
+        elif result.reason == cpu.RunResult.EXCEPTION:
+            print(f"Error during execution at PC 0x{self.cpu.pc:04X}: {result.error}")
+        else:
             print(f"Stopped after {max_steps} steps (possible infinite loop)")
             
         self.print_registers()
@@ -1,11 +1,56 @@
+from collections import OrderedDict
+from functools import lru_cache
+
 import numpy as np
 from font import font_data
 
+# Dirty-tile tracking granularity (pixels per tile side)
+TILE_SIZE = 16
+
+# Glyph atlas built once from the font: one 8x8 mask per character code 32-127,
+# bit 7 of each font byte is the leftmost pixel
+GLYPH_MASKS = np.unpackbits(
+    np.array( font_data[:96 * 8], dtype=np.uint8 ).reshape( 96, 8, 1 ), axis=2 ).astype( bool )
+GLYPH_ROWS = np.arange( 8 ).reshape( 1, 8, 1 )
+GLYPH_COLUMNS = np.arange( 8 ).reshape( 1, 1, 8 )
+
+# Tilemap backgrounds: 8x8 pixel tiles, a 32x32 map of tile indices covers a layer
+TILEMAP_TILE_SIZE = 8
+TILEMAP_PATTERN_OFFSETS = np.arange( 64 ).reshape( 1, 8, 8 )  # Byte offsets inside one 64-byte pattern
+
+# Blend modes understood by blend_table (anything else writes the new pixel unchanged)
+BLEND_NORMAL, BLEND_ADD, BLEND_SUBTRACT, BLEND_MULTIPLY, BLEND_SCREEN = range( 5 )
+
+@lru_cache( maxsize=16 )
+def blend_table( mode, alpha ):
+    """256x256 lookup table of blend results indexed [existing, new], or None for overwrite"""
+    if mode not in ( BLEND_ADD, BLEND_SUBTRACT, BLEND_MULTIPLY, BLEND_SCREEN ):
+        return None
+    existing = np.arange( 256 ).reshape( 256, 1 )
+    new = np.arange( 256 ).reshape( 1, 256 )
+    alpha = max( 0, min( 255, int( alpha ) ) ) / 255.0
+    
+    if mode == BLEND_ADD:
+        result = existing + ( new * alpha )
+    elif mode == BLEND_SUBTRACT:
+        result = existing - ( new * alpha )
+    elif mode == BLEND_MULTIPLY:
+        result = ( existing * new * alpha ) / 255.0
+    else:
+        # Screen: 1 - (1-a) * (1-b)
+        result = 255 - ( ( 255 - existing ) * ( 255 - new ) * alpha ) / 255.0
+    
+    table = np.clip( result, 0, 255 ).astype( np.uint8 )
+    table.flags.writeable = False  # Shared between every GFX using this mode
+    return table
+
 class GFX:
     def __init__( self, width = 256, height = 256 ):
         self.width = width
         self.height = height
-        self.screen = np.zeros( ( self.height, self.width ), dtype=np.uint8 )
+        # All nine video layers in one contiguous stack: 0 = main screen,
+        # 1-4 = BG layers, 5-8 = sprite layers
+        self.layers = np.zeros( ( 9, self.height, self.width ), dtype=np.uint8 )
         self.Vregisters = np.zeros( 3, dtype=np.uint8 )  # VX, VY, VM (video mode)
         # Keep vmode for backward compatibility, but it will sync with Vregisters[2]
         self.vmode = 0
@@ -18,26 +63,38 @@ class GFX:
         # Video layers system
         self.VL = 0  # Video Layer register (0 = main screen, 1-4 = BG layers, 5-8 = Sprite layers)
         self.current_layer = 0  # Current active layer (same as VL initially)
-        self.background_layers = [np.zeros((self.height, self.width), dtype=np.uint8) for _ in range(4)]  # BG layers 1-4
-        self.sprite_layers = [np.zeros((self.height, self.width), dtype=np.uint8) for _ in range(4)]      # Sprite layers 5-8
+        self.background_layers = [self.layers[i] for i in range(1, 5)]  # BG layers 1-4 (views)
+        self.sprite_layers = [self.layers[i] for i in range(5, 9)]      # Sprite layers 5-8 (views)
         
-        # Layer compositing optimization
-        self.layers_dirty = False  # Track if layers need recompositing
-        self.auto_composite = True  # Automatically composite when accessing screen
+        # Compositing scratch: per-layer keep masks (0xFF where a layer pixel is transparent)
+        # and one frame-sized buffer for layer swaps
+        self._keep_masks = np.empty( ( 8, self.height, self.width ), dtype=np.uint8 )
+        self._layer_scratch = np.empty( ( self.height, self.width ), dtype=np.uint8 )
+        self._stack_scratch = np.empty( ( 8, self.height, self.width ), dtype=np.uint8 )
         
-        # Layer visibility controls
-        self.layer_visibility = {i: True for i in range(9)}  # All layers visible by default
+        # Per-layer scroll registers (SX/SY) for layers 1-8: wrap-around offsets applied
+        # at composite time and folded into the layer buffer before it is next drawn to
+        self.scroll_x = np.zeros( 9, dtype=np.int32 )
+        self.scroll_y = np.zeros( 9, dtype=np.int32 )
+        self.scroll_pending = False  # True while any layer has a non-zero offset
         
         # Layer compositing optimization
         self.layers_dirty = False  # Track if layers need recompositing
         self.auto_composite = True  # Automatically composite when accessing screen
         
-        # Layer visibility controls
-        self.layer_visibility = {i: True for i in range(9)}  # All layers visible by default
+        # Dirty tiles per layer (0 = screen, 1-8 = BG/sprite layers); only tiles
+        # touched since the last composite are recomposited by get_screen()
+        self.tiles_x = (self.width + TILE_SIZE - 1) // TILE_SIZE
+        self.tiles_y = (self.height + TILE_SIZE - 1) // TILE_SIZE
+        self.dirty_tiles = np.zeros((9, self.tiles_y, self.tiles_x), dtype=bool)
+        
+        # Layer visibility mask (all layers visible by default)
+        self.layer_visibility = np.ones(9, dtype=bool)
         
         # Graphics blending system
-        self.blend_mode = 0      # 0=normal, 1=add, 2=subtract, 3=multiply, 4=screen
-        self.blend_alpha = 255   # Alpha/intensity for blending (0-255)
+        self._blend_mode = 0     # 0=normal, 1=add, 2=subtract, 3=multiply, 4=screen
+        self._blend_alpha = 255  # Alpha/intensity for blending (0-255)
+        self.blend_lut = None    # Table for the current mode/alpha, None while overwriting
         
         # Graphics optimization - batching and dirty region tracking
         self.graphics_batch_counter = 0
@@ -58,144 +115,63 @@ class GFX:
         # Offset 3: Y position (8-bit) 
         # Offset 4: Width (8-bit)
         # Offset 5: Height (8-bit)
-        # Offset 6: Flags (8-bit) - bit 0: active, bit 1: transparency enabled, bit 7: layer (0=sprite layer 5, 1=sprite layer 6)
+        # Offset 6: Flags (8-bit) - bit 0: active, bit 1: transparency enabled, bit 2: collision interrupt,
+        #           bit 7: layer (0=sprite layer 5, 1=sprite layer 6)
         # Offset 7: Transparency color (8-bit)
-        # Offset 8-15: Reserved for future use
+        # Offset 8-9: Pixel collision mask (16-bit, big-endian, bit n = touching sprite n), set by GFX
+        # Offset 10-11: Bounding-box collision mask (16-bit, big-endian), set by GFX
+        # Offset 12-15: Reserved for future use
         
         # Sprite rendering optimization
         self.sprites_dirty = False  # Track if sprites need re-rendering
+        self.dirty_sprites = set()  # Sprite ids whose control block or bitmap data changed
+        self.sprite_bitmaps = OrderedDict()  # (data_addr, width, height) -> decoded bitmap, least recently drawn first
+        self.sprite_bitmap_capacity = 256    # Bitmaps kept once sprites are drawn; those on screen are never dropped
+        self.sprite_memory = None   # Memory the bitmap cache and sprite state belong to
+        # Resolved sprites as last drawn by blit_all_sprites, None when the sprite
+        # layers were changed by anything else and need a full redraw
+        self.sprite_state = None
+        
+        # Sprite collision registers, updated by blit_all_sprites and mirrored
+        # into offsets 8-11 of each control block
+        self.sprite_collisions = [0] * self.sprite_count      # Opaque pixels overlap
+        self.sprite_box_collisions = [0] * self.sprite_count  # Bounding boxes overlap
+        self.collision_interrupt = None  # Called when a sprite with flag bit 2 starts colliding
+        
+        # Tilemap backgrounds - memory-mapped control blocks for BG layers 1-4
+        # 4 layers × 8 bytes each = 32 bytes (0xF100-0xF11F)
+        # Offset 0: Flags (8-bit) - bit 0: tilemap mode enabled
+        # Offset 1-2: Map address (16-bit, big-endian) - 32x32 tile indices, row-major
+        # Offset 3-4: Pattern table address (16-bit, big-endian) - 64 bytes per tile, 8 rows of 8 pixels
+        # Offset 5-7: Reserved for future use
+        self.tilemap_memory_base = 0xF100
+        self.tilemap_block_size = 8
+        self.tilemap_cells = self.width // TILEMAP_TILE_SIZE  # Map is tilemap_cells × tilemap_cells
+        self.tilemaps = {}              # Layer number -> state of an enabled tilemap
+        self.tilemap_memory = None      # Memory the tilemaps are read from
+        self.tilemaps_pending = False   # True while any tilemap has cells to re-render
+        
+        # Palette as an (N, 3) uint8 RGB table, rebuilt only when the palette changes;
+        # presenters compare palette_version to know when to re-upload it
+        self.palette = []
+        self.palette_lut = np.zeros( ( 0, 3 ), dtype=np.uint8 )
+        self.palette_version = 0
+        
+        # Bumped by get_screen() whenever the frame it returns differs from the last one;
+        # screen_changed covers layer 0, which is drawn in place and never sets layers_dirty
+        self.frame_version = 0
+        self.screen_changed = False
 
-    def roll_x( self, roll_x ):
-        # Roll the current layer by roll_x pixels horizontally, pixels roll over to the opposite side
-        if self.VL == 0:
-            self.screen = np.roll( self.screen, roll_x, axis=1 )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.roll( self.background_layers[self.VL - 1], roll_x, axis=1 )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.roll( self.sprite_layers[self.VL - 5], roll_x, axis=1 )
-            self.layers_dirty = True
-
-    def roll_y( self, roll_y ):
-        # Roll the current layer by roll_y pixels vertically, pixels roll over to the opposite side
-        if self.VL == 0:
-            self.screen = np.roll( self.screen, roll_y, axis=0 )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.roll( self.background_layers[self.VL - 1], roll_y, axis=0 )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.roll( self.sprite_layers[self.VL - 5], roll_y, axis=0 )
-            self.layers_dirty = True
-
-    def shift_x( self, shift_x ):
-        # Shift the current layer by shift_x pixels horizontally, pixels that roll over are erased (set to 0)
-        if self.VL == 0:
-            if shift_x > 0:
-                self.screen[ :, shift_x: ] = self.screen[ :, :-shift_x ]
-                self.screen[ :, :shift_x ] = 0
-            elif shift_x < 0:
-                self.screen[ :, :shift_x ] = self.screen[ :, -shift_x: ]
-                self.screen[ :, shift_x: ] = 0
-        elif 1 <= self.VL <= 4:
-            layer = self.background_layers[self.VL - 1]
-            if shift_x > 0:
-                layer[ :, shift_x: ] = layer[ :, :-shift_x ]
-                layer[ :, :shift_x ] = 0
-            elif shift_x < 0:
-                layer[ :, :shift_x ] = layer[ :, -shift_x: ]
-                layer[ :, shift_x: ] = 0
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            layer = self.sprite_layers[self.VL - 5]
-            if shift_x > 0:
-                layer[ :, shift_x: ] = layer[ :, :-shift_x ]
-                layer[ :, :shift_x ] = 0
-            elif shift_x < 0:
-                layer[ :, :shift_x ] = layer[ :, -shift_x: ]
-                layer[ :, shift_x: ] = 0
-            self.layers_dirty = True
-        # If shift_x == 0, do nothing
-
-    def shift_y( self, shift_y ):
-        # Shift the current layer by shift_y pixels vertically, pixels that roll over are erased (set to 0)
-        if self.VL == 0:
-            if shift_y > 0:
-                self.screen[ shift_y:, : ] = self.screen[ :-shift_y, : ]
-                self.screen[ :shift_y, : ] = 0
-            elif shift_y < 0:
-                self.screen[ :shift_y, : ] = self.screen[ -shift_y:, : ]
-                self.screen[ shift_y:, : ] = 0
-        elif 1 <= self.VL <= 4:
-            layer = self.background_layers[self.VL - 1]
-            if shift_y > 0:
-                layer[ shift_y:, : ] = layer[ :-shift_y, : ]
-                layer[ :shift_y, : ] = 0
-            elif shift_y < 0:
-                layer[ :shift_y, : ] = layer[ -shift_y:, : ]
-                layer[ shift_y:, : ] = 0
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            layer = self.sprite_layers[self.VL - 5]
-            if shift_y > 0:
-                layer[ shift_y:, : ] = layer[ :-shift_y, : ]
-                layer[ :shift_y, : ] = 0
-            elif shift_y < 0:
-                layer[ :shift_y, : ] = layer[ -shift_y:, : ]
-                layer[ shift_y:, : ] = 0
-            self.layers_dirty = True
-        # If shift_y == 0, do nothing
-
-    def flip_x( self ):
-        # Flip the current layer horizontally
-        if self.VL == 0:
-            self.screen = np.flip( self.screen, axis=1 )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.flip( self.background_layers[self.VL - 1], axis=1 )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.flip( self.sprite_layers[self.VL - 5], axis=1 )
-            self.layers_dirty = True
-
-    def flip_y( self ):
-        # Flip the current layer vertically
-        if self.VL == 0:
-            self.screen = np.flip( self.screen, axis=0 )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.flip( self.background_layers[self.VL - 1], axis=0 )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.flip( self.sprite_layers[self.VL - 5], axis=0 )
-            self.layers_dirty = True
-
-    def rotate_r( self, times ):
-        # Rotate the current layer 90 degrees clockwise
-        if self.VL == 0:
-            self.screen = np.rot90( self.screen, times, axes=(1,0) )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.rot90( self.background_layers[self.VL - 1], times, axes=(1,0) )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.rot90( self.sprite_layers[self.VL - 5], times, axes=(1,0) )
-            self.layers_dirty = True
-
-    def rotate_l( self, times ):
-        # Rotate the current layer 90 degrees counter-clockwise
-        if self.VL == 0:
-            self.screen = np.rot90( self.screen, times, axes=(0,1) )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.rot90( self.background_layers[self.VL - 1], times, axes=(0,1) )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.rot90( self.sprite_layers[self.VL - 5], times, axes=(0,1) )
-            self.layers_dirty = True
-
-    def rotate_left( self, times ):
-        # Alias for rotate_l
-        self.rotate_l(times)
-
-    def rotate_right( self, times ):
-        # Alias for rotate_r
-        self.rotate_r(times)
+    @property
+    def screen(self):
+        """Main screen (layer 0), which also receives the composited frame"""
+        return self.layers[0]
+    
+    @screen.setter
+    def screen(self, screen):
+        self.layers[0] = screen
+        self.screen_changed = True
+    
     @property
     def vmode(self):
         """Video mode - now uses VM register (Vregisters[2])"""
@@ -206,35 +182,50 @@ class GFX:
         """Set video mode through VM register (Vregisters[2])"""
         self.Vregisters[2] = value & 0xFF
 
+    @property
+    def blend_mode(self):
+        """Blend mode applied to pixel writes (0=normal, 1=add, 2=subtract, 3=multiply, 4=screen)"""
+        return self._blend_mode
+    
+    @blend_mode.setter
+    def blend_mode(self, mode):
+        self._blend_mode = int(mode)
+        self.blend_lut = blend_table(self._blend_mode, self._blend_alpha)
+    
+    @property
+    def blend_alpha(self):
+        """Alpha/intensity for blending (0-255)"""
+        return self._blend_alpha
+    
+    @blend_alpha.setter
+    def blend_alpha(self, alpha):
+        self._blend_alpha = int(alpha)
+        self.blend_lut = blend_table(self._blend_mode, self._blend_alpha)
+    
+    def set_blend_mode(self, mode, alpha=None):
+        """Select the blend mode (and optionally alpha) used by subsequent drawing"""
+        if alpha is not None:
+            self._blend_alpha = int(alpha)
+        self.blend_mode = mode
+    
     def blend_pixel(self, existing, new):
         """Apply current blend mode to combine existing and new pixel values"""
-        # Ensure inputs are in valid range and use float for calculations
-        existing = max(0, min(255, int(existing)))
+        # Ensure inputs are in valid range
         new = max(0, min(255, int(new)))
-        alpha = max(0, min(255, int(self.blend_alpha))) / 255.0
-        
-        if self.blend_mode == 0:  # Normal (overwrite)
+        if self.blend_lut is None:
             return new
-        elif self.blend_mode == 1:  # Additive
-            result = existing + (new * alpha)
-            return min(255, int(result))
-        elif self.blend_mode == 2:  # Subtractive
-            result = existing - (new * alpha)
-            return max(0, int(result))
-        elif self.blend_mode == 3:  # Multiply
-            result = (existing * new * alpha) / 255.0
-            return min(255, int(result))
-        elif self.blend_mode == 4:  # Screen
-            # Screen: 1 - (1-a) * (1-b)
-            inv_existing = 255 - existing
-            inv_new = 255 - new
-            result = 255 - (inv_existing * inv_new * alpha) / 255.0
-            return min(255, int(result))
+        return int(self.blend_lut[max(0, min(255, int(existing))), new])
+    
+    def _blend_into(self, buffer, index, value):
+        """Write value (scalar or array) to buffer[index] through the current blend table"""
+        if self.blend_lut is None:
+            buffer[index] = value
         else:
-            return new  # Default to normal
+            buffer[index] = self.blend_lut[buffer[index], value]
 
     def clear( self ):
         self.screen.fill( 0 )
+        self.mark_layer_dirty(0)
 
     def VRAMtoScreen( self ):
         """Optimized VRAM to Screen transfer with batching"""
@@ -251,6 +242,7 @@ class GFX:
             # For immediate responsiveness, still do the copy but skip expensive simulations
             self.screen[:, :] = self.vram[:, :]
             self.vram.fill( 0 )
+            self.mark_layer_dirty(0)
 
     def _execute_batched_operations(self):
         """Execute all pending graphics operations in a batch"""
@@ -263,12 +255,14 @@ class GFX:
             # Vectorized operation: copy entire VRAM to screen in one operation
             self.screen[:, :] = self.vram[:, :]
             self.vram.fill( 0 )
+            self.mark_layer_dirty(0)
             self.pending_vram_to_screen = False
             
         if self.pending_screen_to_vram:
             # Vectorized operation: copy entire screen to VRAM in one operation
             self.vram[:, :] = self.screen[:, :]
             self.screen.fill( 0 )
+            self.mark_layer_dirty(0)
             self.pending_screen_to_vram = False
         
         # Skip expensive HBlank simulation entirely for batched operations
@@ -289,6 +283,7 @@ class GFX:
             # For immediate responsiveness, still do the copy but skip expensive simulations
             self.vram[:, :] = self.screen[:, :]
             self.screen.fill( 0 )
+            self.mark_layer_dirty(0)
 
     def set_registers( self, registers ):
         self.registers = registers
@@ -316,76 +311,50 @@ class GFX:
     
     def get_target_layer( self ):
         """Get the target layer buffer based on VL register value"""
-        if self.VL == 0:
-            return self.screen  # Main screen
-        elif 1 <= self.VL <= 4:
-            return self.background_layers[self.VL - 1]  # Background layers
-        elif 5 <= self.VL <= 8:
-            return self.sprite_layers[self.VL - 5]  # Sprite layers
-        else:
-            return self.screen  # Default to main screen for invalid values
-    
-    def clear_layer( self, layer_num=None ):
-        """Clear a specific layer or the current VL layer"""
-        if layer_num is None:
-            layer_num = self.VL
-        
-        if layer_num == 0:
-            self.screen.fill(0)
-        elif 1 <= layer_num <= 4:
-            self.background_layers[layer_num - 1].fill(0)
-            self.layers_dirty = True
-        elif 5 <= layer_num <= 8:
-            self.sprite_layers[layer_num - 5].fill(0)
-            self.layers_dirty = True
+        if 0 <= self.VL <= 8:
+            if self.scroll_pending:
+                self.settle_scroll(self.VL)
+            return self.layers[self.VL]
+        return self.screen  # Default to main screen for invalid values
     
     def fill_layer( self, value, layer_num=None ):
         """Fill a specific layer or the current VL layer with a value"""
         if layer_num is None:
             layer_num = self.VL
         
-        if layer_num == 0:
-            self.screen.fill(value)
-        elif 1 <= layer_num <= 4:
-            self.background_layers[layer_num - 1].fill(value)
-            self.layers_dirty = True
-        elif 5 <= layer_num <= 8:
-            self.sprite_layers[layer_num - 5].fill(value)
-            self.layers_dirty = True
-    
-    def copy_layer( self, src_layer, dst_layer ):
-        """Copy contents from one layer to another"""
-        src_buffer = self.get_layer_buffer_by_num(src_layer)
-        dst_buffer = self.get_layer_buffer_by_num(dst_layer)
-        if src_buffer is not None and dst_buffer is not None:
-            dst_buffer[:] = src_buffer[:]
+        if 0 <= layer_num <= 8:
+            self.layers[layer_num].fill(value)
+            self._set_scroll(layer_num, 0, 0)
+            self.mark_layer_dirty(layer_num)
     
     def get_layer_buffer_by_num( self, layer_num ):
         """Get layer buffer by layer number"""
-        if layer_num == 0:
-            return self.screen
-        elif 1 <= layer_num <= 4:
-            return self.background_layers[layer_num - 1]
-        elif 5 <= layer_num <= 8:
-            return self.sprite_layers[layer_num - 5]
-        else:
-            return None
+        if 0 <= layer_num <= 8:
+            if self.scroll_pending:
+                self.settle_scroll(layer_num)
+            return self.layers[layer_num]
+        return None
     
-    def set_layer_visibility( self, layer_num, visible ):
-        """Set layer visibility for compositing (Phase 2 advanced feature)"""
-        # For now, just store visibility state - we could extend this later
-        if not hasattr(self, 'layer_visibility'):
-            self.layer_visibility = {}
-        self.layer_visibility[layer_num] = visible
-
     def set_screen( self, screen ):
-        self.screen = screen
+        self.layers[0] = screen
+        self.mark_layer_dirty(0)
     
     def get_screen( self ):
+        if self.tilemaps_pending:
+            self.refresh_tilemaps()
+        # Sprites are drawn once per frame after control block or bitmap writes flagged them
+        if self.sprites_dirty and self.sprite_memory is not None and (self.dirty_sprites or self.sprite_state is not None):
+            self.blit_all_sprites(self.sprite_memory)
+        if self.layers_dirty or self.screen_changed:
+            self.frame_version += 1
+            self.screen_changed = False
         # Lazy compositing: only composite if layers are dirty and auto_composite is enabled
         if self.auto_composite and self.layers_dirty:
-            self.composite_layers()
-            self.layers_dirty = False
+            if self.dirty_tiles[1:].any():
+                self.composite_dirty_tiles()
+            else:
+                # Flagged dirty without tile information: recomposite everything
+                self.composite_layers()
         return self.screen
     
     # Layer Management Methods
@@ -394,12 +363,12 @@ class GFX:
         """Set layer visibility for compositing"""
         if 0 <= layer <= 8:
             self.layer_visibility[layer] = visible
-            self.layers_dirty = True  # Mark for recompositing
+            self.mark_layer_dirty(layer)  # Mark for recompositing
     
     def get_layer_visibility(self, layer):
         """Get layer visibility status"""
         if 0 <= layer <= 8:
-            return self.layer_visibility[layer]
+            return bool(self.layer_visibility[layer])
         return False
     
     def copy_layer(self, source_layer, dest_layer):
@@ -407,23 +376,28 @@ class GFX:
         if source_layer == dest_layer:
             return
             
-        source_data = None
-        if source_layer == 0:
-            source_data = self.screen.copy()
-        elif 1 <= source_layer <= 4:
-            source_data = self.background_layers[source_layer - 1].copy()
-        elif 5 <= source_layer <= 8:
-            source_data = self.sprite_layers[source_layer - 5].copy()
-        
-        if source_data is not None:
-            if dest_layer == 0:
-                self.screen[:] = source_data
-            elif 1 <= dest_layer <= 4:
-                self.background_layers[dest_layer - 1][:] = source_data
-            elif 5 <= dest_layer <= 8:
-                self.sprite_layers[dest_layer - 5][:] = source_data
+        if 0 <= source_layer <= 8 and 0 <= dest_layer <= 8:
+            self._copy_layer_contents(source_layer, dest_layer)
+            self.mark_layer_dirty(dest_layer)
+    
+    def move_layer(self, source_layer, dest_layer):
+        """Move contents from one layer to another, clearing the source"""
+        if source_layer == dest_layer:
+            return
             
-            self.layers_dirty = True
+        if 0 <= source_layer <= 8 and 0 <= dest_layer <= 8:
+            self._copy_layer_contents(source_layer, dest_layer)
+            self.layers[source_layer].fill(0)
+            self._set_scroll(source_layer, 0, 0)
+            self.mark_layer_dirty(dest_layer)
+            self.mark_layer_dirty(source_layer)
+    
+    def _copy_layer_contents(self, source_layer, dest_layer):
+        """Copy a layer buffer, carrying its pending scroll along when both layers can hold one"""
+        if dest_layer == 0 and self.scroll_pending:
+            self.settle_scroll(source_layer)  # The screen has no scroll registers
+        self.layers[dest_layer] = self.layers[source_layer]
+        self._set_scroll(dest_layer, self.scroll_x[source_layer], self.scroll_y[source_layer])
     
     def set_current_layer(self, layer):
         """Set the current graphics layer (0=screen, 1-4=background, 5-8=sprite)"""
@@ -439,40 +413,159 @@ class GFX:
         if layer is None:
             layer = self.current_layer
         
-        if layer == 0:
-            self.screen.fill(0)
-        elif 1 <= layer <= 4:
-            self.background_layers[layer - 1].fill(0)
-        elif 5 <= layer <= 8:
-            self.sprite_layers[layer - 5].fill(0)
+        if 0 <= layer <= 8:
+            self.layers[layer].fill(0)
+            self._set_scroll(layer, 0, 0)
+            self.mark_layer_dirty(layer)
     
-    def composite_layers(self):
-        """Composite all visible layers into the main screen buffer"""
-        # Preserve the current screen content (layer 0)
-        temp = self.screen.copy()
-        
-        # Clear the screen and restore layer 0 if visible
-        self.screen.fill(0)
-        if self.layer_visibility.get(0, True):
-            self.screen[:, :] = temp[:, :]
-        
-        # Add background layers (1-4) on top
-        for i, layer in enumerate(self.background_layers):
-            layer_num = i + 1
-            if self.layer_visibility.get(layer_num, True):  # Check visibility
-                mask = layer != 0  # Non-zero pixels are opaque
-                self.screen[mask] = layer[mask]
-        
-        # Add sprite layers (5-8) on top
-        for i, layer in enumerate(self.sprite_layers):
-            layer_num = i + 5
-            if self.layer_visibility.get(layer_num, True):  # Check visibility
-                mask = layer != 0  # Non-zero pixels are opaque
-                self.screen[mask] = layer[mask]
+    # ========================================
+    # LAYER SCROLL REGISTERS
+    # ========================================
+    
+    def _set_scroll(self, layer_num, scroll_x, scroll_y):
+        """Set a layer's scroll registers without touching its pixels"""
+        if 1 <= layer_num <= 8:
+            self.scroll_x[layer_num] = scroll_x % self.width
+            self.scroll_y[layer_num] = scroll_y % self.height
+            self.scroll_pending = bool(self.scroll_x.any() or self.scroll_y.any())
+    
+    def settle_scroll(self, layer_num=None):
+        """Fold pending scroll offsets into the layer buffers (all layers if layer_num is None)"""
+        layer_nums = range(1, 9) if layer_num is None else (layer_num,)
+        for num in layer_nums:
+            if 1 <= num <= 8 and (self.scroll_x[num] or self.scroll_y[num]):
+                layer = self.layers[num]
+                layer[:] = np.roll(layer, (int(self.scroll_y[num]), int(self.scroll_x[num])), axis=(0, 1))
+                self._set_scroll(num, 0, 0)
+    
+    def scroll_layer(self, layer_num, dx=0, dy=0):
+        """Roll a layer with wrap-around; BG and sprite layers only move their scroll registers"""
+        if layer_num == 0:
+            self.screen[:] = np.roll(self.screen, (dy, dx), axis=(0, 1))
+        elif 1 <= layer_num <= 8:
+            self._set_scroll(layer_num, self.scroll_x[layer_num] + dx, self.scroll_y[layer_num] + dy)
+        self.mark_layer_dirty(layer_num)
+    
+    def shift_layer(self, layer_num, dx=0, dy=0):
+        """Shift a layer, erasing (setting to 0) the pixels that roll over"""
+        if not 0 <= layer_num <= 8:
+            return
+        self.scroll_layer(layer_num, dx, dy)
+        
+        # Clear the band scrolled in from the edge, mapped back to buffer coordinates
+        layer = self.layers[layer_num]
+        if dx:
+            band = np.arange(min(dx, self.width)) if dx > 0 else np.arange(max(self.width + dx, 0), self.width)
+            layer[:, (band - self.scroll_x[layer_num]) % self.width] = 0
+        if dy:
+            band = np.arange(min(dy, self.height)) if dy > 0 else np.arange(max(self.height + dy, 0), self.height)
+            layer[(band - self.scroll_y[layer_num]) % self.height, :] = 0
+    
+    def _scrolled_stack(self, y1, y2, x1, x2):
+        """Gather a rectangle of layers 1-8 as displayed, applying their scroll registers"""
+        stack = self._stack_scratch[:, :y2 - y1, :x2 - x1]
+        rows = np.arange(y1, y2)
+        columns = np.arange(x1, x2)
+        for index, layer_num in enumerate(range(1, 9)):
+            scroll_x = int(self.scroll_x[layer_num])
+            scroll_y = int(self.scroll_y[layer_num])
+            layer = self.layers[layer_num]
+            if scroll_x or scroll_y:
+                band = np.take(layer, rows - scroll_y, axis=0, mode='wrap')
+                np.take(band, columns - scroll_x, axis=1, mode='wrap', out=stack[index])
+            else:
+                stack[index] = layer[y1:y2, x1:x2]
+        return stack
+    
+    # ========================================
+    # DIRTY-TILE TRACKING AND COMPOSITING
+    # ========================================
+    
+    def mark_dirty(self, layer_num, x1, y1, x2, y2):
+        """Mark the tiles covering pixels (x1,y1)-(x2,y2) inclusive on a layer as changed"""
+        if layer_num >= 5:
+            self.sprite_state = None  # Sprite layer drawn to outside the sprite engine
+        self._mark_tiles(layer_num, x1, y1, x2, y2)
+    
+    def _mark_tiles(self, layer_num, x1, y1, x2, y2):
+        """Mark the tiles covering pixels (x1,y1)-(x2,y2) inclusive without touching sprite state"""
+        if not 0 <= layer_num <= 8:
+            return
+        x1 = max(0, x1)
+        y1 = max(0, y1)
+        x2 = min(self.width - 1, x2)
+        y2 = min(self.height - 1, y2)
+        if x1 > x2 or y1 > y2:
+            return
+        self.dirty_tiles[layer_num, y1 // TILE_SIZE:y2 // TILE_SIZE + 1, x1 // TILE_SIZE:x2 // TILE_SIZE + 1] = True
+        if layer_num != 0:
+            self.layers_dirty = True
+        else:
+            self.screen_changed = True
+    
+    def mark_layer_dirty(self, layer_num):
+        """Mark every tile of a layer as changed"""
+        if layer_num >= 5:
+            self.sprite_state = None  # Sprite layer changed as a whole
+        if 0 <= layer_num <= 8:
+            self.dirty_tiles[layer_num] = True
+            if layer_num != 0:
+                self.layers_dirty = True
+            else:
+                self.screen_changed = True
+    
+    def _composite_region(self, y1, y2, x1, x2):
+        """Composite all visible layers into a rectangle of the main screen buffer"""
+        screen = self.layers[0, y1:y2, x1:x2]
+        
+        # Layer 0 is the screen itself: clear it if hidden
+        if not self.layer_visibility[0]:
+            screen.fill(0)
+        
+        # Keep masks for the whole stack in one pass: 0xFF where a pixel is
+        # transparent (zero), 0x00 where it is opaque
+        if self.scroll_pending:
+            stack = self._scrolled_stack(y1, y2, x1, x2)
+        else:
+            stack = self.layers[1:, y1:y2, x1:x2]
+        keep = self._keep_masks[:, :y2 - y1, :x2 - x1]
+        np.equal(stack, 0, out=keep.view(bool))
+        np.negative(keep, out=keep)
+        
+        # Fold background layers (1-4), then sprite layers (5-8) on top:
+        # opaque pixels replace what is below, transparent ones keep it
+        for index in np.flatnonzero(self.layer_visibility[1:]):
+            screen &= keep[index]
+            screen |= stack[index]
+    
+    def composite_dirty_tiles(self):
+        """Recomposite only the tiles changed on any layer since the last composite"""
+        dirty = self.dirty_tiles.any(axis=0)
+        count = int(np.count_nonzero(dirty))
+        if count * 2 >= dirty.size:
+            # Mostly dirty: one full-frame pass is cheaper than many small ones
+            self._composite_region(0, self.height, 0, self.width)
+        elif count:
+            # Composite each vertical run of dirty tile rows as one full-width band:
+            # contiguous rows are cheaper to fold than narrow strided rectangles
+            rows = np.flatnonzero(dirty.any(axis=1))
+            breaks = np.flatnonzero(np.diff(rows) != 1)
+            starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+            ends = np.concatenate((rows[breaks], [rows[-1]]))
+            for start, end in zip(starts, ends):
+                self._composite_region(int(start) * TILE_SIZE, (int(end) + 1) * TILE_SIZE, 0, self.width)
         
         # Mark layers as clean
+        self.dirty_tiles[:] = False
         self.layers_dirty = False
     
+    def composite_layers(self):
+        """Composite all visible layers into the main screen buffer"""
+        if self.tilemaps_pending:
+            self.refresh_tilemaps()
+        self.dirty_tiles[:] = True
+        self.composite_dirty_tiles()
+    
     def get_vram_val( self ):
         if self.Vregisters[2] == 1:
             # Direct memory access: Vregisters[0] = VX (high byte), Vregisters[1] = VY (low byte)
@@ -554,114 +647,41 @@ class GFX:
     
     def _set_pixel_to_layer(self, x, y, value):
         """Set a pixel to the current layer specified by VL register with blending"""
-        if self.VL == 0:
-            # Write to main screen with blending
-            existing = self.screen[y, x]
-            blended = self.blend_pixel(existing, value)
-            self.screen[y, x] = blended
-        elif 1 <= self.VL <= 4:
-            # Write to background layer with blending
-            existing = self.background_layers[self.VL - 1][y, x]
-            blended = self.blend_pixel(existing, value)
-            self.background_layers[self.VL - 1][y, x] = blended
-            self.layers_dirty = True  # Mark layers as needing recomposition
-        elif 5 <= self.VL <= 8:
-            # Write to sprite layer with blending
-            existing = self.sprite_layers[self.VL - 5][y, x]
-            blended = self.blend_pixel(existing, value)
-            self.sprite_layers[self.VL - 5][y, x] = blended
-            self.layers_dirty = True  # Mark layers as needing recomposition
+        if 0 <= self.VL <= 8:
+            if self.scroll_pending:
+                self.settle_scroll(self.VL)
+            layer = self.layers[self.VL]
+            layer[y, x] = self.blend_pixel(layer[y, x], value)
+            self.dirty_tiles[self.VL, y // TILE_SIZE, x // TILE_SIZE] = True
+            if self.VL >= 5:
+                self.sprite_state = None
+            if self.VL != 0:
+                self.layers_dirty = True  # Mark layers as needing recomposition
+            else:
+                self.screen_changed = True
 
     def roll_x( self, roll_x ):
         # Roll the current layer by roll_x pixels horizontally, pixels roll over to the opposite side
-        if self.VL == 0:
-            self.screen = np.roll( self.screen, roll_x, axis=1 )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.roll( self.background_layers[self.VL - 1], roll_x, axis=1 )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.roll( self.sprite_layers[self.VL - 5], roll_x, axis=1 )
-            self.layers_dirty = True
+        self.scroll_layer( self.VL, dx=roll_x )
 
     def roll_y( self, roll_y ):
         # Roll the current layer by roll_y pixels vertically, pixels roll over to the opposite side
-        if self.VL == 0:
-            self.screen = np.roll( self.screen, roll_y, axis=0 )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.roll( self.background_layers[self.VL - 1], roll_y, axis=0 )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.roll( self.sprite_layers[self.VL - 5], roll_y, axis=0 )
-            self.layers_dirty = True
+        self.scroll_layer( self.VL, dy=roll_y )
 
     def shift_x( self, shift_x ):
         # Shift the current layer by shift_x pixels horizontally, pixels that roll over are erased (set to 0)
-        if self.VL == 0:
-            if shift_x > 0:
-                self.screen[ :, shift_x: ] = self.screen[ :, :-shift_x ]
-                self.screen[ :, :shift_x ] = 0
-            elif shift_x < 0:
-                self.screen[ :, :shift_x ] = self.screen[ :, -shift_x: ]
-                self.screen[ :, shift_x: ] = 0
-        elif 1 <= self.VL <= 4:
-            layer = self.background_layers[self.VL - 1]
-            if shift_x > 0:
-                layer[ :, shift_x: ] = layer[ :, :-shift_x ]
-                layer[ :, :shift_x ] = 0
-            elif shift_x < 0:
-                layer[ :, :shift_x ] = layer[ :, -shift_x: ]
-                layer[ :, shift_x: ] = 0
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            layer = self.sprite_layers[self.VL - 5]
-            if shift_x > 0:
-                layer[ :, shift_x: ] = layer[ :, :-shift_x ]
-                layer[ :, :shift_x ] = 0
-            elif shift_x < 0:
-                layer[ :, :shift_x ] = layer[ :, -shift_x: ]
-                layer[ :, shift_x: ] = 0
-            self.layers_dirty = True
-        # If shift_x == 0, do nothing
+        self.shift_layer( self.VL, dx=shift_x )
 
     def shift_y( self, shift_y ):
         # Shift the current layer by shift_y pixels vertically, pixels that roll over are erased (set to 0)
-        if self.VL == 0:
-            if shift_y > 0:
-                self.screen[ shift_y:, : ] = self.screen[ :-shift_y, : ]
-                self.screen[ :shift_y, : ] = 0
-            elif shift_y < 0:
-                self.screen[ :shift_y, : ] = self.screen[ -shift_y:, : ]
-                self.screen[ shift_y:, : ] = 0
-        elif 1 <= self.VL <= 4:
-            layer = self.background_layers[self.VL - 1]
-            if shift_y > 0:
-                layer[ shift_y:, : ] = layer[ :-shift_y, : ]
-                layer[ :shift_y, : ] = 0
-            elif shift_y < 0:
-                layer[ :shift_y, : ] = layer[ -shift_y:, : ]
-                layer[ shift_y:, : ] = 0
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            layer = self.sprite_layers[self.VL - 5]
-            if shift_y > 0:
-                layer[ shift_y:, : ] = layer[ :-shift_y, : ]
-                layer[ :shift_y, : ] = 0
-            elif shift_y < 0:
-                layer[ :shift_y, : ] = layer[ -shift_y:, : ]
-                layer[ shift_y:, : ] = 0
-            self.layers_dirty = True
-        # If shift_y == 0, do nothing
+        self.shift_layer( self.VL, dy=shift_y )
 
     def rotate_l( self, times ):
         # Rotate the current layer 90 degrees counter-clockwise
-        if self.VL == 0:
-            self.screen = np.rot90( self.screen, times, axes=(0,1) )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.rot90( self.background_layers[self.VL - 1], times, axes=(0,1) )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.rot90( self.sprite_layers[self.VL - 5], times, axes=(0,1) )
-            self.layers_dirty = True
+        layer = self.get_layer_buffer_by_num( self.VL )
+        if layer is not None:
+            layer[:] = np.rot90( layer, times, axes=(0,1) )
+        self.mark_layer_dirty(self.VL)
 
     def rotate_left( self, times ):
         # Alias for rotate_l
@@ -669,14 +689,10 @@ class GFX:
 
     def rotate_r( self, times ):
         # Rotate the current layer 90 degrees clockwise
-        if self.VL == 0:
-            self.screen = np.rot90( self.screen, times, axes=(1,0) )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.rot90( self.background_layers[self.VL - 1], times, axes=(1,0) )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.rot90( self.sprite_layers[self.VL - 5], times, axes=(1,0) )
-            self.layers_dirty = True
+        layer = self.get_layer_buffer_by_num( self.VL )
+        if layer is not None:
+            layer[:] = np.rot90( layer, times, axes=(1,0) )
+        self.mark_layer_dirty(self.VL)
 
     def rotate_right( self, times ):
         # Alias for rotate_r
@@ -684,25 +700,17 @@ class GFX:
     
     def flip_x( self ):
         # Flip the current layer horizontally
-        if self.VL == 0:
-            self.screen = np.flip( self.screen, axis=1 )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.flip( self.background_layers[self.VL - 1], axis=1 )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.flip( self.sprite_layers[self.VL - 5], axis=1 )
-            self.layers_dirty = True
+        layer = self.get_layer_buffer_by_num( self.VL )
+        if layer is not None:
+            layer[:] = np.flip( layer, axis=1 )
+        self.mark_layer_dirty(self.VL)
 
     def flip_y( self ):
         # Flip the current layer vertically
-        if self.VL == 0:
-            self.screen = np.flip( self.screen, axis=0 )
-        elif 1 <= self.VL <= 4:
-            self.background_layers[self.VL - 1] = np.flip( self.background_layers[self.VL - 1], axis=0 )
-            self.layers_dirty = True
-        elif 5 <= self.VL <= 8:
-            self.sprite_layers[self.VL - 5] = np.flip( self.sprite_layers[self.VL - 5], axis=0 )
-            self.layers_dirty = True
+        layer = self.get_layer_buffer_by_num( self.VL )
+        if layer is not None:
+            layer[:] = np.flip( layer, axis=0 )
+        self.mark_layer_dirty(self.VL)
     
     # Layer-aware transform operations for Phase 2
     def roll_x_layer( self, roll_x, layer_num=None ):
@@ -710,22 +718,16 @@ class GFX:
         if layer_num is None:
             layer_num = self.VL
         
-        target_buffer = self.get_layer_buffer_by_num(layer_num)
-        if target_buffer is not None:
-            target_buffer[:] = np.roll(target_buffer, roll_x, axis=1)
-            if layer_num != 0:
-                self.layers_dirty = True
+        if 0 <= layer_num <= 8:
+            self.scroll_layer(layer_num, dx=roll_x)
     
     def roll_y_layer( self, roll_y, layer_num=None ):
         """Roll a specific layer or current VL layer vertically"""
         if layer_num is None:
             layer_num = self.VL
         
-        target_buffer = self.get_layer_buffer_by_num(layer_num)
-        if target_buffer is not None:
-            target_buffer[:] = np.roll(target_buffer, roll_y, axis=0)
-            if layer_num != 0:
-                self.layers_dirty = True
+        if 0 <= layer_num <= 8:
+            self.scroll_layer(layer_num, dy=roll_y)
     
     def flip_x_layer( self, layer_num=None ):
         """Flip a specific layer or current VL layer horizontally"""
@@ -735,8 +737,7 @@ class GFX:
         target_buffer = self.get_layer_buffer_by_num(layer_num)
         if target_buffer is not None:
             target_buffer[:] = np.flip(target_buffer, axis=1)
-            if layer_num != 0:
-                self.layers_dirty = True
+            self.mark_layer_dirty(layer_num)
     
     def flip_y_layer( self, layer_num=None ):
         """Flip a specific layer or current VL layer vertically"""
@@ -746,8 +747,7 @@ class GFX:
         target_buffer = self.get_layer_buffer_by_num(layer_num)
         if target_buffer is not None:
             target_buffer[:] = np.flip(target_buffer, axis=0)
-            if layer_num != 0:
-                self.layers_dirty = True
+            self.mark_layer_dirty(layer_num)
     
     # let's make a color palette for the 256 color screen
     # 0x00-0x0F: Grayscale ramp (16 colors)
@@ -771,6 +771,7 @@ class GFX:
         # If a palette is provided, use it directly
         if palette is not None:
             self.palette = palette
+            self._cache_palette()
             return
 
         # Otherwise, generate the palette as a list of 256 RGB tuples, each expressable as a sinVLe byte index
@@ -843,78 +844,98 @@ class GFX:
             else:
                 color = ( 0, 0, 0 )
             self.palette.append( color )
+        self._cache_palette()
+
+    def _cache_palette( self ):
+        """Rebuild the RGB lookup table from the palette list"""
+        self.palette_lut = np.array( self.palette, dtype=np.uint8 ).reshape( -1, 3 )
+        self.palette_version += 1
 
     def get_color( self, index ):
         return self.palette[ index ]
     
     def set_color( self, index, color ):
         self.palette[ index ] = color
+        self.palette_lut[ index ] = color
+        self.palette_version += 1
 
     def get_palette( self ):
         return self.palette
+
+    def get_palette_lut( self ):
+        """Palette as a cached (N, 3) uint8 RGB array"""
+        return self.palette_lut
     
     # Text rendering methods
     def draw_char(self, char, x, y, color=0xFF, background=None):
-        """Draw a sinVLe character at the specified position (8x8 characters)"""
+        """Draw a single character at the specified position (8x8 characters)"""
         # Convert character to ASCII code
         if isinstance(char, str):
-            ascii_code = ord(char)
-        else:
-            ascii_code = char
-        
-        # Map ASCII to font data index (space = 0x20 = 32, maps to index 0)
-        if ascii_code < 32 or ascii_code > 127:
-            ascii_code = 32  # Default to space for invalid characters
-        
-        # Adjust for font data indexing
-        font_index = ascii_code - 32
-        char_data = font_data[font_index * 8:(font_index + 1) * 8]
-        
-        # Get the target buffer based on current layer
-        target_buffer = self._get_layer_buffer()
-        
-        # Draw the character pixel by pixel to the appropriate layer (8x8 characters)
-        for row in range(8):  # Use all 8 rows
-            byte_data = char_data[row]
-            for col in range(8):  # Use 8 columns for 8-pixel wide characters
-                pixel_x = x + col
-                pixel_y = y + row
-                
-                # Bounds check
-                if 0 <= pixel_x < self.width and 0 <= pixel_y < self.height:
-                    # Check if pixel should be set (bit 7 is leftmost pixel)
-                    if byte_data & (0x80 >> col):
-                        # Foreground pixel
-                        target_buffer[pixel_y, pixel_x] = color
-                    elif background is not None:
-                        # Background pixel
-                        target_buffer[pixel_y, pixel_x] = background
-        
-        # Mark layers as dirty if drawing to a non-main layer
-        if self.VL != 0:
-            self.layers_dirty = True
+            char = ord(char)
+        self._draw_glyphs((char,), (x,), (y,), color, background)
     
     def draw_string(self, text, x, y, color=0xFF, background=None, char_spacing=9):
         """Draw a string at the specified position (8x8 characters)"""
-        current_x = x
+        if isinstance(text, str):
+            text = map(ord, text)
         
-        for char in text:
-            if char == '\n':
+        # Lay out the character cells, then render them all in one pass
+        codes, xs, ys = [], [], []
+        current_x = x
+        for code in text:
+            if code == 0x0A:
                 # Handle newline
                 current_x = x
                 y += 8  # Move down by character height (8 pixels)
-            elif char == '\t':
+            elif code == 0x09:
                 # Handle tab (4 characters)
                 current_x += char_spacing * 4
             else:
-                # Draw the character
-                self.draw_char(char, current_x, y, color, background)
+                codes.append(code)
+                xs.append(current_x)
+                ys.append(y)
                 current_x += char_spacing
                 
                 # Wrap to next line if we exceed screen width
                 if current_x + char_spacing > self.width:
                     current_x = x
                     y += 8  # Move down by character height (8 pixels)
+        
+        self._draw_glyphs(codes, xs, ys, color, background)
+    
+    def _draw_glyphs(self, codes, xs, ys, color, background=None):
+        """Render character cells at (xs, ys) into the current layer, clipping at the edges"""
+        if not len(codes):
+            return
+        codes = np.asarray(codes, dtype=np.int32)
+        masks = GLYPH_MASKS[np.where((codes >= 32) & (codes <= 127), codes - 32, 0)]
+        
+        # Absolute pixel coordinates of every cell, (chars, 8 rows, 8 columns)
+        px = np.broadcast_to(np.asarray(xs, dtype=np.int32).reshape(-1, 1, 1) + GLYPH_COLUMNS, masks.shape)
+        py = np.broadcast_to(np.asarray(ys, dtype=np.int32).reshape(-1, 1, 1) + GLYPH_ROWS, masks.shape)
+        inside = (px >= 0) & (px < self.width) & (py >= 0) & (py < self.height)
+        
+        target_buffer = self._get_layer_buffer()
+        if background is None:
+            # Only draw foreground pixels, leave background transparent
+            drawn = masks & inside
+            rows, columns = py[drawn], px[drawn]
+            self._blend_into(target_buffer, (rows, columns), color)
+        else:
+            # Foreground and background pixels of every cell in one write
+            drawn = inside
+            rows, columns = py[drawn], px[drawn]
+            self._blend_into(target_buffer, (rows, columns), np.where(masks, color, background)[drawn])
+        
+        # Mark the touched tiles for recompositing
+        if 0 <= self.VL <= 8 and len(rows):
+            self.dirty_tiles[self.VL, rows // TILE_SIZE, columns // TILE_SIZE] = True
+            if self.VL >= 5:
+                self.sprite_state = None
+            if self.VL != 0:
+                self.layers_dirty = True
+            else:
+                self.screen_changed = True
 
     def draw_string_to_screen(self, text, x, y, color=0xFF, background=None, char_spacing=9):
         """Draw a string to screen instead of VRAM (8x8 characters)"""
@@ -971,70 +992,33 @@ class GFX:
         if x + 8 > self.width or y + 8 > self.height or x < 0 or y < 0:
             return  # Skip if character would be off-screen
         
-        # Adjust for the apparent 2-character shift in font data
-        font_index = ascii_code - 32
-        char_data = font_data[font_index * 8:(font_index + 1) * 8]
-        
-        # Vectorized bitmap generation - much faster than nested loops (all 8 columns)
-        char_bytes = np.array(char_data, dtype=np.uint8)  # Use all 8 rows
-        
-        # Create bit mask matrix using numpy broadcasting (all 8 bits)
-        bit_positions = np.array([0x80, 0x40, 0x20, 0x10, 0x08, 0x04, 0x02, 0x01], dtype=np.uint8)  # All 8 bits
-        char_matrix = (char_bytes[:, np.newaxis] & bit_positions) != 0
-        
-        # Apply colors vectorized
-        char_bitmap = np.where(char_matrix, color, 0 if background is None else background)
-        
-        # Get the target buffer based on current layer
-        target_buffer = self._get_layer_buffer()
-        
-        # Copy character to the appropriate buffer (only non-transparent pixels if background is None)
+        # Blit the whole cell from the glyph atlas at once
+        mask = GLYPH_MASKS[ascii_code - 32]
+        cell = self._get_layer_buffer()[y:y+8, x:x+8]
         if background is None:
             # Only draw foreground pixels, leave background transparent
-            mask = char_matrix
-            target_buffer[y:y+8, x:x+8][mask] = color  # 8 rows, 8 columns
+            cell[mask] = color
         else:
-            # Draw entire character bitmap
-            target_buffer[y:y+8, x:x+8] = char_bitmap  # 8 rows, 8 columns
-        
-        # Blit the entire character at once
-        if background is not None:
             # Full character replacement
-            target_buffer[y:y+8, x:x+8] = char_bitmap  # 8 rows, 5 columns
-        else:
-            # Only draw foreground pixels
-            mask = char_bitmap != 0
-            target_buffer[y:y+8, x:x+8][mask] = char_bitmap[mask]  # 8 rows, 8 columns
+            cell[:] = np.where(mask, color, background)
         
-        # Mark layers as dirty if drawing to a non-main layer
-        if self.VL != 0:
-            self.layers_dirty = True
+        # Mark the character cell for recompositing
+        self.mark_dirty(self.VL, x, y, x + 7, y + 7)
     
     def _get_layer_buffer(self):
         """Get the numpy array for the current layer specified by VL register"""
-        if self.VL == 0:
-            return self.screen
-        elif 1 <= self.VL <= 4:
-            return self.background_layers[self.VL - 1]
-        elif 5 <= self.VL <= 8:
-            return self.sprite_layers[self.VL - 5]
-        else:
-            return self.screen  # Fallback to screen for invalid layers    
+        if 0 <= self.VL <= 8:
+            if self.scroll_pending:
+                self.settle_scroll(self.VL)
+            return self.layers[self.VL]
+        return self.screen  # Fallback to screen for invalid layers    
     
     def draw_text(self, x, y, text_addr, color, memory):
         """Draw null-terminated string from memory at text_addr"""
         # Convert coordinates to int to prevent numpy overflow warnings
         x = int(x)
         y = int(y)
-        text = ""
-        addr = text_addr
-        while True:
-            byte = memory.read(addr, 1)[0]
-            if byte == 0:
-                break
-            text += chr(byte)
-            addr += 1
-        self.draw_string(text, x, y, color)
+        self.draw_string(memory.read_string(int(text_addr)), x, y, color)
     
     # ========================================
     # SPRITE SYSTEM IMPLEMENTATION
@@ -1064,74 +1048,328 @@ class GFX:
             'layer': 5 if (control_block[6] & 0x80) == 0 else 6  # Bit 7 selects sprite layer
         }
     
-    def blit_sprite(self, sprite_id, memory):
-        """Blit a sinVLe sprite to its designated layer"""
+    def mark_sprites_dirty(self, address, length):
+        """Flag the sprites whose control blocks overlap a write to sprite memory"""
+        self.sprites_dirty = True
+        first = (address - self.sprite_memory_base) // self.sprite_block_size
+        last = (address + length - 1 - self.sprite_memory_base) // self.sprite_block_size
+        self.dirty_sprites.update(range(max(0, first), min(self.sprite_count - 1, last) + 1))
+    
+    def flush_sprite_cache(self):
+        """Forget decoded bitmaps and drawn sprite state (bulk memory load, reset)"""
+        if self.sprite_memory is not None:
+            self.sprite_memory.remove_write_hook(self._sprite_data_write_hook)
+        self.sprite_bitmaps.clear()
+        self.sprite_state = None
+        self.sprites_dirty = True
+    
+    def _sprite_data_write_hook(self, address, length):
+        """Drop cached bitmaps overlapping a memory write and flag the sprites drawn from them"""
+        end = address + length
+        stale = [key for key in self.sprite_bitmaps if key[0] < end and address < key[0] + key[1] * key[2]]
+        if not stale:
+            return
+        self._drop_sprite_bitmaps(stale)
+        if self.sprite_state is not None:
+            for sprite_id, sprite in enumerate(self.sprite_state):
+                if sprite is not None and sprite['key'] in stale:
+                    self.dirty_sprites.add(sprite_id)
+        self.sprites_dirty = True
+    
+    def _drop_sprite_bitmaps(self, keys):
+        """Remove bitmaps from the cache and unhook the pages no remaining bitmap is read from"""
+        pages = set()
+        for key in keys:
+            del self.sprite_bitmaps[key]
+            pages.update(self._sprite_bitmap_pages(key))
+        for key in self.sprite_bitmaps:
+            pages.difference_update(self._sprite_bitmap_pages(key))
+        for page in pages:
+            self.sprite_memory.remove_write_hook(self._sprite_data_write_hook, page << 8, page << 8)
+    
+    @staticmethod
+    def _sprite_bitmap_pages(key):
+        data_addr, width, height = key
+        return range(data_addr >> 8, ((data_addr + width * height - 1) >> 8) + 1)
+    
+    def _trim_sprite_bitmaps(self):
+        """Drop the least recently drawn bitmaps over capacity, keeping those of drawn sprites"""
+        excess = len(self.sprite_bitmaps) - self.sprite_bitmap_capacity
+        if excess <= 0:
+            return
+        in_use = {sprite['key'] for sprite in self.sprite_state or () if sprite is not None}
+        self._drop_sprite_bitmaps([key for key in self.sprite_bitmaps if key not in in_use][:excess])
+    
+    def set_memory_reference(self, memory):
+        """Attach the memory whose sprite control blocks get_screen() draws from"""
+        self._bind_sprite_memory(memory)
+        self.sprites_dirty = False  # Nothing to draw until a control block is written
+    
+    def _bind_sprite_memory(self, memory):
+        """Attach the sprite engine to memory, discarding state that belonged to another one"""
+        if memory is not self.sprite_memory:
+            self.flush_sprite_cache()  # Also unhooks the previous memory
+            self.sprite_memory = memory
+    
+    def _resolve_sprite(self, sprite_id, memory):
+        """Control block of an active sprite plus its decoded bitmap and clipped on-screen box"""
         sprite = self.get_sprite_control_block(sprite_id, memory)
         if not sprite or not sprite['active'] or sprite['width'] == 0 or sprite['height'] == 0:
-            return
+            return None
             
         # Get sprite data from memory
-        sprite_size = sprite['width'] * sprite['height']
-        if sprite['data_addr'] + sprite_size > memory.size:
-            return  # Invalid sprite data address
-            
-        sprite_data = memory.read_bytes_direct(sprite['data_addr'], sprite_size)
-        
-        # Convert to 2D array
-        sprite_bitmap = np.array(sprite_data, dtype=np.uint8).reshape(sprite['height'], sprite['width'])
-        
-        # Get target layer
-        target_layer = sprite['layer']
-        if target_layer == 5:
-            target_buffer = self.sprite_layers[0]
-        elif target_layer == 6:
-            target_buffer = self.sprite_layers[1]
-        else:
-            target_buffer = self.sprite_layers[0]  # Default to sprite layer 5
-            
-        # Calculate blit bounds
         x, y = sprite['x'], sprite['y']
         width, height = sprite['width'], sprite['height']
+        data_addr = sprite['data_addr']
+        if data_addr + width * height > memory.size:
+            return None  # Invalid sprite data address
         
         # Clip to screen bounds
         if x >= self.width or y >= self.height or x + width <= 0 or y + height <= 0:
-            return  # Sprite is completely off-screen
-            
-        # Calculate clipped region
-        src_x_start = max(0, -x)
-        src_y_start = max(0, -y)
-        src_x_end = min(width, self.width - x)
-        src_y_end = min(height, self.height - y)
+            return None  # Sprite is completely off-screen
         
-        dst_x_start = max(0, x)
-        dst_y_start = max(0, y)
-        dst_x_end = dst_x_start + (src_x_end - src_x_start)
-        dst_y_end = dst_y_start + (src_y_end - src_y_start)
+        # Bitmaps are decoded once per (data_addr, width, height) until their bytes are written
+        key = (data_addr, width, height)
+        bitmap = self.sprite_bitmaps.get(key)
+        if bitmap is not None:
+            self.sprite_bitmaps.move_to_end(key)
+        else:
+            bitmap = memory.memory[data_addr:data_addr + width * height].reshape(height, width).copy()
+            self.sprite_bitmaps[key] = bitmap
+            memory.add_write_hook(self._sprite_data_write_hook, data_addr, data_addr + width * height - 1)
+        
+        sprite['key'] = key
+        sprite['bitmap'] = bitmap
+        sprite['box'] = (max(0, y), min(self.height, y + height), max(0, x), min(self.width, x + width))
+        return sprite
+    
+    def _draw_sprite(self, sprite, y1, y2, x1, x2):
+        """Draw the part of a resolved sprite inside rows y1:y2, columns x1:x2 of its layer"""
+        box_y1, box_y2, box_x1, box_x2 = sprite['box']
+        y1, y2 = max(y1, box_y1), min(y2, box_y2)
+        x1, x2 = max(x1, box_x1), min(x2, box_x2)
+        if y1 >= y2 or x1 >= x2:
+            return
         
         # Extract the visible portion of the sprite
-        visible_sprite = sprite_bitmap[src_y_start:src_y_end, src_x_start:src_x_end]
+        visible_sprite = sprite['bitmap'][y1 - sprite['y']:y2 - sprite['y'], x1 - sprite['x']:x2 - sprite['x']]
+        target = self.get_layer_buffer_by_num(sprite['layer'])[y1:y2, x1:x2]
         
         if sprite['transparency_enabled']:
             # Apply transparency
-            transparent_color = sprite['transparency_color']
-            mask = visible_sprite != transparent_color
-            target_buffer[dst_y_start:dst_y_end, dst_x_start:dst_x_end][mask] = visible_sprite[mask]
+            mask = visible_sprite != sprite['transparency_color']
+            self._blend_into(target, mask, visible_sprite[mask])
         else:
             # No transparency, direct copy
-            target_buffer[dst_y_start:dst_y_end, dst_x_start:dst_x_end] = visible_sprite
+            self._blend_into(target, Ellipsis, visible_sprite)
+        
+        self._mark_tiles(sprite['layer'], x1, y1, x2 - 1, y2 - 1)
+    
+    def blit_sprite(self, sprite_id, memory):
+        """Blit a single sprite to its designated layer"""
+        self._bind_sprite_memory(memory)
+        sprite = self._resolve_sprite(sprite_id, memory)
+        if sprite is not None:
+            self._draw_sprite(sprite, *sprite['box'])
+            self.sprite_state = None  # Drawn outside blit_all_sprites' bookkeeping
+        self._trim_sprite_bitmaps()
     
     def blit_all_sprites(self, memory):
         """Blit all active sprites to their designated layers"""
-        # Clear sprite layers first
-        for layer in self.sprite_layers:
-            layer.fill(0)
+        self._bind_sprite_memory(memory)
+        
+        # Incremental redraw needs the last frame intact and control-block writes reported to us
+        if self.sprite_state is None or memory.gfx_system is not self:
+            self._redraw_all_sprites(memory)
+            self._update_collisions(memory)
+        elif self.dirty_sprites:
+            self._redraw_dirty_sprites(memory)
+            self._update_collisions(memory)
+            
+        self.dirty_sprites.clear()
+        self.sprites_dirty = False  # Mark sprites as clean
+        self._trim_sprite_bitmaps()
+    
+    def _redraw_all_sprites(self, memory):
+        """Clear the sprite layers and blit every active sprite in order (0-15)"""
+        # Clear sprite layers first, marking the tiles that held sprite pixels
+        for layer_num in range(5, 9):
+            layer = self.get_layer_buffer_by_num(layer_num)
+            occupied = (layer != 0).reshape(self.tiles_y, TILE_SIZE, self.tiles_x, TILE_SIZE).any(axis=(1, 3))
+            if occupied.any():
+                self.dirty_tiles[layer_num] |= occupied
+                self.layers_dirty = True
+                layer.fill(0)
+        
+        sprites = [self._resolve_sprite(sprite_id, memory) for sprite_id in range(self.sprite_count)]
+        for sprite in sprites:
+            if sprite is not None:
+                self._draw_sprite(sprite, *sprite['box'])
+        self.sprite_state = sprites
+    
+    def _redraw_dirty_sprites(self, memory):
+        """Redraw only the old and new boxes of sprites whose control block or data changed"""
+        sprites = self.sprite_state
+        regions = []
+        for sprite_id in sorted(self.dirty_sprites):
+            for sprite in (sprites[sprite_id], self._resolve_sprite(sprite_id, memory)):
+                if sprite is not None:
+                    regions.append((sprite['layer'], sprite['box']))
+            sprites[sprite_id] = sprite
+        
+        # Clear each region, then repaint every sprite overlapping it in priority order
+        for layer_num, (y1, y2, x1, x2) in regions:
+            self.get_layer_buffer_by_num(layer_num)[y1:y2, x1:x2] = 0
+            self._mark_tiles(layer_num, x1, y1, x2 - 1, y2 - 1)
+            for sprite in sprites:
+                if sprite is not None and sprite['layer'] == layer_num:
+                    self._draw_sprite(sprite, y1, y2, x1, x2)
+
+    def _update_collisions(self, memory):
+        """Recompute the sprite collision registers from the sprites as drawn"""
+        sprites = self.sprite_state
+        active = [sprite_id for sprite_id, sprite in enumerate(sprites) if sprite is not None]
+        box_masks = [0] * self.sprite_count
+        pixel_masks = [0] * self.sprite_count
+        
+        if len(active) > 1:
+            # Pairwise bounding-box intersections of all active sprites at once
+            boxes = np.array([sprites[sprite_id]['box'] for sprite_id in active])
+            top = np.maximum(boxes[:, None, 0], boxes[None, :, 0])
+            bottom = np.minimum(boxes[:, None, 1], boxes[None, :, 1])
+            left = np.maximum(boxes[:, None, 2], boxes[None, :, 2])
+            right = np.minimum(boxes[:, None, 3], boxes[None, :, 3])
+            overlap = np.triu((top < bottom) & (left < right), k=1)
             
-        # Blit all sprites in order (0-15)
+            # Opaque pixels of both sprites compared over each shared rectangle
+            for a, b in zip(*np.nonzero(overlap)):
+                first, second = sprites[active[a]], sprites[active[b]]
+                box_masks[active[a]] |= 1 << active[b]
+                box_masks[active[b]] |= 1 << active[a]
+                y1, y2, x1, x2 = top[a, b], bottom[a, b], left[a, b], right[a, b]
+                first_opaque = self._sprite_opaque(first)[y1 - first['y']:y2 - first['y'], x1 - first['x']:x2 - first['x']]
+                second_opaque = self._sprite_opaque(second)[y1 - second['y']:y2 - second['y'], x1 - second['x']:x2 - second['x']]
+                if (first_opaque & second_opaque).any():
+                    pixel_masks[active[a]] |= 1 << active[b]
+                    pixel_masks[active[b]] |= 1 << active[a]
+        
+        # Mirror into the control blocks, running every hook of the page but the sprite
+        # control hook, which would only mark the sprite dirty again
+        raise_interrupt = False
         for sprite_id in range(self.sprite_count):
-            self.blit_sprite(sprite_id, memory)
+            sprite = sprites[sprite_id]
+            if sprite is not None and sprite['flags'] & 0x04 and pixel_masks[sprite_id] & ~self.sprite_collisions[sprite_id]:
+                raise_interrupt = True  # A new contact for a sprite asking for interrupts
+            address = self.sprite_memory_base + sprite_id * self.sprite_block_size + 8
+            memory.data[address:address + 4] = bytes((pixel_masks[sprite_id] >> 8, pixel_masks[sprite_id] & 0xFF,
+                                                      box_masks[sprite_id] >> 8, box_masks[sprite_id] & 0xFF))
+            for hook in memory.page_hooks[address >> 8] or ():
+                if hook != memory._sprite_write_hook:
+                    hook(address, 4)
+        self.sprite_collisions = pixel_masks
+        self.sprite_box_collisions = box_masks
+        
+        if raise_interrupt and self.collision_interrupt is not None:
+            self.collision_interrupt()
+    
+    def _sprite_opaque(self, sprite):
+        """Boolean mask of the pixels a resolved sprite actually draws"""
+        opaque = sprite.get('opaque')
+        if opaque is None:
+            if sprite['transparency_enabled']:
+                opaque = sprite['bitmap'] != sprite['transparency_color']
+            else:
+                opaque = np.ones(sprite['bitmap'].shape, dtype=bool)
+            sprite['opaque'] = opaque
+        return opaque
+
+    # ========================================
+    # TILEMAP BACKGROUNDS
+    # ========================================
+    
+    def memory_loaded(self, memory):
+        """Drop everything derived from memory contents after a bulk load that ran no write hooks"""
+        self.flush_sprite_cache()
+        self.tilemap_control_written(memory, self.tilemap_memory_base, 4 * self.tilemap_block_size)
+        for tilemap in self.tilemaps.values():
+            tilemap['dirty_cells'][:] = True
+        self.tilemaps_pending = bool(self.tilemaps)
+    
+    def tilemap_control_written(self, memory, address, length):
+        """Re-read the tilemap control blocks overlapping a write to tilemap control memory"""
+        self.tilemap_memory = memory
+        first = max(0, (address - self.tilemap_memory_base) // self.tilemap_block_size)
+        last = min(3, (address + length - 1 - self.tilemap_memory_base) // self.tilemap_block_size)
+        changed = False
+        for layer_num in range(first + 1, last + 2):
+            block = memory.read_bytes_direct(self.tilemap_memory_base + (layer_num - 1) * self.tilemap_block_size, 5)
+            config = ((block[1] << 8) | block[2], (block[3] << 8) | block[4]) if block[0] & 0x01 else None
+            tilemap = self.tilemaps.get(layer_num)
+            if config == (tilemap and (tilemap['map_addr'], tilemap['pattern_addr'])):
+                continue
+            changed = True
+            if config is None:
+                del self.tilemaps[layer_num]  # Layer keeps its last rendered image
+            else:
+                self.tilemaps[layer_num] = {
+                    'map_addr': config[0],
+                    'pattern_addr': config[1],
+                    'dirty_cells': np.ones((self.tilemap_cells, self.tilemap_cells), dtype=bool),
+                    'dirty_patterns': np.zeros(256, dtype=bool),
+                }
+                self.tilemaps_pending = True
+        
+        if changed:
+            # Hook exactly the map and pattern ranges of the enabled tilemaps
+            memory.remove_write_hook(self._tilemap_data_write_hook)
+            for tilemap in self.tilemaps.values():
+                map_end = tilemap['map_addr'] + self.tilemap_cells * self.tilemap_cells - 1
+                memory.add_write_hook(self._tilemap_data_write_hook, tilemap['map_addr'], map_end)
+                memory.add_write_hook(self._tilemap_data_write_hook, tilemap['pattern_addr'], tilemap['pattern_addr'] + 256 * 64 - 1)
+    
+    def _tilemap_data_write_hook(self, address, length):
+        """Flag the map cells and tile patterns overlapped by a memory write"""
+        end = address + length
+        cell_count = self.tilemap_cells * self.tilemap_cells
+        for tilemap in self.tilemaps.values():
+            map_addr = tilemap['map_addr']
+            if map_addr < end and address < map_addr + cell_count:
+                tilemap['dirty_cells'].reshape(-1)[max(0, address - map_addr):end - map_addr] = True
+                self.tilemaps_pending = True
+            pattern_addr = tilemap['pattern_addr']
+            if pattern_addr < end and address < pattern_addr + 256 * 64:
+                first = max(0, address - pattern_addr) // 64
+                tilemap['dirty_patterns'][first:(end - 1 - pattern_addr) // 64 + 1] = True
+                self.tilemaps_pending = True
+    
+    def refresh_tilemaps(self):
+        """Re-render the map cells of every tilemap layer whose index or pattern changed"""
+        self.tilemaps_pending = False
+        memory = self.tilemap_memory
+        if memory is None:
+            return
+        cells = self.tilemap_cells
+        for layer_num, tilemap in self.tilemaps.items():
+            tile_map = memory.memory[np.arange(tilemap['map_addr'], tilemap['map_addr'] + cells * cells) % memory.size]
+            tile_map = tile_map.reshape(cells, cells)
+            dirty = tilemap['dirty_cells']
+            if tilemap['dirty_patterns'].any():
+                dirty |= tilemap['dirty_patterns'][tile_map]
+            cell_rows, cell_columns = np.nonzero(dirty)
+            dirty[:] = False
+            tilemap['dirty_patterns'][:] = False
+            if not len(cell_rows):
+                continue
             
-        self.sprites_dirty = False  # Mark sprites as clean
-        self.layers_dirty = True   # Mark layers as needing compositing
+            # Gather every dirty cell's 8x8 pattern straight from memory in one pass
+            tiles = tile_map[cell_rows, cell_columns].astype(np.int32)
+            addresses = (tilemap['pattern_addr'] + tiles[:, None, None] * 64 + TILEMAP_PATTERN_OFFSETS) % memory.size
+            layer = self.layers[layer_num].reshape(cells, TILEMAP_TILE_SIZE, cells, TILEMAP_TILE_SIZE)
+            layer[cell_rows, :, cell_columns, :] = memory.memory[addresses]
+            
+            self.dirty_tiles[layer_num, cell_rows * TILEMAP_TILE_SIZE // TILE_SIZE,
+                             cell_columns * TILEMAP_TILE_SIZE // TILE_SIZE] = True
+            self.layers_dirty = True
 
     def draw_line(self, x1, y1, x2, y2, color):
         """Draw a line from (x1,y1) to (x2,y2) with the specified color"""
@@ -1145,10 +1383,12 @@ class GFX:
         err = dx - dy
         
         x, y = x1, y1
+        rows, columns = [], []
         
         while True:
             if 0 <= x < self.width and 0 <= y < self.height:
-                target_buffer[y, x] = color
+                rows.append(y)
+                columns.append(x)
             
             if x == x2 and y == y2:
                 break
@@ -1161,6 +1401,8 @@ class GFX:
                 err += dx
                 y += sy
         
+        self._blend_into(target_buffer, (rows, columns), color)
+        self.mark_dirty(self.VL, min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
         self.layers_dirty = True
 
     def draw_rectangle(self, x1, y1, x2, y2, color, filled=True):
@@ -1175,21 +1417,24 @@ class GFX:
         
         if filled:
             # Fill the rectangle
-            target_buffer[y1:y2+1, x1:x2+1] = color
+            self._blend_into(target_buffer, (slice(y1, y2+1), slice(x1, x2+1)), color)
         else:
-            # Draw outline only
-            # Top and bottom lines
-            target_buffer[y1, x1:x2+1] = color
-            target_buffer[y2, x1:x2+1] = color
-            # Left and right lines
-            target_buffer[y1:y2+1, x1] = color
-            target_buffer[y1:y2+1, x2] = color
-        
+            # Draw outline only, each edge pixel once so blending applies a single time
+            xs = np.arange(x1, x2 + 1)
+            ys = np.arange(y1, y2 + 1)
+            # Top and bottom lines, then left and right lines
+            rows = np.concatenate((np.full_like(xs, y1), np.full_like(xs, y2), ys, ys))
+            columns = np.concatenate((xs, xs, np.full_like(ys, x1), np.full_like(ys, x2)))
+            pixels = np.unique(rows * self.width + columns)
+            self._blend_into(target_buffer, (pixels // self.width, pixels % self.width), color)
+        
+        self.mark_dirty(self.VL, min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
         self.layers_dirty = True
 
     def draw_circle(self, center_x, center_y, radius, color, filled=True):
         """Draw a circle centered at (center_x, center_y) with the specified radius and color"""
         target_buffer = self._get_layer_buffer()
+        pixels = set()  # Each covered pixel once, so blending applies a single time
         
         if filled:
             # Filled circle using midpoint circle algorithm
@@ -1202,16 +1447,16 @@ class GFX:
                 for i in range(center_x - x, center_x + x + 1):
                     if 0 <= i < self.width:
                         if 0 <= center_y + y < self.height:
-                            target_buffer[center_y + y, i] = color
+                            pixels.add((center_y + y, i))
                         if 0 <= center_y - y < self.height:
-                            target_buffer[center_y - y, i] = color
+                            pixels.add((center_y - y, i))
                 
                 for i in range(center_x - y, center_x + y + 1):
                     if 0 <= i < self.width:
                         if 0 <= center_y + x < self.height:
-                            target_buffer[center_y + x, i] = color
+                            pixels.add((center_y + x, i))
                         if 0 <= center_y - x < self.height:
-                            target_buffer[center_y - x, i] = color
+                            pixels.add((center_y - x, i))
                 
                 y += 1
                 err += 1 + 2*y
@@ -1235,7 +1480,7 @@ class GFX:
                 
                 for px, py in points:
                     if 0 <= px < self.width and 0 <= py < self.height:
-                        target_buffer[py, px] = color
+                        pixels.add((py, px))
                 
                 y += 1
                 err += 1 + 2*y
@@ -1243,73 +1488,39 @@ class GFX:
                     x -= 1
                     err += 1 - 2*x
         
+        if pixels:
+            rows, columns = zip(*pixels)
+            self._blend_into(target_buffer, (list(rows), list(columns)), color)
+        self.mark_dirty(self.VL, center_x - radius, center_y - radius, center_x + radius, center_y + radius)
         self.layers_dirty = True
 
     def invert_colors(self):
         """Invert all colors on the current layer"""
         target_buffer = self._get_layer_buffer()
         target_buffer[:, :] = 255 - target_buffer[:, :]
-        if self.VL != 0:
-            self.layers_dirty = True
+        self.mark_layer_dirty(self.VL)
 
     def shift_layer_x(self, amount, layer_num=None):
         """Shift layer horizontally by amount pixels"""
         if layer_num is None:
             layer_num = self.VL
             
-        if layer_num == 0:
-            buffer = self.screen
-        elif 1 <= layer_num <= 4:
-            buffer = self.background_layers[layer_num - 1]
-        elif 5 <= layer_num <= 8:
-            buffer = self.sprite_layers[layer_num - 5]
-        else:
-            return
-            
-        if amount > 0:
-            buffer[:, amount:] = buffer[:, :-amount]
-            buffer[:, :amount] = 0
-        elif amount < 0:
-            buffer[:, :amount] = buffer[:, -amount:]
-            buffer[:, amount:] = 0
-            
-        self.layers_dirty = True
+        self.shift_layer(layer_num, dx=amount)
 
     def shift_layer_y(self, amount, layer_num=None):
         """Shift layer vertically by amount pixels"""
         if layer_num is None:
             layer_num = self.VL
             
-        if layer_num == 0:
-            buffer = self.screen
-        elif 1 <= layer_num <= 4:
-            buffer = self.background_layers[layer_num - 1]
-        elif 5 <= layer_num <= 8:
-            buffer = self.sprite_layers[layer_num - 5]
-        else:
-            return
-            
-        if amount > 0:
-            buffer[amount:, :] = buffer[:-amount, :]
-            buffer[:amount, :] = 0
-        elif amount < 0:
-            buffer[:amount, :] = buffer[-amount:, :]
-            buffer[amount:, :] = 0
-            
-        self.layers_dirty = True
+        self.shift_layer(layer_num, dy=amount)
 
     def rotate_layer_left(self, amount, layer_num=None):
         """Rotate layer left by amount degrees"""
         if layer_num is None:
             layer_num = self.VL
             
-        if layer_num == 0:
-            buffer = self.screen
-        elif 1 <= layer_num <= 4:
-            buffer = self.background_layers[layer_num - 1]
-        elif 5 <= layer_num <= 8:
-            buffer = self.sprite_layers[layer_num - 5]
-        else:
+        buffer = self.get_layer_buffer_by_num(layer_num)
+        if buffer is None:
             return
             
         # Simple 90-degree rotations
@@ -1317,20 +1528,15 @@ class GFX:
         for _ in range(rotations):
             buffer[:, :] = np.rot90(buffer, k=1)
             
-        self.layers_dirty = True
+        self.mark_layer_dirty(layer_num)
 
     def rotate_layer_right(self, amount, layer_num=None):
         """Rotate layer right by amount degrees"""
         if layer_num is None:
             layer_num = self.VL
             
-        if layer_num == 0:
-            buffer = self.screen
-        elif 1 <= layer_num <= 4:
-            buffer = self.background_layers[layer_num - 1]
-        elif 5 <= layer_num <= 8:
-            buffer = self.sprite_layers[layer_num - 5]
-        else:
+        buffer = self.get_layer_buffer_by_num(layer_num)
+        if buffer is None:
             return
             
         # Simple 90-degree rotations
@@ -1338,53 +1544,48 @@ class GFX:
         for _ in range(rotations):
             buffer[:, :] = np.rot90(buffer, k=-1)
             
-        self.layers_dirty = True
+        self.mark_layer_dirty(layer_num)
 
     def flip_layer_x(self, layer_num=None):
         """Flip layer horizontally"""
         if layer_num is None:
             layer_num = self.VL
             
-        if layer_num == 0:
-            buffer = self.screen
-        elif 1 <= layer_num <= 4:
-            buffer = self.background_layers[layer_num - 1]
-        elif 5 <= layer_num <= 8:
-            buffer = self.sprite_layers[layer_num - 5]
-        else:
+        buffer = self.get_layer_buffer_by_num(layer_num)
+        if buffer is None:
             return
             
         buffer[:, :] = np.fliplr(buffer)
-        self.layers_dirty = True
+        self.mark_layer_dirty(layer_num)
 
     def flip_layer_y(self, layer_num=None):
         """Flip layer vertically"""
         if layer_num is None:
             layer_num = self.VL
             
-        if layer_num == 0:
-            buffer = self.screen
-        elif 1 <= layer_num <= 4:
-            buffer = self.background_layers[layer_num - 1]
-        elif 5 <= layer_num <= 8:
-            buffer = self.sprite_layers[layer_num - 5]
-        else:
+        buffer = self.get_layer_buffer_by_num(layer_num)
+        if buffer is None:
             return
             
         buffer[:, :] = np.flipud(buffer)
-        self.layers_dirty = True
+        self.mark_layer_dirty(layer_num)
 
     def swap_layers(self, layer1, layer2):
         """Swap the contents of two layers"""
         if layer1 == layer2:
             return
             
-        buf1 = self.get_layer_buffer_by_num(layer1)
-        buf2 = self.get_layer_buffer_by_num(layer2)
-        
-        if buf1 is not None and buf2 is not None:
-            temp = buf1.copy()
-            buf1[:, :] = buf2[:, :]
-            buf2[:, :] = temp
-            
-        self.layers_dirty = True
\ No newline at end of file
+        if 0 <= layer1 <= 8 and 0 <= layer2 <= 8:
+            if self.scroll_pending and (layer1 == 0 or layer2 == 0):
+                self.settle_scroll(layer1 or layer2)  # The screen has no scroll registers
+            buf1 = self.layers[layer1]
+            buf2 = self.layers[layer2]
+            temp = self._layer_scratch
+            temp[:] = buf1
+            buf1[:] = buf2
+            buf2[:] = temp
+            scroll1 = (self.scroll_x[layer1], self.scroll_y[layer1])
+            self._set_scroll(layer1, self.scroll_x[layer2], self.scroll_y[layer2])
+            self._set_scroll(layer2, *scroll1)
+            self.mark_layer_dirty(layer1)
+            self.mark_layer_dirty(layer2)
\ No newline at end of file
@@ -14,7 +14,7 @@ import numpy as np
 
 sys.path.append(os.path.dirname(__file__))
 
-from nova_cpu import CPU
+from nova_cpu import CPU, RunResult
 from nova_memory import Memory
 from nova_gfx import GFX
 from nova_keyboard import NovaKeyboard
@@ -289,23 +289,23 @@ def run_profiled_program(program_path: str, max_cycles: int = 10000, output_file
     cycle = 0
     start_time = time.time()
 
+    # Step one instruction at a time so the profiler's step hooks fire
     while cycle < max_cycles and not cpu.halted:
-        cycle += 1
-        try:
-            cpu.step()
+        result = cpu.run(min(1000, max_cycles - cycle), translate=False)
+        cycle += result.cycles
 
-            if cpu.halted:
-                print(f"Program halted at PC: 0x{cpu.pc:04X}")
-                break
-
-            if cycle % 1000 == 0:
-                elapsed = time.time() - start_time
-                print(f"Cycle {cycle:,}, PC: 0x{cpu.pc:04X}, FPS: {profiler.profile_data['average_frame_rate']:.1f}")
+        if result.reason == RunResult.HALTED:
+            print(f"Program halted at PC: 0x{cpu.pc:04X}")
+            break
 
-        except Exception as e:
-            print(f"Error at cycle {cycle}, PC: 0x{cpu.pc:04X}: {e}")
+        if result.reason == RunResult.EXCEPTION:
+            print(f"Error at cycle {cycle + 1}, PC: 0x{cpu.pc:04X}: {result.error}")
             break
 
+        if cycle % 1000 == 0:
+            elapsed = time.time() - start_time
+            print(f"Cycle {cycle:,}, PC: 0x{cpu.pc:04X}, FPS: {profiler.profile_data['average_frame_rate']:.1f}")
+
     # Save profile
     profiler.save_profile()
 
@@ -13,7 +13,7 @@ from nova_cpu import CPU
 from nova_memory import Memory
 from nova_gfx import GFX
 from nova_keyboard import NovaKeyboard
-from nova_sound import NovaSound
+from nova_sound import NovaSound, NullAudioBackend
 import argparse
 import json
 from typing import Dict, List, Set, Tuple, Optional
@@ -393,7 +393,7 @@ def run_graphics_monitor(program_path, monitor_config=None, max_cycles=10000, ex
     memory = Memory()
     gfx = GFX()
     keyboard = NovaKeyboard()
-    sound = NovaSound()
+    sound = NovaSound(backend=NullAudioBackend())
     cpu = CPU(memory, gfx, keyboard, sound)
     
     # Initialize advanced monitor
@@ -2,7 +2,6 @@ import threading
 import warnings
 warnings.filterwarnings("ignore", message="pkg_resources is deprecated", category=UserWarning)
 import pygame
-from collections import deque
 import tkinter as tk
 from tkinter import filedialog
 import time
@@ -13,12 +12,61 @@ import nova_cpu as cpu
 import nova_memory as mem
 
 
+class FrameBuffer:
+    """Double-buffered palettized surfaces shared by the CPU and render threads.
+
+    The CPU thread writes each frame straight into the back surface and swaps it
+    to the front, skipping frames whose GFX frame and palette versions were
+    already published; the render thread reads the front surface under the same
+    lock and uses the sequence number to skip frames it has already shown.
+    """
+    def __init__( self, gfx ):
+        self.gfx = gfx
+        self.surfaces = [ pygame.Surface( ( gfx.width, gfx.height ), depth=8 ) for _ in range( 2 ) ]
+        self.palette_versions = [ -1, -1 ]  # GFX palette version uploaded to each surface
+        self.front = 0
+        self.sequence = 0
+        self.published = None  # (frame_version, palette_version) of the front surface
+        self.lock = threading.Lock()        # Guards the swap and front surface reads
+        self.write_lock = threading.Lock()  # Serializes writers (CPU thread, reset, forced updates)
+
+    def publish( self, screen ):
+        """Copy a screen array into the back surface and make it the front, unless unchanged"""
+        with self.write_lock:
+            version = ( self.gfx.frame_version, self.gfx.palette_version )
+            if version == self.published:
+                return
+            back = 1 - self.front
+            surface = self.surfaces[ back ]
+            if self.palette_versions[ back ] != self.gfx.palette_version:
+                surface.set_palette( self.gfx.get_palette_lut() )
+                self.palette_versions[ back ] = self.gfx.palette_version
+            pixels = pygame.surfarray.pixels2d( surface )  # (x, y) view of the surface memory
+            pixels[ ... ] = screen.T
+            del pixels  # Unlock the surface
+            with self.lock:
+                self.front = back
+                self.sequence += 1
+            self.published = version
+
+    def present( self, sequence, target ):
+        """Scale the front surface into target if it is newer than sequence; returns the shown sequence"""
+        with self.lock:
+            if self.sequence == sequence:
+                return sequence
+            front = self.surfaces[ self.front ]
+            if target.get_bitsize() == 8:
+                target.set_palette( front.get_palette() )
+            pygame.transform.scale( front, target.get_size(), target )
+            return self.sequence
+
+
 class CPUController:
     def __init__( self, cpu, gfx, mem ):
         self.cpu = cpu
         self.gfx = gfx
         self.mem = mem
-        self.update_queue = deque( maxlen=1 )
+        self.frame_buffer = FrameBuffer( gfx )
         self.running = False
         self.paused = threading.Event()
         self.stepping = threading.Event()
@@ -41,21 +89,26 @@ class CPUController:
                 # Execute multiple CPU steps between screen updates
                 steps_per_frame = max(1, int(self.cpu.clock_speed / self.target_fps) if hasattr(self.cpu, 'clock_speed') else 1000)
                 
-                for _ in range(steps_per_frame):
-                    if not self.running or self.stop_event.is_set():
-                        break
-                    self.cpu.step()
+                result = self.cpu.run(steps_per_frame)
+                if result.reason == cpu.RunResult.EXCEPTION:
+                    print(f"CPU error at PC 0x{result.pc:04X}: {result.error}")
+                    self.running = False
+                    self.force_update = True
                 
                 # Only update screen if enough time has passed or forced
                 if (current_time - self.last_screen_update >= self.frame_time) or self.force_update:
-                    self.update_queue.appendleft( self.gfx.get_screen().copy() )
+                    self.frame_buffer.publish( self.gfx.get_screen() )
                     self.last_screen_update = current_time
                     self.force_update = False
+                
+                # Program is waiting in a polling loop: yield the host until the next frame
+                if result.idle_cycles:
+                    time.sleep(max(0.0, self.frame_time - (time.time() - current_time)))
                     
             elif self.stepping.is_set():
                 self.cpu.step()
                 # Always update screen for single steps
-                self.update_queue.appendleft( self.gfx.get_screen().copy() )
+                self.frame_buffer.publish( self.gfx.get_screen() )
                 self.stepping.clear()
             else:
                 # Small sleep to prevent busy waiting
@@ -104,7 +157,7 @@ class CPUController:
         
         # Force immediate screen update after reset
         self.force_update = True
-        self.update_queue.appendleft( self.gfx.get_screen().copy() )
+        self.frame_buffer.publish( self.gfx.get_screen() )
         self.paused.clear()
         
         print("System reset completed - all components reinitialized")
@@ -112,8 +165,7 @@ class CPUController:
     def force_screen_update(self):
         """Force an immediate screen update (useful for static graphics)"""
         self.force_update = True
-        screen_data = self.gfx.get_screen().copy()
-        self.update_queue.appendleft( screen_data )
+        self.frame_buffer.publish( self.gfx.get_screen() )
 
     def set_target_fps(self, fps):
         """Adjust the target frame rate for screen updates"""
@@ -148,8 +200,6 @@ def main( cpu, memory, gfx, kbd=None ):
     pygame.init()
     screen = pygame.display.set_mode( ( screen_width, window_height ) )
     pygame.display.set_caption( "Nova-16" )
-    surface = pygame.Surface( ( gfx.width, gfx.height ), depth=8 )
-    surface.set_palette( [ tuple( color ) for color in gfx.get_palette() ] )
     clock = pygame.time.Clock()
     cpu_controller = CPUController( cpu, gfx, memory )
     
@@ -158,7 +208,7 @@ def main( cpu, memory, gfx, kbd=None ):
     
     # Performance optimizations
     target_fps = 32
-    update_queue = cpu_controller.update_queue 
+    frame_buffer = cpu_controller.frame_buffer
 
 
     font = pygame.font.SysFont( None, 24 )
@@ -184,8 +234,9 @@ def main( cpu, memory, gfx, kbd=None ):
     prev_running = cpu_controller.running
     prev_halted = cpu.halted
 
-    # Cache for scaled surface
-    cached_scaled_surface = None
+    # Scaled copy of the latest frame, redrawn only when a new frame is published
+    scaled_surface = pygame.Surface( ( screen_width, screen_height ), depth=8 )
+    shown_sequence = 0
 
     # Cache for button labels
     button_label_cache = {}
@@ -309,18 +360,8 @@ def main( cpu, memory, gfx, kbd=None ):
                                 print(f"Loaded {file_path}")
                                 print(f"Entry point: 0x{entry_point:04X}")
 
-        # Update screen only when needed
-        screen_updated = False
-        
-        # Check for screen updates from CPU
-        try:
-            if update_queue:
-                arr = update_queue.popleft()
-                pygame.surfarray.blit_array( surface, arr.T )
-                screen_updated = True
-        except Exception as e:
-            # Silently handle any display errors
-            pass
+        # Scale the latest frame from the CPU thread once; unchanged frames are skipped
+        shown_sequence = frame_buffer.present( shown_sequence, scaled_surface )
 
         # Always redraw UI elements to ensure they're visible
         screen.fill( ( 40, 40, 40 ), rect=pygame.Rect( 0, 0, screen_width, toolbar_height ) )
@@ -368,10 +409,7 @@ def main( cpu, memory, gfx, kbd=None ):
         if cached_status_label:
             screen.blit( cached_status_label, ( 5, status_y + 5 ) )
 
-        # Always scale and blit to ensure display updates
-        if screen_updated or cached_scaled_surface is None:
-            cached_scaled_surface = pygame.transform.scale( surface, ( screen_width, screen_height ) )
-        screen.blit( cached_scaled_surface, ( 0, toolbar_height ) )
+        screen.blit( scaled_surface, ( 0, toolbar_height ) )
         pygame.display.flip()
         
         clock.tick( target_fps )
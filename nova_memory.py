@@ -3,33 +3,118 @@ import numpy as np
 class Memory:
     def __init__( self, size = 65536 ):
         self.size = size
-        self.memory = np.zeros( self.size, dtype=np.uint8 )
+        # Backing store: bytearray indexing returns plain ints for the byte/word
+        # fast paths; memory is a numpy view of the same buffer for bulk operations
+        self.data = bytearray( self.size )
+        self.memory = np.frombuffer( self.data, dtype=np.uint8 )
         self.timer = 0
         self.timer_limit = 256
         self.interrupt_enabled = False
         
+        # Write hook page table: one entry per 256-byte page, None for plain RAM,
+        # otherwise a tuple of hook(address, length) callables run after the store
+        self.page_hooks = [ None ] * ( ( self.size + 0xFF ) >> 8 )
+        
         # Sprite system hook - will be set by CPU during initialization
         self.gfx_system = None
+        self.add_write_hook( self._sprite_write_hook, 0xF000, 0xF0FF )
+        self.add_write_hook( self._tilemap_write_hook, 0xF100, 0xF11F )
+        
+        # Decode cache hook - will be set by CPU during initialization
+        # code_map marks bytes that belong to cached instruction decodes,
+        # code_pages marks pages carrying the code invalidation hook
+        self.code_watcher = None
+        self.code_map = bytearray( self.size )
+        self.code_pages = bytearray( len( self.page_hooks ) )
+
+    # ========================================
+    # WRITE HOOK PAGE TABLE
+    # ========================================
+
+    def add_write_hook( self, hook, start=0x0000, end=0xFFFF ):
+        """Register hook(address, length) on every page overlapping start..end (inclusive)"""
+        for page in range( start >> 8, min( end >> 8, len( self.page_hooks ) - 1 ) + 1 ):
+            hooks = self.page_hooks[ page ] or ()
+            if hook not in hooks:
+                self.page_hooks[ page ] = hooks + ( hook, )
+
+    def remove_write_hook( self, hook, start=0x0000, end=0xFFFF ):
+        """Unregister hook from every page overlapping start..end (inclusive)"""
+        for page in range( start >> 8, min( end >> 8, len( self.page_hooks ) - 1 ) + 1 ):
+            hooks = self.page_hooks[ page ]
+            if hooks is not None and hook in hooks:
+                hooks = tuple( h for h in hooks if h != hook )
+                self.page_hooks[ page ] = hooks or None
+
+    def _run_write_hooks( self, address, length ):
+        """Run the hooks of each page touched by a write, clipped to that page"""
+        end = address + length
+        page_hooks = self.page_hooks
+        for page in range( address >> 8, ( ( end - 1 ) >> 8 ) + 1 ):
+            hooks = page_hooks[ page ]
+            if hooks is not None:
+                start = max( address, page << 8 )
+                stop = min( end, ( page + 1 ) << 8 )
+                for hook in hooks:
+                    hook( start, stop - start )
+
+    def _sprite_write_hook( self, address, length ):
+        """Mark the sprites whose control blocks changed as needing re-render"""
+        if self.gfx_system:
+            self.gfx_system.mark_sprites_dirty( address, length )
+
+    def _tilemap_write_hook( self, address, length ):
+        """Let the graphics system re-read tilemap control blocks when they change"""
+        if self.gfx_system:
+            self.gfx_system.tilemap_control_written( self, address, length )
+
+    def _code_write_hook( self, address, length ):
+        """Invalidate cached decodes if code bytes are overwritten"""
+        if self.code_watcher is not None and any( self.code_map[ address:address + length ] ):
+            self.code_watcher.invalidate_code( address, length )
+
+    def mark_code( self, address, length ):
+        """Mark bytes as belonging to a cached decode and hook their pages"""
+        code_map = self.code_map
+        if address + length <= self.size:
+            code_map[ address:address + length ] = b'\x01' * length
+        else:
+            for i in range( length ):
+                code_map[ ( address + i ) % self.size ] = 1
+        code_pages = self.code_pages
+        for i in ( 0, length - 1 ):
+            page = ( ( address + i ) % self.size ) >> 8
+            if not code_pages[ page ]:
+                code_pages[ page ] = 1
+                self.add_write_hook( self._code_write_hook, page << 8, page << 8 )
+
+    def clear_code( self ):
+        """Forget all code bytes and remove the code invalidation hook"""
+        self.code_map[:] = bytes( self.size )
+        for page, hooked in enumerate( self.code_pages ):
+            if hooked:
+                self.remove_write_hook( self._code_write_hook, page << 8, page << 8 )
+        self.code_pages[:] = bytes( len( self.code_pages ) )
 
     def write( self, address, value, bytes=1 ):
         # Check bounds
         if address < 0 or address + bytes > self.size:
             raise IndexError(f"Write address out of bounds: {address}")
         
-        # Check if writing to sprite memory region (0xF000-0xF0FF)
-        if 0xF000 <= address <= 0xF0FF and self.gfx_system:
-            self.gfx_system.sprites_dirty = True  # Mark sprites as needing re-render
-        
+        value = int( value )
         if bytes == 1:
-            self.memory[ address ] = value & 0xFF
+            self.data[ address ] = value & 0xFF
         elif bytes == 2:
             # Big-endian for Nova-16: store high byte first, then low byte
-            self.memory[ address ] = ( value >> 8 ) & 0xFF
-            self.memory[ address + 1 ] = value & 0xFF
+            self.data[ address ] = ( value >> 8 ) & 0xFF
+            self.data[ address + 1 ] = value & 0xFF
         else:
             # For multi-byte writes, store in big-endian order
             for i in range( bytes ):
-                self.memory[ address + i ] = ( value >> ( 8 * (bytes - 1 - i) ) ) & 0xFF
+                self.data[ address + i ] = ( value >> ( 8 * (bytes - 1 - i) ) ) & 0xFF
+        
+        # Device, code cache and watchpoint hooks on the touched pages
+        self._run_write_hooks( address, bytes )
 
     def read( self, address, bytes=1 ):
         address = int(address)
@@ -43,57 +128,105 @@ class Memory:
     # ========================================
     
     def read_byte(self, address):
-        """Optimized single byte read without array overhead"""
-        addr = int(address)
-        if addr < 0 or addr >= self.size:
-            raise IndexError(f"Address out of bounds: {addr}")
-        return int(self.memory[addr]) & 0xFF
+        """Optimized single byte read (bytearray index, IndexError past the end)"""
+        return self.data[address]
     
     def read_word(self, address):
-        """Optimized 16-bit read without array overhead (big-endian for Nova-16)"""
-        addr = int(address)
-        if addr < 0:
-            raise IndexError(f"Address out of bounds for word read: {addr}")
-        if addr >= self.size - 1:
+        """Optimized 16-bit read (big-endian for Nova-16)"""
+        data = self.data
+        try:
+            return (data[address] << 8) | data[address + 1]
+        except IndexError:
             # For edge case where we're at the last byte, return just that byte as a word
-            if addr == self.size - 1:
-                return int(self.memory[addr]) & 0xFF
-            else:
-                raise IndexError(f"Address out of bounds for word read: {addr}")
-        
-        high_byte = int(self.memory[addr]) & 0xFF
-        low_byte = int(self.memory[addr + 1]) & 0xFF
-        return (high_byte << 8) | low_byte
+            if address == self.size - 1:
+                return data[address]
+            raise IndexError(f"Address out of bounds for word read: {address}")
     
     def write_byte(self, address, value):
         """Optimized single byte write without method overhead"""
-        addr = int(address) & 0xFFFF  # Ensure address is within 16-bit bounds
+        addr = address & 0xFFFF  # Ensure address is within 16-bit bounds
+        self.data[addr] = value & 0xFF
         
-        # Check if writing to sprite memory region (0xF000-0xF0FF)
-        if 0xF000 <= addr <= 0xF0FF and self.gfx_system:
-            self.gfx_system.sprites_dirty = True
-            
-        self.memory[addr] = int(value) & 0xFF
+        # Plain RAM pages have no hooks: one table lookup per store
+        hooks = self.page_hooks[addr >> 8]
+        if hooks is not None:
+            for hook in hooks:
+                hook(addr, 1)
     
     def write_word(self, address, value):
         """Optimized 16-bit write without method overhead (big-endian for Nova-16)"""
-        addr = int(address)
+        addr = address
         if addr < 0 or addr >= self.size - 1:
             raise IndexError(f"Address out of bounds for word write: {addr}")
-        
-        # Check if writing to sprite memory region (0xF000-0xF0FF)
-        if 0xF000 <= addr <= 0xF0FF and self.gfx_system:
-            self.gfx_system.sprites_dirty = True
             
-        val = int(value) & 0xFFFF  # Ensure value is within 16-bit bounds
-        self.memory[addr] = (val >> 8) & 0xFF      # High byte first
-        self.memory[addr + 1] = val & 0xFF         # Low byte second
+        val = value & 0xFFFF  # Ensure value is within 16-bit bounds
+        data = self.data
+        data[addr] = val >> 8          # High byte first
+        data[addr + 1] = val & 0xFF    # Low byte second
+        
+        # A word ending a page also touches the next page's hooks
+        if self.page_hooks[addr >> 8] is not None or (addr & 0xFF) == 0xFF:
+            self._run_write_hooks(addr, 2)
+    
+    def _flush_code_cache(self):
+        """Discard all cached decodes and graphics state derived from memory after a bulk program load"""
+        if self.code_watcher is not None:
+            self.code_watcher.flush_decode_cache()
+        if self.gfx_system is not None:
+            self.gfx_system.memory_loaded(self)
     
     def read_bytes_direct(self, address, count):
         """Optimized multi-byte read returning list of ints"""
         if address + count > self.size:
             raise IndexError(f"Read beyond memory bounds: {address + count} > {self.size}")
-        return [int(self.memory[address + i]) for i in range(count)]
+        return list(self.data[address:address + count])
+
+    # ========================================
+    # BULK ACCESS (16-bit wraparound as at most two slices)
+    # ========================================
+
+    def read_block(self, address, length):
+        """Read length bytes starting at address, wrapping past the end of memory"""
+        data = self.data
+        address %= self.size
+        end = address + length
+        if end <= self.size:
+            return data[address:end]
+        return data[address:] + data[:end - self.size]
+
+    def write_block(self, address, block):
+        """Write a bytes-like block starting at address, wrapping past the end of memory"""
+        length = len(block)
+        if not length:
+            return
+        data = self.data
+        address %= self.size
+        end = address + length
+        if end <= self.size:
+            data[address:end] = block
+            self._run_write_hooks(address, length)
+        else:
+            split = self.size - address
+            data[address:] = block[:split]
+            data[:end - self.size] = block[split:]
+            self._run_write_hooks(address, split)
+            self._run_write_hooks(0, end - self.size)
+
+    def read_string(self, address, limit=0xFFFF):
+        """Read a NUL-terminated string (terminator excluded) of at most limit bytes"""
+        data = self.data
+        address %= self.size
+        limit = min(limit, self.size - 1)
+        end = min(address + limit, self.size)
+        nul = data.find(0, address, end)
+        if nul != -1:
+            return data[address:nul]
+        result = data[address:end]
+        rest = limit - len(result)
+        if rest > 0:
+            nul = data.find(0, 0, rest)
+            result += data[:rest if nul == -1 else nul]
+        return result
 
     def dump( self ):
         for i in range( 0, self.size, 16 ):
@@ -123,9 +256,8 @@ class Memory:
             data = file.read()
             # Determine how much data to load to avoid buffer overflows
             load_size = min( len( data ), self.size )
-            # Convert bytes to numpy array and copy to memory
-            for i in range(load_size):
-                self.memory[i] = data[i]
+            self.data[0:load_size] = data[:load_size]
+        self._flush_code_cache()
         return 0x0000
     
     def load_with_org_info(self, bin_file_path, org_file_path):
@@ -173,9 +305,7 @@ class Memory:
                     
                     # Load this segment
                     segment_data = bin_data[bin_offset:bin_offset + length]
-                    # Use a more reliable method to copy the data
-                    for i in range(length):
-                        self.memory[start_addr + i] = segment_data[i]
+                    self.data[start_addr:start_addr + length] = segment_data
                     
                     print(f"Loaded {length} bytes at 0x{start_addr:04X} from binary offset {bin_offset}")
                     
@@ -184,6 +314,7 @@ class Memory:
                 except Exception as e:
                     print(f"Unexpected error loading segment from line {line_num}: {e}")
         
+        self._flush_code_cache()
         return entry_point
 
 
@@ -200,7 +331,7 @@ class Memory:
         if not file_path:
             return
         with open( file_path, 'wb' ) as file:
-            file.write( bytes( self.memory ) )
+            file.write( bytes( self.data ) )
 
     def load_binary(self, binary_data, address=0x0000):
         """
@@ -215,11 +346,13 @@ class Memory:
         # Ensure we don't overflow memory
         load_size = min(len(binary_data), self.size - address)
         self.memory[address:address + load_size] = binary_data[:load_size]
+        self._flush_code_cache()
         return address
 
     def write_bytes_direct(self, address, data):
         """Write multiple bytes directly to memory"""
         if address + len(data) > self.size:
             raise IndexError(f"Write beyond memory bounds: {address + len(data)} > {self.size}")
-        for i, byte in enumerate(data):
-            self.memory[address + i] = byte & 0xFF
\ No newline at end of file
+        self.data[address:address + len(data)] = bytes(byte & 0xFF for byte in data)
+        if data:
+            self._run_write_hooks(address, len(data))
\ No newline at end of file
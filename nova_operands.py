@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Nova-16 Decoded Operands
+
+Operand objects produced by CPU.parse_operands().
+
+Each addressing kind is a small __slots__ class whose get()/set() implement
+that kind directly, so the accessor is chosen once at decode time instead of
+by string comparisons on every access. Decoded operands are never modified
+after decoding, which lets the predecode cache hand the same operand tuple to
+every execution of an instruction. Only register-based memory operands need
+resolve() to pick up the current register value.
+
+Kind codes:
+- REGISTER: register direct (R, P, SP/FP, V, timer, sound, P byte registers)
+- IMMEDIATE: 8-bit or 16-bit immediate value
+- MEMORY: direct, direct indexed, register indirect or register indexed
+"""
+
+# Operand kind codes
+REGISTER = 0
+IMMEDIATE = 1
+MEMORY = 2
+
+class Operand:
+    """Base class for decoded operands"""
+    __slots__ = ('mode',)
+    kind = None
+    reg_type = None
+    reg_idx = None
+    byte_register = False  # True for 8-bit R register destinations
+    dynamic = False  # True if the operand must be resolve()d on every execution
+
+    def get(self, cpu):
+        raise NotImplementedError("Subclasses must implement get method")
+
+    def set(self, cpu, value):
+        raise Exception(f"Cannot set value for operand type: {self.type_name}")
+
+    @property
+    def type_name(self):
+        return ('register', 'immediate', 'memory')[self.kind]
+
+# Register direct operands
+class RegisterOperand(Operand):
+    """Register operand without a dedicated fast path (V, timer, sound, P byte registers)"""
+    __slots__ = ('reg_type', 'reg_idx')
+    kind = REGISTER
+
+    def __init__(self, mode, reg_type, reg_idx):
+        self.mode = mode
+        self.reg_type = reg_type
+        self.reg_idx = reg_idx
+
+    def __repr__(self):
+        return f"{self.reg_type}{self.reg_idx}"
+
+    def get(self, cpu):
+        return cpu._get_operand_value(self.reg_type, self.reg_idx)
+
+    def set(self, cpu, value):
+        cpu._set_operand_value(self.reg_type, self.reg_idx, value)
+
+class RRegisterOperand(RegisterOperand):
+    """8-bit R register operand"""
+    __slots__ = ()
+    byte_register = True
+
+    def get(self, cpu):
+        return int(cpu.Rregisters[self.reg_idx])
+
+    def set(self, cpu, value):
+        cpu.Rregisters[self.reg_idx] = int(value) & 0xFF
+
+class PRegisterOperand(RegisterOperand):
+    """16-bit P register operand (including SP and FP)"""
+    __slots__ = ()
+
+    def get(self, cpu):
+        return int(cpu.Pregisters[self.reg_idx])
+
+    def set(self, cpu, value):
+        cpu.Pregisters[self.reg_idx] = int(value) & 0xFFFF
+
+def register_operand(mode, reg_type, reg_idx):
+    """Create the register operand class matching reg_type"""
+    if reg_type == 'R':
+        return RRegisterOperand(mode, reg_type, reg_idx)
+    if reg_type == 'P':
+        return PRegisterOperand(mode, reg_type, reg_idx)
+    return RegisterOperand(mode, reg_type, reg_idx)
+
+# Immediate operands
+class ImmediateOperand(Operand):
+    """8-bit or 16-bit immediate operand"""
+    __slots__ = ('value', 'size')
+    kind = IMMEDIATE
+
+    def __init__(self, mode, value, size):
+        self.mode = mode
+        self.value = value
+        self.size = size
+
+    def __repr__(self):
+        return f"#{self.value:#x}"
+
+    def get(self, cpu):
+        return self.value
+
+# Memory operands (always word sized)
+class MemoryOperand(Operand):
+    """Memory operand with a fixed address"""
+    __slots__ = ('address', 'indexed', 'direct', 'index')
+    kind = MEMORY
+
+    def __init__(self, mode, address, indexed, direct, index=0):
+        self.mode = mode
+        self.address = address
+        self.indexed = indexed
+        self.direct = direct
+        self.index = index
+
+    def __repr__(self):
+        return f"[{self.address:#06x}]"
+
+    def get(self, cpu):
+        return cpu.memory.read_word(self.address)
+
+    def set(self, cpu, value):
+        cpu.memory.write_word(self.address, value)
+
+class RegisterMemoryOperand(MemoryOperand):
+    """Register indirect or register indexed memory operand"""
+    __slots__ = ('reg_type', 'reg_idx')
+    dynamic = True
+
+    def __init__(self, mode, reg_type, reg_idx, indexed, index=0):
+        super().__init__(mode, None, indexed, False, index)
+        self.reg_type = reg_type
+        self.reg_idx = reg_idx
+
+    def __repr__(self):
+        return f"[{self.reg_type}{self.reg_idx}+{self.index}]"
+
+    def resolve(self, cpu):
+        """Return a fixed-address operand for the current register value"""
+        base_addr = cpu.Pregisters[self.reg_idx] if self.reg_type == 'P' else cpu.Rregisters[self.reg_idx]
+        return MemoryOperand(self.mode, (base_addr + self.index) & 0xFFFF,
+                             self.indexed, self.direct, self.index)
+
+    def get(self, cpu):
+        return self.resolve(cpu).get(cpu)
+
+    def set(self, cpu, value):
+        self.resolve(cpu).set(cpu, value)
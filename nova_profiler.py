@@ -91,8 +91,10 @@ class NovaProfiler:
 
         try:
             while not self.cpu.halted and cycles < max_cycles:
-                self.cpu.step()
-                cycles += 1
+                result = self.cpu.run(min(1000, max_cycles - cycles))
+                cycles += result.cycles
+                if result.reason == cpu.RunResult.EXCEPTION:
+                    raise result.error
 
                 if cycles % 1000 == 0:
                     print(f"Executed {cycles} cycles...")
@@ -190,9 +192,10 @@ class NovaProfiler:
         cycles = 0
         max_cycles = 10000
 
-        while not self.cpu.halted and cycles < max_cycles:
-            self.cpu.step()
-            cycles += 1
+        result = self.cpu.run(max_cycles)
+        cycles = result.cycles
+        if result.reason == cpu.RunResult.EXCEPTION:
+            raise result.error
 
         end_time = time.time()
         total_time = end_time - start_time
@@ -259,9 +262,10 @@ class NovaProfiler:
         cycles = 0
         max_cycles = 5000
 
-        while not self.cpu.halted and cycles < max_cycles:
-            self.cpu.step()
-            cycles += 1
+        result = self.cpu.run(max_cycles)
+        cycles = result.cycles
+        if result.reason == cpu.RunResult.EXCEPTION:
+            raise result.error
 
         end_time = time.time()
         total_time = end_time - start_time
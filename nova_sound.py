@@ -2,7 +2,10 @@
 Nova Sound System Implementation
 
 This module implements a hybrid register-based sound system for the Nova-16 computer.
-It provides multiple waveforms, sound channels, and effects using pygame.mixer.
+It provides multiple waveforms, sound channels, and effects through a software
+mixer that renders all channels in small blocks into one streaming output.
+The output is a pluggable AudioBackend: pygame.mixer by default, a null backend
+for headless runs, or an offline backend that renders to a WAV file or array.
 
 Sound Registers:
 - SA: Sound Address (16-bit) - points to sound data in memory
@@ -35,15 +38,375 @@ Channel Control (SW register bits):
 import numpy as np
 import warnings
 warnings.filterwarnings("ignore", message="pkg_resources is deprecated", category=UserWarning)
-import pygame
-import pygame.mixer
 import threading
 import time
 import math
+import wave
 from typing import Dict, List, Optional, Tuple
 
+# Optional: scipy runs the pink noise filter in C; without it a block-recursive numpy version is used
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
+
+PINK_DECAY = 0.99  # Pink noise filter: y[n] = PINK_DECAY * y[n-1] + PINK_GAIN * x[n]
+PINK_GAIN = 0.01
+PINK_BLOCK = 256   # Block length for the numpy filter, short enough for PINK_DECAY ** -PINK_BLOCK to stay exact
+PINK_POWERS = PINK_DECAY ** np.arange(1, PINK_BLOCK + 1)
+
+# Memory samples (waveform 7): the sample length is a memory-mapped 16-bit big-endian
+# register, 0 selects the default length; SF sets the playback rate relative to
+# SAMPLE_BASE_FREQUENCY, which plays one sample byte per output frame
+SAMPLE_LENGTH_ADDRESS = 0xF120
+DEFAULT_SAMPLE_LENGTH = 1024
+SAMPLE_BASE_FREQUENCY = 440.0
+
+# Music sequencer: memory-mapped control block, see NovaSequencer
+SEQUENCER_ADDRESS = 0xF130
+NOTE_OFF = 0xFF
+
+# Emulated CPU clock used to turn cycle counts into audio time for backends that are
+# not real-time: the GUI runs 1000 cycles per frame at 120 frames per second
+CPU_CLOCK_HZ = 120000
+
+
+def pink_filter(white: np.ndarray, state: float = 0.0) -> Tuple[np.ndarray, float]:
+    """Filter white noise into pink noise, continuing from the previous output state"""
+    if lfilter is not None:
+        pink, _ = lfilter([PINK_GAIN], [1.0, -PINK_DECAY], white, zi=[PINK_DECAY * state])
+        return pink, float(pink[-1]) if len(pink) else state
+    
+    # Within a block, y[k] = a^(k+1) * (state + b * sum(x[j] / a^(j+1) for j <= k))
+    pink = np.empty(len(white))
+    for start in range(0, len(white), PINK_BLOCK):
+        block = white[start:start + PINK_BLOCK]
+        powers = PINK_POWERS[:len(block)]
+        out = pink[start:start + len(block)]
+        np.cumsum(block / powers, out=out)
+        out *= PINK_GAIN
+        out += state
+        out *= powers
+        state = float(out[-1])
+    return pink, state
+
+
+
+class AudioBackend:
+    """
+    Output stage for the NovaSound mixer.
+    
+    NovaSound calls start() once its mixer is ready and stop() from cleanup();
+    in between the backend pulls audio with sound.render_block() whenever it
+    needs the next block of int16 stereo frames. Backends that are not
+    real-time are instead clocked by the CPU through render_until().
+    """
+    seed = None      # Noise seed for the sound system, None for a fresh random stream
+    realtime = True  # False if audio time follows emulated CPU cycles (NovaSound.sync)
+    
+    def start(self, sound: 'NovaSound') -> bool:
+        """Attach to a sound system; returns True if audio is being produced"""
+        return False
+    
+    def render_until(self, frames: int):
+        """Produce output up to the given frame count of emulated time"""
+        pass
+    
+    def stop(self):
+        """Detach from the sound system and release any resources"""
+        pass
+
+
+class NullAudioBackend(AudioBackend):
+    """
+    Discards all audio: needs no pygame initialization and no audio device.
+    
+    Blocks are still mixed at emulated time whenever something is playing, so
+    one-shots run out and the sequencer keeps its tempo without an output.
+    """
+    realtime = False
+    
+    def __init__(self):
+        self.sound = None
+        self.frames = 0  # Frames of emulated time accounted for
+    
+    def start(self, sound: 'NovaSound') -> bool:
+        self.sound = sound
+        return False
+    
+    def render_until(self, frames: int):
+        """Mix and discard every block that has started by the given frame count"""
+        sound = self.sound
+        while self.frames < frames:
+            if not (sound.sequencer.playing or sound.effect_voices or
+                    any(state['playing'] for state in sound.channel_states)):
+                self.frames = frames  # Silence: nothing to advance
+                break
+            self.frames += len(sound.mix_block())
+
+
+class PygameAudioBackend(AudioBackend):
+    """Streams mixer blocks to a reserved pygame.mixer channel from a background thread"""
+    
+    def __init__(self):
+        self.sound = None
+        self.channel = None
+        self.thread = None
+        self.running = False
+    
+    def start(self, sound: 'NovaSound') -> bool:
+        try:
+            import pygame  # Imported here so the other backends never load pygame
+            pygame.mixer.pre_init(
+                frequency=sound.sample_rate,
+                size=-16,  # 16-bit signed
+                channels=2,  # Stereo
+                buffer=sound.buffer_size
+            )
+            pygame.init()
+            pygame.mixer.init()
+        except Exception as e:
+            print(f"Warning: Could not initialize pygame mixer: {e}")
+            return False
+        
+        self.sound = sound
+        pygame.mixer.set_reserved(1)
+        self.channel = pygame.mixer.Channel(0)
+        self.running = True
+        self.thread = threading.Thread(target=self._stream_loop, daemon=True)
+        self.thread.start()
+        
+        print("Nova Sound System initialized")
+        print(f"Sample Rate: {sound.sample_rate}Hz, Channels: {sound.max_channels}, Buffer: {sound.buffer_size}")
+        return True
+    
+    def _stream_loop(self):
+        """Keep one rendered block queued behind the one that is playing"""
+        import pygame
+        block_time = self.sound.block_size / self.sound.sample_rate
+        while self.running:
+            try:
+                if self.channel.get_queue() is not None:
+                    time.sleep(block_time / 4)
+                    continue
+                sound = pygame.mixer.Sound(self.sound.render_block())
+                if self.channel.get_busy():
+                    self.channel.queue(sound)
+                else:
+                    self.channel.play(sound)
+            except pygame.error:
+                break  # Mixer was shut down underneath us
+    
+    def stop(self):
+        import pygame
+        if self.thread is not None:
+            self.running = False
+            self.thread.join()
+            self.thread = None
+        if pygame.mixer.get_init():
+            pygame.mixer.quit()
+            print("Nova Sound System cleaned up")
+
+
+class OfflineAudioBackend(AudioBackend):
+    """
+    Renders the mix on demand at emulated time instead of in real time.
+    
+    Nothing is rendered until emulated time advances, either by CPU cycles
+    through NovaSound.sync() or by calling advance() directly, so output is
+    deterministic (noise uses a fixed seed) and can be compared by hash or
+    written to a WAV file, which happens automatically on stop() if a path is given.
+    """
+    
+    realtime = False
+    
+    def __init__(self, path: Optional[str] = None, seed: int = 0):
+        self.path = path
+        self.seed = seed
+        self.sound = None
+        self.blocks: List[np.ndarray] = []
+        self.frames = 0    # Frames rendered so far
+        self.time = 0.0    # Emulated seconds advanced so far
+    
+    def start(self, sound: 'NovaSound') -> bool:
+        self.sound = sound
+        return True
+    
+    def render(self, frames: int):
+        """Render at least the given number of frames, in whole mixer blocks"""
+        while frames > 0:
+            block = self.sound.render_block()
+            self.blocks.append(block.copy())
+            self.frames += len(block)
+            frames -= len(block)
+    
+    def render_until(self, frames: int):
+        """Render every block that has started by the given frame count"""
+        if frames > self.frames:
+            self.render(frames - self.frames)
+    
+    def advance(self, seconds: float):
+        """Advance emulated time, rendering every block that has started by then"""
+        self.time += seconds
+        self.render_until(int(self.time * self.sound.sample_rate))
+    
+    def samples(self) -> np.ndarray:
+        """All frames rendered so far as an int16 (frames, 2) array"""
+        if not self.blocks:
+            return np.zeros((0, 2), dtype=np.int16)
+        return np.concatenate(self.blocks)
+    
+    def write_wav(self, path: str):
+        """Write the frames rendered so far as a 16-bit stereo WAV file"""
+        with wave.open(path, 'wb') as wav_file:
+            wav_file.setnchannels(2)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sound.sample_rate)
+            wav_file.writeframes(self.samples().astype('<i2').tobytes())
+    
+    def stop(self):
+        if self.path is not None and self.sound is not None:
+            self.write_wav(self.path)
+
+
+class NovaSequencer:
+    """
+    Music sequencer device that plays a song from memory on the sound channels.
+    
+    Rows are clocked by the mixer, so music costs no CPU instructions per note;
+    without a real-time output the mixer follows emulated CPU cycles (NovaSound.sync).
+    
+    Control block (8 bytes at SEQUENCER_ADDRESS):
+    Offset 0: Control (8-bit) - bit 0: play (set to start, clear to stop), bit 1: loop the song
+    Offset 1: Current row (8-bit), set by the sequencer
+    Offset 2-3: Song address (16-bit, big-endian)
+    Offset 4: Tempo in beats per minute, 4 rows per beat (0 = 120)
+    Offset 5: Rows per pattern (0 = 64)
+    Offset 6: Channels per row, 1-8 (0 = 4)
+    Offset 7: Current order position (8-bit), set by the sequencer
+    
+    Song at the song address: one byte order length, then that many pattern numbers,
+    then the patterns. Each pattern is rows × channels entries of 3 bytes:
+    note (SF value, 0 = none, 0xFF = note off), instrument (SW waveform bits 0-2 and
+    loop bit 6, 0 = keep the channel's last one), volume (SV value, 0 = keep).
+    """
+    
+    def __init__(self, sound: 'NovaSound'):
+        self.sound = sound
+        self.memory = None
+        self.playing = False
+        self.order_position = 0
+        self.row = 0
+        self.frames_to_row = 0  # Frames until the next row is due
+        self.instruments = [0x41] * sound.max_channels  # Looping square until a row sets one
+        self.volumes = [0xFF] * sound.max_channels
+    
+    def attach(self, memory):
+        """Watch the control block of a memory for start and stop writes"""
+        if self.memory is not None:
+            self.memory.remove_write_hook(self._control_write_hook, SEQUENCER_ADDRESS, SEQUENCER_ADDRESS + 7)
+        self.memory = memory
+        self.playing = False
+        if memory is not None:
+            memory.add_write_hook(self._control_write_hook, SEQUENCER_ADDRESS, SEQUENCER_ADDRESS + 7)
+    
+    def _control_write_hook(self, address, length):
+        """Start or stop playback when the control byte is written"""
+        if not address <= SEQUENCER_ADDRESS < address + length:
+            return
+        play = bool(self.memory.data[SEQUENCER_ADDRESS] & 0x01)
+        with self.sound.mixer_lock:
+            if play and not self.playing:
+                self.start()
+            elif not play and self.playing:
+                self.stop()
+    
+    def start(self):
+        """Play the song from its first row (mixer lock must be held)"""
+        self.playing = True
+        self.order_position = 0
+        self.row = 0
+        self.frames_to_row = 0
+        self.instruments = [0x41] * self.sound.max_channels
+        self.volumes = [0xFF] * self.sound.max_channels
+    
+    def stop(self):
+        """Stop playback and silence the sequencer's channels (mixer lock must be held)"""
+        self.playing = False
+        for state in self.sound.channel_states[:self._channel_count()]:
+            state['playing'] = False
+    
+    def _channel_count(self) -> int:
+        return min(self.memory.data[SEQUENCER_ADDRESS + 6] or 4, self.sound.max_channels)
+    
+    def _row_frames(self) -> int:
+        """Output frames per row at the current tempo"""
+        tempo = self.memory.data[SEQUENCER_ADDRESS + 4] or 120
+        return max(1, round(self.sound.sample_rate * 60 / (tempo * 4)))
+    
+    def next_segment(self, frames: int) -> int:
+        """Play the row that is due, if any, and return how many of frames to mix before the next"""
+        if not self.playing:
+            return frames
+        if self.frames_to_row <= 0:
+            self._play_row()
+            if not self.playing:
+                return frames
+            self.frames_to_row = self._row_frames()
+        return min(frames, self.frames_to_row)
+    
+    def advance(self, frames: int):
+        """Account for frames mixed since next_segment()"""
+        if self.playing:
+            self.frames_to_row -= frames
+    
+    def _play_row(self):
+        """Apply the current row to the channels and move to the next row"""
+        data = self.memory.data
+        size = len(data)
+        song = self.memory.read_word(SEQUENCER_ADDRESS + 2)
+        order_length = data[song]
+        if self.order_position >= order_length:
+            if order_length and data[SEQUENCER_ADDRESS] & 0x02:
+                self.order_position = 0  # Loop the song
+            else:
+                self.stop()
+                data[SEQUENCER_ADDRESS] &= 0xFE  # Song over: clear the play bit
+                return
+        
+        rows = data[SEQUENCER_ADDRESS + 5] or 64
+        channels = self._channel_count()
+        pattern = data[(song + 1 + self.order_position) % size]
+        address = song + 1 + order_length + (pattern * rows + self.row) * channels * 3
+        for channel in range(channels):
+            entry = address + channel * 3
+            note, instrument, volume = data[entry % size], data[(entry + 1) % size], data[(entry + 2) % size]
+            if instrument:
+                self.instruments[channel] = instrument
+            if volume:
+                self.volumes[channel] = volume
+            state = self.sound.channel_states[channel]
+            if note == NOTE_OFF:
+                state['playing'] = False
+            elif note:
+                instrument = self.instruments[channel]
+                self.sound._trigger_channel(channel, instrument & 0x07, self.sound._register_to_frequency(note),
+                                            self.volumes[channel] / 255.0, bool(instrument & 0x40))
+            elif volume:
+                state['volume'] = volume / 255.0
+        
+        # Status registers, written directly so they do not re-enter the control hook
+        data[SEQUENCER_ADDRESS + 1] = self.row
+        data[SEQUENCER_ADDRESS + 7] = self.order_position
+        self.row += 1
+        if self.row >= rows:
+            self.row = 0
+            self.order_position += 1
+
+
 class NovaSound:
-    def __init__(self, sample_rate: int = 22050, buffer_size: int = 512, channels: int = 8):
+    def __init__(self, sample_rate: int = 22050, buffer_size: int = 512, channels: int = 8,
+                 backend: Optional[AudioBackend] = None):
         """
         Initialize the Nova Sound System
         
@@ -51,25 +414,14 @@ class NovaSound:
             sample_rate: Audio sample rate in Hz
             buffer_size: Audio buffer size for low latency
             channels: Maximum number of simultaneous sound channels
+            backend: Audio output, defaults to a PygameAudioBackend
         """
         self.sample_rate = sample_rate
         self.buffer_size = buffer_size
         self.max_channels = channels
-        
-        # Initialize pygame mixer
-        try:
-            pygame.mixer.pre_init(
-                frequency=sample_rate,
-                size=-16,  # 16-bit signed
-                channels=2,  # Stereo
-                buffer=buffer_size
-            )
-            pygame.init()
-            pygame.mixer.init()
-            self.mixer_initialized = True
-        except Exception as e:
-            print(f"Warning: Could not initialize pygame mixer: {e}")
-            self.mixer_initialized = False
+        self.backend = backend if backend is not None else PygameAudioBackend()
+        self.rng = np.random.default_rng(self.backend.seed)  # Source for all noise
+        self.mixer_initialized = False
         
         # Sound registers (accessible via CPU)
         self.sound_registers = [0] * 4
@@ -78,8 +430,7 @@ class NovaSound:
         self.SV = 0  # Sound Volume (8-bit, but stored as 16-bit for consistency)
         self.SW = 0  # Sound Waveform and control (8-bit, but stored as 16-bit for consistency)
         
-        # Sound channels
-        self.sound_channels: List[Optional[pygame.mixer.Sound]] = [None] * self.max_channels
+        # Sound channels: SPLAY/SSTOP only edit this state, the mixer renders it
         self.channel_states: List[Dict] = [
             {
                 'playing': False,
@@ -87,12 +438,32 @@ class NovaSound:
                 'volume': 0.5,
                 'waveform': 0,
                 'loop': False,
-                'phase': 0.0,
-                'envelope': 1.0
+                'phase': 0.0,       # Position inside the waveform table (table entries)
+                'envelope': 1.0,    # Gain applied on top of volume
+                'position': 0,      # Frames rendered since SPLAY
+                'length': 0,        # Frames to play for one-shots, 0 while looping
+                'sample_address': 0,      # Memory-based playback: first sample byte,
+                'sample_length': 0,       # number of sample bytes,
+                'sample_position': 0.0,   # and fractional read position within them
+                'noise_state': 0.0  # Last pink noise output, carried across blocks
             }
             for _ in range(self.max_channels)
         ]
         
+        # One-shot effect buffers (STRIG) being mixed: [samples, position] pairs
+        self.effect_voices: List[list] = []
+        
+        # Mixer: channels are rendered block_size frames at a time into a ring of
+        # preallocated int16 stereo blocks that feed the streaming output
+        self.block_size = buffer_size
+        self.mix_buffer = np.zeros(self.block_size, dtype=np.float32)
+        self.output_ring = np.zeros((4, self.block_size, 2), dtype=np.int16)
+        self.ring_index = 0
+        self.mixer_lock = threading.Lock()  # Guards channel state against the stream thread
+        self.sync_cycle = 0     # CPU cycle of the last sync()
+        self.clock_cycles = 0   # Emulated cycles elapsed, for backends that are not real-time
+        self.sequencer = NovaSequencer(self)
+        
         # Memory reference for sample data
         self.memory = None
         
@@ -100,6 +471,9 @@ class NovaSound:
         self.waveform_table_size = 1024
         self.waveform_tables = self._generate_waveform_tables()
         
+        # STRIG effect buffers, rendered on first use and read-only
+        self.effect_bank: Dict[int, np.ndarray] = {}
+        
         # Sound effects and envelope system
         self.envelope_stages = ['attack', 'decay', 'sustain', 'release']
         self.default_envelope = {
@@ -109,16 +483,13 @@ class NovaSound:
             'release_time': 0.2
         }
         
-        # Background thread for continuous sound generation
-        self.sound_thread_running = False
-        self.sound_thread = None
-        
-        print("Nova Sound System initialized")
-        print(f"Sample Rate: {sample_rate}Hz, Channels: {channels}, Buffer: {buffer_size}")
+        # Start the output last: a streaming backend begins pulling blocks immediately
+        self.mixer_initialized = self.backend.start(self)
     
     def set_memory_reference(self, memory):
-        """Set reference to system memory for sample data access"""
+        """Set reference to system memory for sample data and the sequencer control block"""
         self.memory = memory
+        self.sequencer.attach(memory)
     
     def _generate_waveform_tables(self) -> Dict[int, np.ndarray]:
         """Pre-generate waveform lookup tables for efficient sound synthesis"""
@@ -144,15 +515,11 @@ class NovaSound:
         tables[4] = 2.0 * np.abs(2.0 * (x / (2 * np.pi)) - 1.0) - 1.0
         
         # White noise (generated fresh each time, this is just a template)
-        tables[5] = np.random.uniform(-1.0, 1.0, size).astype(np.float32)
+        tables[5] = self.rng.uniform(-1.0, 1.0, size).astype(np.float32)
         
         # Pink noise (1/f noise approximation)
-        white = np.random.uniform(-1.0, 1.0, size)
-        # Simple pink noise filter (not perfect but adequate)
-        pink = np.zeros_like(white)
-        for i in range(1, len(white)):
-            pink[i] = 0.99 * pink[i-1] + 0.01 * white[i]
-        tables[6] = pink.astype(np.float32)
+        white = self.rng.uniform(-1.0, 1.0, size)
+        tables[6] = pink_filter(white)[0].astype(np.float32)
         
         return tables
     
@@ -180,71 +547,47 @@ class NovaSound:
             return np.zeros(int(self.sample_rate * duration), dtype=np.float32)
         
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples, dtype=np.float32)
         
         if waveform_type == 0:  # Silence
             return np.zeros(samples, dtype=np.float32)
         
         elif waveform_type in [1, 2, 3, 4]:  # Table-based waveforms
-            # Use pre-generated tables with interpolation
-            table = self.waveform_tables[waveform_type]
-            phase_increment = frequency * len(table) / self.sample_rate
-            phases = np.cumsum(np.full(samples, phase_increment)) % len(table)
-            
-            # Linear interpolation for smooth sound
-            indices = phases.astype(int)
-            fractions = phases - indices
-            
-            samples_out = table[indices] * (1 - fractions)
-            samples_out += table[(indices + 1) % len(table)] * fractions
-            
-            return samples_out * volume
+            return self._render_tone(waveform_type, frequency, duration, volume)
         
         elif waveform_type == 5:  # White noise
-            return np.random.uniform(-volume, volume, samples).astype(np.float32)
+            return self.rng.uniform(-volume, volume, samples).astype(np.float32)
         
         elif waveform_type == 6:  # Pink noise
-            white = np.random.uniform(-1.0, 1.0, samples)
-            pink = np.zeros_like(white)
-            for i in range(1, len(white)):
-                pink[i] = 0.99 * pink[i-1] + 0.01 * white[i]
-            return (pink * volume).astype(np.float32)
-        
-        elif waveform_type == 7:  # Memory-based sample
-            return self._load_sample_from_memory(duration, volume)
+            white = self.rng.uniform(-1.0, 1.0, samples)
+            return (pink_filter(white)[0] * volume).astype(np.float32)
         
         else:
             # Unknown waveform, return silence
             return np.zeros(samples, dtype=np.float32)
     
-    def _load_sample_from_memory(self, duration: float, volume: float = 1.0) -> np.ndarray:
-        """Load sample data from memory starting at SA register address"""
-        if self.memory is None or self.SA == 0:
-            return np.zeros(int(self.sample_rate * duration), dtype=np.float32)
+    def _render_tone(self, waveform_type: int, frequency: float, duration: float, volume: float) -> np.ndarray:
+        """Render a table-based waveform with linear interpolation"""
+        samples = int(self.sample_rate * duration)
+        table = self.waveform_tables[waveform_type]
+        phase_increment = frequency * len(table) / self.sample_rate
+        phases = np.arange(1, samples + 1) * phase_increment % len(table)
         
-        # Read sample data from memory
-        # Format: 8-bit unsigned samples, convert to float32 range [-1, 1]
-        try:
-            samples_needed = int(self.sample_rate * duration)
-            memory_data = []
-            
-            for i in range(min(samples_needed, 1024)):  # Limit to prevent excessive memory reads
-                addr = (self.SA + i) & 0xFFFF  # 16-bit address wrap
-                sample_byte = self.memory.read_byte(addr)
-                # Convert 8-bit unsigned (0-255) to float (-1 to 1)
-                float_sample = (sample_byte / 127.5) - 1.0
-                memory_data.append(float_sample)
-            
-            # If we need more samples, loop the data
-            if len(memory_data) < samples_needed:
-                loops = (samples_needed // len(memory_data)) + 1
-                memory_data = (memory_data * loops)[:samples_needed]
-            
-            return np.array(memory_data, dtype=np.float32) * volume
-            
-        except Exception as e:
-            print(f"Error loading sample from memory: {e}")
-            return np.zeros(int(self.sample_rate * duration), dtype=np.float32)
+        # Linear interpolation for smooth sound
+        indices = phases.astype(int)
+        fractions = phases - indices
+        
+        samples_out = table[indices] * (1 - fractions)
+        samples_out += table[(indices + 1) % len(table)] * fractions
+        samples_out *= volume
+        
+        return samples_out.astype(np.float32)
+    
+    def sample_length(self) -> int:
+        """Current memory sample length in bytes, from the memory-mapped length register"""
+        length = 0
+        if self.memory is not None:
+            length = self.memory.read_word(SAMPLE_LENGTH_ADDRESS)
+        return length or DEFAULT_SAMPLE_LENGTH
     
     def update_registers(self, sa: int = None, sf: int = None, sv: int = None, sw: int = None):
         """Update sound registers (called by CPU during register writes)"""
@@ -295,84 +638,50 @@ class NovaSound:
         frequency = self._register_to_frequency(self.SF)
         volume = self.SV / 255.0
         
-        # Generate sound sample (0.5 second duration for one-shot, longer for loops)
-        duration = 2.0 if loop_flag else 0.5
-        sample_data = self._generate_waveform_sample(waveform_type, frequency, duration, volume)
+        # Only the channel state changes: the mixer picks it up on its next block
+        with self.mixer_lock:
+            self._trigger_channel(channel, waveform_type, frequency, volume, loop_flag)
         
-        # Convert to stereo (duplicate mono to both channels)
-        if len(sample_data) > 0:
-            stereo_data = np.column_stack((sample_data, sample_data))
-            
-            # Convert to 16-bit integer format for pygame
-            audio_data = (stereo_data * 32767).astype(np.int16)
-            
-            # Create pygame Sound object and play
-            try:
-                if not self.mixer_initialized:
-                    # In test environment, just update state without playing
-                    pass
-                else:
-                    sound = pygame.mixer.Sound(audio_data)
-                    loops = -1 if loop_flag else 0  # -1 = infinite loop
-                    
-                    # Stop any existing sound on this channel
-                    if self.sound_channels[channel] is not None:
-                        pygame.mixer.stop()
-                    
-                    # Play the new sound
-                    sound.play(loops=loops)
-                    self.sound_channels[channel] = sound
-                
-                # Update channel state
-                self.channel_states[channel].update({
-                    'playing': True,
-                    'frequency': frequency,
-                    'volume': volume,
-                    'waveform': waveform_type,
-                    'loop': loop_flag
-                })
-                
-                return True
-                
-            except Exception as e:
-                print(f"Error playing sound on channel {channel}: {e}")
-                return False
+        return True
+    
+    def _trigger_channel(self, channel: int, waveform_type: int, frequency: float, volume: float, loop_flag: bool):
+        """Start a note on a channel (mixer lock must be held)"""
+        # One-shots last 0.5 seconds (memory samples: one pass), loops play until stopped
+        length = 0 if loop_flag else int(self.sample_rate * 0.5)
+        sample_length = 0
+        if waveform_type == 7:
+            sample_length = self.sample_length()
+            if not loop_flag and frequency > 0:
+                length = math.ceil(sample_length * SAMPLE_BASE_FREQUENCY / frequency)
         
-        return False
+        # The phase is kept so retriggering a playing channel does not click
+        self.channel_states[channel].update({
+            'playing': True,
+            'frequency': frequency,
+            'volume': volume,
+            'waveform': waveform_type,
+            'loop': loop_flag,
+            'position': 0,
+            'length': length,
+            'sample_address': self.SA,
+            'sample_length': sample_length,
+            'sample_position': 0.0
+        })
     
     def sstop(self, channel: int = None) -> bool:
         """
         SSTOP instruction implementation
-        Stop sound on specified channel, or all channels if channel is None
+        Stop sound on specified channel, or all channels (and effects) if channel is None
         """
-        try:
-            # Check if mixer is initialized before trying to stop sounds
-            if not pygame.mixer.get_init():
-                # Mixer not initialized, just reset our internal state
-                for i in range(self.max_channels):
-                    self.sound_channels[i] = None
-                    self.channel_states[i]['playing'] = False
-                return True
-            
+        with self.mixer_lock:
             if channel is None:
-                # Stop all channels
-                pygame.mixer.stop()
-                for i in range(self.max_channels):
-                    self.sound_channels[i] = None
-                    self.channel_states[i]['playing'] = False
-            else:
-                if channel < self.max_channels:
-                    # Stop specific channel
-                    if self.sound_channels[channel] is not None:
-                        self.sound_channels[channel].stop()
-                        self.sound_channels[channel] = None
-                        self.channel_states[channel]['playing'] = False
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error stopping sound: {e}")
-            return False
+                for state in self.channel_states:
+                    state['playing'] = False
+                self.effect_voices.clear()
+            elif 0 <= channel < self.max_channels:
+                self.channel_states[channel]['playing'] = False
+        
+        return True
     
     def strig(self, effect_type: int = 0) -> bool:
         """
@@ -389,62 +698,67 @@ class NovaSound:
         6 = Coin pickup
         7 = Power-up
         """
+        if not 0 <= effect_type <= 7:
+            return False
+        
         try:
-            if effect_type == 0:  # Simple beep
-                self._play_effect_beep()
-            elif effect_type == 1:  # Rising tone
-                self._play_effect_sweep(start_freq=200, end_freq=800, duration=0.3)
-            elif effect_type == 2:  # Falling tone
-                self._play_effect_sweep(start_freq=800, end_freq=200, duration=0.3)
-            elif effect_type == 3:  # Explosion
-                self._play_effect_explosion()
-            elif effect_type == 4:  # Laser shot
-                self._play_effect_laser()
-            elif effect_type == 5:  # Jump
-                self._play_effect_jump()
-            elif effect_type == 6:  # Coin pickup
-                self._play_effect_coin()
-            elif effect_type == 7:  # Power-up
-                self._play_effect_powerup()
-            else:
-                return False
+            # Effects are rendered once and replayed from the bank afterwards
+            sample_data = self.effect_bank.get(effect_type)
+            if sample_data is None:
+                sample_data = self._render_effect(effect_type).astype(np.float32)
+                sample_data.flags.writeable = False
+                self.effect_bank[effect_type] = sample_data
             
+            self._play_sample_direct(sample_data)
             return True
             
         except Exception as e:
             print(f"Error triggering sound effect {effect_type}: {e}")
             return False
     
-    def _play_effect_beep(self):
-        """Play a simple beep sound"""
+    def _render_effect(self, effect_type: int) -> np.ndarray:
+        """Render the buffer for one STRIG effect type"""
+        if effect_type == 0:  # Simple beep
+            return self._render_effect_beep()
+        elif effect_type == 1:  # Rising tone
+            return self._render_effect_sweep(start_freq=200, end_freq=800, duration=0.3)
+        elif effect_type == 2:  # Falling tone
+            return self._render_effect_sweep(start_freq=800, end_freq=200, duration=0.3)
+        elif effect_type == 3:  # Explosion
+            return self._render_effect_explosion()
+        elif effect_type == 4:  # Laser shot
+            return self._render_effect_laser()
+        elif effect_type == 5:  # Jump
+            return self._render_effect_jump()
+        elif effect_type == 6:  # Coin pickup
+            return self._render_effect_coin()
+        else:  # Power-up
+            return self._render_effect_powerup()
+    
+    def _render_effect_beep(self) -> np.ndarray:
+        """Render a simple beep sound"""
         frequency = 800
         duration = 0.2
         volume = 0.5
-        sample_data = self._generate_waveform_sample(2, frequency, duration, volume)  # Sine wave
-        self._play_sample_direct(sample_data)
+        return self._generate_waveform_sample(2, frequency, duration, volume)  # Sine wave
     
-    def _play_effect_sweep(self, start_freq: float, end_freq: float, duration: float):
-        """Play a frequency sweep effect"""
+    def _render_effect_sweep(self, start_freq: float, end_freq: float, duration: float) -> np.ndarray:
+        """Render a frequency sweep effect"""
         samples = int(self.sample_rate * duration)
         frequencies = np.linspace(start_freq, end_freq, samples)
         
-        sample_data = np.zeros(samples, dtype=np.float32)
-        phase = 0.0
-        
-        for i, freq in enumerate(frequencies):
-            phase_increment = 2 * np.pi * freq / self.sample_rate
-            sample_data[i] = np.sin(phase) * 0.5
-            phase += phase_increment
-        
-        self._play_sample_direct(sample_data)
+        # Phase at each sample is the sum of the increments of all earlier samples
+        phase = np.zeros(samples)
+        np.cumsum(2 * np.pi * frequencies[:-1] / self.sample_rate, out=phase[1:])
+        return np.sin(phase) * 0.5
     
-    def _play_effect_explosion(self):
-        """Play an explosion sound effect using filtered noise"""
+    def _render_effect_explosion(self) -> np.ndarray:
+        """Render an explosion sound effect using filtered noise"""
         duration = 0.8
         samples = int(self.sample_rate * duration)
         
         # Start with white noise
-        noise = np.random.uniform(-1.0, 1.0, samples)
+        noise = self.rng.uniform(-1.0, 1.0, samples)
         
         # Apply envelope (sharp attack, long decay)
         envelope = np.exp(-np.linspace(0, 8, samples))
@@ -452,11 +766,10 @@ class NovaSound:
         # Apply low-pass filter effect (simple moving average)
         filtered = np.convolve(noise, np.ones(10)/10, mode='same')
         
-        sample_data = (filtered * envelope * 0.7).astype(np.float32)
-        self._play_sample_direct(sample_data)
+        return filtered * envelope * 0.7
     
-    def _play_effect_laser(self):
-        """Play a laser sound effect"""
+    def _render_effect_laser(self) -> np.ndarray:
+        """Render a laser sound effect"""
         duration = 0.15
         samples = int(self.sample_rate * duration)
         t = np.linspace(0, duration, samples)
@@ -468,12 +781,10 @@ class NovaSound:
         
         # Generate the waveform
         phase = np.cumsum(2 * np.pi * frequency / self.sample_rate)
-        sample_data = (np.sin(phase) * 0.6).astype(np.float32)
-        
-        self._play_sample_direct(sample_data)
+        return np.sin(phase) * 0.6
     
-    def _play_effect_jump(self):
-        """Play a jump sound effect"""
+    def _render_effect_jump(self) -> np.ndarray:
+        """Render a jump sound effect"""
         duration = 0.25
         samples = int(self.sample_rate * duration)
         t = np.linspace(0, duration, samples)
@@ -483,12 +794,10 @@ class NovaSound:
         phase = np.cumsum(2 * np.pi * frequency / self.sample_rate)
         
         # Square wave for retro feel
-        sample_data = (np.sign(np.sin(phase)) * 0.4).astype(np.float32)
-        
-        self._play_sample_direct(sample_data)
+        return np.sign(np.sin(phase)) * 0.4
     
-    def _play_effect_coin(self):
-        """Play a coin pickup sound effect"""
+    def _render_effect_coin(self) -> np.ndarray:
+        """Render a coin pickup sound effect"""
         # Two-tone ascending sound
         freq1, freq2 = 660, 880  # E5, A5
         duration = 0.15
@@ -499,11 +808,10 @@ class NovaSound:
         sample2 = self._generate_waveform_sample(2, freq2, duration, 0.5)
         
         # Concatenate
-        sample_data = np.concatenate([sample1, sample2])
-        self._play_sample_direct(sample_data)
+        return np.concatenate([sample1, sample2])
     
-    def _play_effect_powerup(self):
-        """Play a power-up sound effect"""
+    def _render_effect_powerup(self) -> np.ndarray:
+        """Render a power-up sound effect"""
         duration = 0.6
         samples = int(self.sample_rate * duration)
         t = np.linspace(0, duration, samples)
@@ -525,25 +833,123 @@ class NovaSound:
             if len(tone) > 0:
                 sample_data[start_idx:start_idx + len(tone)] += tone[:end_idx - start_idx]
         
-        self._play_sample_direct(sample_data)
+        return sample_data
     
     def _play_sample_direct(self, sample_data: np.ndarray):
-        """Play a sample directly using pygame mixer"""
+        """Queue a one-shot buffer on the mixer alongside the channels"""
         if len(sample_data) == 0:
             return
         
-        try:
-            # Convert to stereo
-            stereo_data = np.column_stack((sample_data, sample_data))
-            # Convert to 16-bit integer
-            audio_data = (stereo_data * 32767).astype(np.int16)
-            
-            # Create and play sound
-            sound = pygame.mixer.Sound(audio_data)
-            sound.play()
-            
-        except Exception as e:
-            print(f"Error playing sample: {e}")
+        with self.mixer_lock:
+            if len(self.effect_voices) >= self.max_channels:
+                self.effect_voices.pop(0)  # Drop the oldest effect
+            self.effect_voices.append([np.asarray(sample_data, dtype=np.float32), 0])
+    
+    # Software mixer
+    
+    def _render_channel(self, state: Dict, out: np.ndarray):
+        """Add the next frames of one playing channel to out and advance its state"""
+        frames = len(out)
+        if state['length']:
+            frames = min(frames, state['length'] - state['position'])
+        waveform = state['waveform']
+        gain = state['volume'] * state['envelope']
+        
+        if frames > 0 and gain > 0 and state['frequency'] > 0 and waveform != 0:
+            if waveform in (1, 2, 3, 4):  # Table-based waveforms, linearly interpolated
+                table = self.waveform_tables[waveform]
+                size = len(table)
+                increment = state['frequency'] * size / self.sample_rate
+                phases = state['phase'] + increment * np.arange(1, frames + 1)
+                np.mod(phases, size, out=phases)
+                indices = phases.astype(np.intp)
+                fractions = phases - indices
+                block = table[indices] * (1 - fractions)
+                block += table[(indices + 1) % size] * fractions
+                state['phase'] = float(phases[-1])
+            elif waveform == 5:  # White noise
+                block = self.rng.uniform(-1.0, 1.0, frames)
+            elif waveform == 6:  # Pink noise, filter state carried across blocks
+                white = self.rng.uniform(-1.0, 1.0, frames)
+                block, state['noise_state'] = pink_filter(white, state['noise_state'])
+            else:  # Memory-based sample, read from emulated RAM every block
+                block = self._render_memory_sample(state, frames)
+            out[:frames] += block * gain
+        
+        state['position'] += max(frames, 0)
+        if state['length'] and state['position'] >= state['length']:
+            state['playing'] = False
+    
+    def _render_memory_sample(self, state: Dict, frames: int) -> np.ndarray:
+        """Read the next frames of a memory sample, resampled to the channel frequency and looped"""
+        if self.memory is None or state['sample_address'] == 0:
+            return np.zeros(frames)
+        
+        # Fractional read positions, interpolated between neighbouring sample bytes
+        data = self.memory.memory
+        length = state['sample_length']
+        step = state['frequency'] / SAMPLE_BASE_FREQUENCY
+        positions = state['sample_position'] + step * np.arange(frames)
+        np.mod(positions, length, out=positions)
+        indices = positions.astype(np.intp)
+        fractions = positions - indices
+        current = data[(state['sample_address'] + indices) % len(data)]
+        following = data[(state['sample_address'] + (indices + 1) % length) % len(data)]
+        state['sample_position'] = (float(positions[-1]) + step) % length
+        
+        # 8-bit unsigned (0-255) to float (-1 to 1)
+        block = current * (1 - fractions)
+        block += following * fractions
+        block /= 127.5
+        block -= 1.0
+        return block
+    
+    def _render_effects(self, out: np.ndarray):
+        """Add the next frames of every effect voice to out, dropping finished ones"""
+        for voice in self.effect_voices:
+            samples, position = voice
+            chunk = samples[position:position + len(out)]
+            out[:len(chunk)] += chunk
+            voice[1] = position + len(chunk)
+        self.effect_voices = [voice for voice in self.effect_voices if voice[1] < len(voice[0])]
+    
+    def mix_block(self) -> np.ndarray:
+        """Mix the next block of all channels and effects as mono float samples"""
+        mix = self.mix_buffer
+        mix.fill(0.0)
+        with self.mixer_lock:
+            # Split the block where sequencer rows fall so notes start on their exact frame
+            start = 0
+            while start < len(mix):
+                end = start + self.sequencer.next_segment(len(mix) - start)
+                segment = mix[start:end]
+                for state in self.channel_states:
+                    if state['playing']:
+                        self._render_channel(state, segment)
+                self._render_effects(segment)
+                self.sequencer.advance(end - start)
+                start = end
+        return mix
+    
+    def sync(self, cycle: int):
+        """Bring a backend that is not real-time up to the given CPU cycle count"""
+        if self.backend.realtime:
+            return
+        if cycle > self.sync_cycle:
+            self.clock_cycles += cycle - self.sync_cycle
+        self.sync_cycle = cycle  # A new CPU may start counting from 0 again
+        self.backend.render_until(self.clock_cycles * self.sample_rate // CPU_CLOCK_HZ)
+    
+    def render_block(self) -> np.ndarray:
+        """Mix the next block into the output ring and return it as int16 stereo frames"""
+        mix = self.mix_block()
+        np.clip(mix, -1.0, 1.0, out=mix)
+        mix *= 32767
+        block = self.output_ring[self.ring_index]
+        self.ring_index = (self.ring_index + 1) % len(self.output_ring)
+        block[:, 0] = mix
+        block[:, 1] = mix
+        return block
     
     def get_channel_status(self, channel: int) -> Dict:
         """Get the current status of a sound channel"""
@@ -558,13 +964,10 @@ class NovaSound:
     def cleanup(self):
         """Clean up sound system resources"""
         try:
-            # Check if mixer is still initialized before trying to stop sounds
-            if pygame.mixer.get_init():
-                self.sstop()  # Stop all sounds
-                pygame.mixer.quit()
-                print("Nova Sound System cleaned up")
-            else:
-                print("")
+            self.sstop()  # Stop all sounds
+            if self.mixer_initialized:
+                self.mixer_initialized = False
+                self.backend.stop()
         except Exception as e:
             print(f"Error during sound cleanup: {e}")
     
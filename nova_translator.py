@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Nova-16 Block Translator
+
+Translates straight-line basic blocks of Nova-16 code into Python functions.
+
+A block starts at any PC that is reached by the block engine and runs until
+the first control-transfer instruction (JMP/Jcc/BR/CALL/RET/IRET/INT/HLT).
+Blocks are built from the CPU's predecoded instruction cache, so every
+instruction in a block has already been executed once by the interpreter.
+
+Key Features:
+- Register and immediate operands baked in as constants
+- Common ALU/MOV/jump instructions emitted as inline Python
+- Flag results only recorded when a later instruction may read them
+- Every other instruction runs its normal execute() with predecoded operands
+
+The interpreter (CPU.step) remains the reference implementation; translated
+blocks must leave the machine in exactly the state the interpreter would.
+Blocks only run when no scheduled event (timer, interrupt) falls inside
+them, and keep cpu.cycle_count exact for every instruction that can observe
+it.
+
+Blocks that only read memory and device registers and only write R/P
+registers and flags are marked as polling blocks. If such a block loops back
+to itself without changing any state, the CPU can skip ahead to the next
+event instead of running it again (see CPU._run_polling_block).
+"""
+
+from nova_operands import REGISTER, IMMEDIATE
+
+# Opcodes that end a basic block: HLT, RET, IRET, JMP/Jcc, BR/BRZ/BRNZ, CALL, INT
+BLOCK_TERMINATORS = frozenset([0x00, 0x01, 0x02] + list(range(0x1E, 0x2E)) + [0x2F, 0x30])
+
+# Upper bound on instructions per translated block
+MAX_BLOCK_INSTRUCTIONS = 64
+
+# Jump conditions over the flag list F (None = unconditional)
+JUMP_CONDITIONS = {
+    0x1E: None,                          # JMP
+    0x1F: 'F[7]',                        # JZ
+    0x20: 'not F[7]',                    # JNZ
+    0x21: 'F[2]',                        # JO
+    0x22: 'not F[2]',                    # JNO
+    0x23: 'F[6]',                        # JC
+    0x24: 'not F[6]',                    # JNC
+    0x25: 'F[1]',                        # JS
+    0x26: 'not F[1]',                    # JNS
+    0x27: 'not F[7] and F[2] == F[1]',   # JGT
+    0x28: 'F[2] != F[1]',                # JLT
+    0x29: 'F[2] == F[1]',                # JGE
+    0x2A: 'F[7] or F[2] != F[1]',        # JLE
+}
+
+# Two-operand ALU instructions: opcode -> Python operator
+ALU_OPERATORS = {
+    0x07: '+',   # ADD
+    0x08: '-',   # SUB
+    0x10: '&',   # AND
+    0x11: '|',   # OR
+    0x12: '^',   # XOR
+}
+
+# Instructions whose only side effect is writing their R/P register
+# destination and the flags: MOV ADD SUB INC DEC AND OR XOR NOT SHL SHR
+# KEYSTAT KEYCOUNT
+REGISTER_ONLY_OPCODES = frozenset([0x06, 0x07, 0x08, 0x0B, 0x0C, 0x10, 0x11, 0x12,
+                                   0x13, 0x14, 0x15, 0x44, 0x45])
+
+# Instructions without any side effect besides the flags and PC: NOP, CMP, jumps, branches
+READ_ONLY_OPCODES = frozenset([0xFF, 0x2E] + list(range(0x1E, 0x2E)))
+
+# Instruction kinds used for flag liveness
+NEUTRAL = 0   # Does not touch Z/C/S/P
+WRITER = 1    # Overwrites Z/C/S/P without reading them
+READER = 2    # May read flags (jumps and anything run through execute())
+
+
+def _register_operand(operand):
+    """Return (source, mask) for an R/P register operand, else None"""
+    if operand.kind != REGISTER:
+        return None
+    if operand.reg_type == 'R':
+        return f"R[{operand.reg_idx}]", 0xFF
+    if operand.reg_type == 'P':
+        return f"P[{operand.reg_idx}]", 0xFFFF
+    return None
+
+
+def _value_operand(operand):
+    """Return a Python expression for an R/P register or immediate operand, else None"""
+    if operand.kind == IMMEDIATE:
+        return str(int(operand.value))
+    reg = _register_operand(operand)
+    return reg[0] if reg else None
+
+
+def _is_polling_instruction(entry):
+    """True if a decoded instruction writes nothing but an R/P register and the flags"""
+    instruction, mode_byte, operands, next_pc, dynamic = entry
+    opcode = instruction.opcode
+    if opcode in READ_ONLY_OPCODES:
+        return True
+    if opcode in REGISTER_ONLY_OPCODES and operands:
+        return _register_operand(operands[0]) is not None
+    return False
+
+
+def _flag_lines(result, eight_bit):
+    """Emit the lazy flag record of _set_flags_8bit/_set_flags_16bit for result"""
+    if eight_bit:
+        return [f"F.pending = ({result} & 0xFF, {result}, 0xFF)"]
+    return [f"F.pending = ({result}, {result}, 0xFFFF)"]
+
+
+class BlockTranslator:
+    """Compiles basic blocks from the predecode cache into Python functions"""
+
+    def __init__(self, cpu):
+        self.cpu = cpu
+        self.blocks_translated = 0
+
+    def find_block(self, pc):
+        """Collect (pc, decode entry) pairs for the block at pc, or None if not fully decoded yet"""
+        decode_cache = self.cpu.decode_cache
+        block = []
+        while len(block) < MAX_BLOCK_INSTRUCTIONS:
+            entry = decode_cache.get(pc)
+            if entry is None:
+                return None
+            block.append((pc, entry))
+            if entry[0].opcode in BLOCK_TERMINATORS:
+                break
+            if entry[3] <= pc:
+                # Never let a block wrap around the top of memory
+                break
+            pc = entry[3]
+        return block
+
+    def translate(self, pc):
+        """Translate the block at pc and return (function, end_pc, count, polling), or None"""
+        block = self.find_block(pc)
+        if not block:
+            return None
+
+        namespace = {}
+        bodies = []
+        kinds = []
+        for i, (start_pc, entry) in enumerate(block):
+            body, kind = self._translate_instruction(i, entry, namespace)
+            bodies.append(body)
+            kinds.append(kind)
+
+        # Backward liveness: flag updates are dead if a later writer overwrites
+        # them before anything in this block can read them
+        live = True
+        flags_needed = [False] * len(block)
+        for i in range(len(block) - 1, -1, -1):
+            if kinds[i] == WRITER:
+                flags_needed[i] = live
+                live = False
+            elif kinds[i] == READER:
+                live = True
+
+        lines = [
+            "def block(cpu):",
+            "    R = cpu.Rregisters",
+            "    P = cpu.Pregisters",
+            "    F = cpu._flags",
+            "    gen = cpu.code_generation",
+            "    c = cpu.cycle_count",
+        ]
+        last = len(block) - 1
+        for i, (start_pc, entry) in enumerate(block):
+            instruction, mode_byte, operands, next_pc, dynamic = entry
+            lines.append(f"    # {start_pc:04X} {instruction.name}")
+            code, flags = bodies[i]
+            generic = f'I{i}' in namespace
+            if generic:
+                # execute() may read the timer, so the cycle counter must be exact
+                lines.append(f"    cpu.cycle_count = c + {i + 1}")
+            for line in code:
+                lines.append("    " + line)
+            if flags_needed[i]:
+                for line in flags:
+                    lines.append("    " + line)
+            if generic and i != last:
+                # Stop early if execute() redirected control, modified code
+                # or scheduled an event before the next instruction
+                lines.append(f"    if (cpu.pc != {next_pc} or cpu.code_generation != gen or")
+                lines.append(f"            cpu.next_event_cycle <= c + {i + 2}):")
+                lines.append(f"        return {i + 1}")
+        if kinds[last] != READER:
+            # Block was cut short (length limit); fall through to the next PC
+            lines.append(f"    cpu.pc = {block[last][1][3]}")
+        if f'I{last}' not in namespace:
+            lines.append(f"    cpu.cycle_count = c + {len(block)}")
+        lines.append(f"    return {len(block)}")
+
+        source = "\n".join(lines) + "\n"
+        exec(compile(source, f"<nova block {pc:04X}>", "exec"), namespace)
+        self.blocks_translated += 1
+        end_pc = block[last][1][3]
+        # A polling block ends in a jump and has no side effects outside R/P and flags
+        polling = (0x1E <= block[last][1][0].opcode <= 0x2D and
+                   all(_is_polling_instruction(entry) for start_pc, entry in block))
+        return namespace['block'], end_pc, len(block), polling
+
+    def _translate_instruction(self, i, entry, namespace):
+        """Return ((code_lines, flag_lines), kind) for one decoded instruction"""
+        instruction, mode_byte, decoded, next_pc, dynamic = entry
+        opcode = instruction.opcode
+        operands = decoded or ()
+
+        if opcode == 0xFF:  # NOP
+            return ([], []), NEUTRAL
+        if opcode == 0x03:  # CLI
+            return (["F[5] = 0"], []), NEUTRAL
+        if opcode == 0x04:  # STI
+            return (["F[5] = 1"], []), NEUTRAL
+
+        if opcode == 0x06 and len(operands) == 2:  # MOV
+            dest = _register_operand(operands[0])
+            if dest:
+                if operands[1].kind == IMMEDIATE:
+                    return ([f"{dest[0]} = {int(operands[1].value) & dest[1]}"], []), NEUTRAL
+                source = _register_operand(operands[1])
+                if source:
+                    if source[1] <= dest[1]:
+                        return ([f"{dest[0]} = {source[0]}"], []), NEUTRAL
+                    return ([f"{dest[0]} = {source[0]} & {dest[1]:#x}"], []), NEUTRAL
+
+        if opcode in ALU_OPERATORS and len(operands) == 2:
+            dest = _register_operand(operands[0])
+            source = _value_operand(operands[1])
+            if dest and source is not None:
+                code = [
+                    f"t = {dest[0]} {ALU_OPERATORS[opcode]} {source}",
+                    f"{dest[0]} = t & {dest[1]:#x}",
+                ]
+                # ADD/SUB report 8-bit flags for R destinations; the rest are always 16-bit
+                eight_bit = opcode in (0x07, 0x08) and dest[1] == 0xFF
+                return (code, _flag_lines("t", eight_bit)), WRITER
+
+        if opcode in (0x0B, 0x0C) and len(operands) == 1:  # INC, DEC
+            dest = _register_operand(operands[0])
+            if dest:
+                op = '+' if opcode == 0x0B else '-'
+                code = [f"t = {dest[0]} {op} 1", f"{dest[0]} = t & {dest[1]:#x}"]
+                return (code, _flag_lines("t", False)), WRITER
+
+        if opcode == 0x2E and len(operands) == 2:  # CMP
+            first = _value_operand(operands[0])
+            second = _value_operand(operands[1])
+            if first is not None and second is not None:
+                return ([f"t = {first} - {second}"], _flag_lines("t", False)), WRITER
+
+        if opcode in JUMP_CONDITIONS and len(operands) == 1:
+            target = _value_operand(operands[0])
+            if target is not None:
+                condition = JUMP_CONDITIONS[opcode]
+                if condition is None:
+                    code = [f"cpu.pc = {target}", "cpu.prefetch_valid = False"]
+                else:
+                    code = [
+                        f"if {condition}:",
+                        f"    cpu.pc = {target}",
+                        "    cpu.prefetch_valid = False",
+                        "else:",
+                        f"    cpu.pc = {next_pc}",
+                    ]
+                return (code, []), READER
+
+        # Anything else runs through the instruction object with predecoded operands
+        namespace[f'I{i}'] = instruction
+        code = [f"cpu.pc = {next_pc}"]
+        if mode_byte is not None:
+            code.append(f"cpu._current_mode_byte = {mode_byte}")
+        if decoded is not None:
+            namespace[f'O{i}'] = decoded
+            if dynamic:
+                code.append(f"cpu._cached_operands = cpu._materialize_operands(O{i})")
+            else:
+                code.append(f"cpu._cached_operands = O{i}")
+        code.append(f"I{i}.execute(cpu)")
+        return (code, []), READER
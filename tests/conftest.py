@@ -32,7 +32,7 @@ def graphics():
 @pytest.fixture
 def sound_system():
     """Create a fresh sound system instance for testing."""
-    return sound.NovaSound()
+    return sound.NovaSound(backend=sound.NullAudioBackend())
 
 
 @pytest.fixture
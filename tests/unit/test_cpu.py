@@ -5,6 +5,7 @@ Unit tests for nova_cpu.py - Nova-16 CPU core.
 import pytest
 import numpy as np
 from tests.conftest import assert_register_equals, run_cpu_cycles
+from nova_cpu import RunResult
 
 
 class TestCPUInitialization:
@@ -135,6 +136,39 @@ class TestCPUFlags:
         cpu.step()
         assert cpu.flags[1] == 1  # Sign flag set (negative result)
 
+    def test_flags_evaluated_lazily(self, cpu):
+        """Test that ALU flags are deferred until the flag list is read."""
+        cpu.Rregisters[0] = 0x80
+        cpu.Rregisters[1] = 0x80
+
+        # ADD R0, R1 (0x80 + 0x80 = 0x100: zero, carry, even parity)
+        cpu.memory.write_byte(0x0000, 0x07)  # ADD opcode
+        cpu.memory.write_byte(0x0001, 0x00)  # Mode byte: both register direct
+        cpu.memory.write_byte(0x0002, 0xE7)  # R0
+        cpu.memory.write_byte(0x0003, 0xE8)  # R1
+
+        cpu.step()
+        assert cpu._flags.pending is not None
+
+        assert list(cpu.flags) == [0, 0, 0, 0, 0, 0, 1, 1, 1, 0, 0, 0]
+        assert cpu._flags.pending is None
+        assert cpu.zero_flag and cpu.carry_flag and cpu.parity_flag
+        assert not cpu.sign_flag
+
+    def test_flag_write_keeps_deferred_flags(self, cpu):
+        """Test that writing one flag does not lose deferred ALU flags."""
+        cpu._set_flags_16bit(0x8000, 0x8000)
+        cpu.flags[5] = 1
+        assert cpu.flags[1] == 1  # Sign flag from the deferred result
+        assert cpu.flags[5] == 1
+        assert cpu.get_flag_state() == cpu.flags
+
+    def test_parity_table(self):
+        """Test the parity lookup table against a bit count."""
+        from nova_cpu import PARITY_TABLE
+        for value in range(256):
+            assert PARITY_TABLE[value] == (bin(value).count('1') % 2 == 0)
+
 
 class TestCPUInterrupts:
     """Test CPU interrupt handling."""
@@ -152,6 +186,87 @@ class TestCPUInterrupts:
         assert cpu.flags[5] == 1  # Interrupt flag set
 
 
+    def test_masked_keyboard_interrupt_delivered_after_sti(self, cpu):
+        """Test that a keyboard interrupt stays pending until interrupts are enabled."""
+        cpu.memory.write_word(0x0108, 0x2000)  # Keyboard interrupt handler
+        for address in range(0x0000, 0x0004):
+            cpu.memory.write_byte(address, 0xFF)  # NOP
+        cpu.memory.write_byte(0x0001, 0x04)  # STI
+        cpu.memory.write_byte(0x2000, 0xFF)
+        cpu.interrupts[2] = 1
+        cpu.add_key_to_buffer(65)
+
+        cpu.step()
+        cpu.step()
+        assert cpu.pc == 0x0002  # STI executed, interrupt not yet taken
+        cpu.step()
+        assert cpu.pc == 0x2001  # Delivered before the next instruction
+        assert cpu.keyboard[1] & 0x80 == 0
+
+    def test_key_during_rescheduling_is_not_lost(self, cpu):
+        """Test that a key arriving while events are rescheduled still requests service."""
+        cpu.interrupts[2] = 1
+        check_pending = cpu._device_interrupt_pending
+
+        def key_arrives_after_check():
+            pending = check_pending()
+            cpu.add_key_to_buffer(65)  # GUI thread runs between the check and the store
+            return pending
+
+        cpu._device_interrupt_pending = key_arrives_after_check
+        cpu._schedule_events()
+        assert cpu.next_event_cycle == 0
+
+    def test_sprite_collision_interrupt(self, cpu):
+        """Test that a new collision of a sprite with flag bit 2 raises vector 5."""
+        cpu.memory.write_word(0x0114, 0x2000)  # Collision interrupt handler
+        cpu.interrupts[5] = 1
+        cpu.memory.write_byte(0x0000, 0x04)  # STI
+        cpu.memory.write_byte(0x0001, 0xFF)  # NOP
+        cpu.memory.write_byte(0x2000, 0xFF)
+        cpu.memory.write_block(0x1000, bytes([1] * 4))
+        for sprite_id in range(2):
+            cpu.memory.write_block(0xF000 + sprite_id * 16, bytes([0x10, 0x00, 30 + sprite_id, 30, 2, 2, 0x05, 0]))
+        cpu.step()
+
+        cpu.gfx.blit_all_sprites(cpu.memory)
+        assert cpu.collision_pending
+        cpu.step()
+        assert cpu.pc == 0x2001
+
+        # Contact that persists does not interrupt again
+        cpu.memory.write_byte(0xF003, 31)
+        cpu.gfx.blit_all_sprites(cpu.memory)
+        assert not cpu.collision_pending
+
+    def test_sprite_collision_interrupt_disabled(self, cpu):
+        """Test that collisions do not interrupt unless interrupt 5 is enabled."""
+        cpu.memory.write_block(0x1000, bytes([1] * 4))
+        for sprite_id in range(2):
+            cpu.memory.write_block(0xF000 + sprite_id * 16, bytes([0x10, 0x00, 30 + sprite_id, 30, 2, 2, 0x05, 0]))
+        cpu.gfx.blit_all_sprites(cpu.memory)
+        assert cpu.memory.read_word(0xF008) == 0x0002  # Collision still recorded
+        assert not cpu.collision_pending
+        assert not cpu._device_interrupt_pending()
+
+    def test_sprite_collisions_follow_cpu_stores(self, cpu):
+        """Test that moving a sprite from code updates its collision registers on the next frame."""
+        cpu.interrupts[5] = 1
+        cpu.memory.write_block(0x1000, bytes([1] * 4))
+        for sprite_id, x in ((0, 30), (1, 40)):
+            cpu.memory.write_block(0xF000 + sprite_id * 16, bytes([0x10, 0x00, x, 30, 2, 2, 0x05, 0]))
+        cpu.gfx.get_screen()
+        assert cpu.memory.read_word(0xF008) == 0 and not cpu.collision_pending
+
+        # MOV P1, 0x1F1E; MOV [0xF012], P1; HLT  (sprite 1 moves to x=31, y=30, onto sprite 0)
+        cpu.memory.write_block(0x2000, bytes([0x06, 0x08, 0xF2, 0x1F, 0x1E, 0x06, 0x83, 0xF0, 0x12, 0xF2, 0x00]))
+        cpu.pc = 0x2000
+        cpu.run(100)
+        cpu.gfx.get_screen()
+        assert cpu.memory.read_word(0xF008) == 0x0002 and cpu.memory.read_word(0xF018) == 0x0001
+        assert cpu.collision_pending
+
+
 class TestCPUMemoryAccess:
     """Test CPU memory access operations."""
 
@@ -348,6 +463,262 @@ class TestCPUProgramExecution:
         assert cpu.halted == True
 
 
+class TestCPUDecodeCache:
+    """Test the predecoded instruction cache."""
+
+    def test_decode_cached_and_reused(self, cpu):
+        """Test that a decoded instruction is cached and replayed."""
+        # MOV R0, 5
+        for i, byte in enumerate([0x06, 0x04, 0xE7, 0x05]):
+            cpu.memory.write_byte(i, byte)
+
+        cpu.step()
+        assert 0x0000 in cpu.decode_cache
+        assert cpu.pc == 0x0004
+
+        cpu.Rregisters[0] = 0
+        cpu.pc = 0x0000
+        cpu.step()
+        assert_register_equals(cpu, 'R0', 5)
+        assert cpu.pc == 0x0004
+
+    def test_self_modifying_code_invalidates_cache(self, cpu):
+        """Test that writing over cached code forces a fresh decode."""
+        # MOV R0, 5
+        for i, byte in enumerate([0x06, 0x04, 0xE7, 0x05]):
+            cpu.memory.write_byte(i, byte)
+
+        cpu.step()
+        assert_register_equals(cpu, 'R0', 5)
+
+        # Patch the immediate operand in place
+        cpu.memory.write_byte(0x0003, 0x07)
+        assert 0x0000 not in cpu.decode_cache
+
+        cpu.pc = 0x0000
+        cpu.step()
+        assert_register_equals(cpu, 'R0', 7)
+
+    def test_cached_register_indirect_address_follows_register(self, cpu):
+        """Test that register indirect operands re-read the register on a cache hit."""
+        # MOV R0, [P0]
+        for i, byte in enumerate([0x06, 0x0C, 0xE7, 0xF1]):
+            cpu.memory.write_byte(i, byte)
+        cpu.memory.write_word(0x2000, 0x0011)
+        cpu.memory.write_word(0x3000, 0x0022)
+
+        cpu.Pregisters[0] = 0x2000
+        cpu.step()
+        assert_register_equals(cpu, 'R0', 0x11)
+
+        cpu.Pregisters[0] = 0x3000
+        cpu.pc = 0x0000
+        cpu.step()
+        assert_register_equals(cpu, 'R0', 0x22)
+
+    def test_cached_operands_are_decoded_once(self, cpu):
+        """Test that cached operands carry kind codes and are shared between executions."""
+        from nova_operands import REGISTER, IMMEDIATE
+        # MOV R0, 5
+        for i, byte in enumerate([0x06, 0x04, 0xE7, 0x05]):
+            cpu.memory.write_byte(i, byte)
+
+        cpu.step()
+        operands = cpu.decode_cache[0x0000][2]
+        assert operands[0].kind == REGISTER and operands[0].byte_register
+        assert operands[1].kind == IMMEDIATE and operands[1].value == 5
+
+        cpu.pc = 0x0000
+        cpu.step()
+        assert cpu.decode_cache[0x0000][2] is operands
+        assert_register_equals(cpu, 'R0', 5)
+
+
+class TestCPUBlockTranslator:
+    """Test the basic-block translator against the reference interpreter."""
+
+    # MOV R0, 0; MOV P1, 0
+    # LOOP: ADD P1, R0; XOR R2, 0x55; SUB R3, 1; INC R0; CMP R0, 10; JNZ LOOP
+    # MOV [0x2000], P1; HLT
+    LOOP_PROGRAM = [
+        0x06, 0x04, 0xE7, 0x00, 0x06, 0x04, 0xF2, 0x00,
+        0x07, 0x00, 0xF2, 0xE7, 0x12, 0x04, 0xE9, 0x55, 0x08, 0x04, 0xEA, 0x01,
+        0x0B, 0x00, 0xE7, 0x2E, 0x04, 0xE7, 0x0A, 0x20, 0x02, 0x00, 0x08,
+        0x06, 0x83, 0x20, 0x00, 0xF2, 0x00,
+    ]
+
+    def _load(self, cpu, program):
+        cpu.reinit()
+        for i, byte in enumerate(program):
+            cpu.memory.write_byte(i, byte)
+
+    def test_block_engine_matches_interpreter(self, cpu):
+        """Test that translated blocks leave the same state as step()."""
+        self._load(cpu, self.LOOP_PROGRAM)
+        while not cpu.halted:
+            cpu.step()
+        expected = (cpu.pc, list(cpu.Rregisters), list(cpu.Pregisters),
+                    list(cpu.flags), cpu.memory.read_word(0x2000))
+
+        self._load(cpu, self.LOOP_PROGRAM)
+        executed = 0
+        while not cpu.halted:
+            executed += cpu.step_block()
+        actual = (cpu.pc, list(cpu.Rregisters), list(cpu.Pregisters),
+                  list(cpu.flags), cpu.memory.read_word(0x2000))
+
+        assert actual == expected
+        assert executed == 2 + 10 * 6 + 2
+        assert cpu.memory.read_word(0x2000) == 45
+
+    def test_block_translated_and_cached(self, cpu):
+        """Test that a block is translated once it has been interpreted."""
+        self._load(cpu, self.LOOP_PROGRAM)
+        # First pass interprets MOV, MOV and the first loop iteration
+        assert cpu.step_block() == 8
+        assert 0x0008 not in cpu.block_cache
+
+        assert cpu.step_block() == 6
+        assert 0x0008 in cpu.block_cache
+        assert_register_equals(cpu, 'R0', 2)
+        assert cpu.pc == 0x0008
+
+    def test_self_modifying_code_invalidates_block(self, cpu):
+        """Test that writing over translated code drops the block."""
+        # MOV R0, 5; HLT
+        self._load(cpu, [0x06, 0x04, 0xE7, 0x05, 0x00])
+        cpu.step_block()
+        cpu.halted = False
+        cpu.pc = 0x0000
+        cpu.step_block()
+        assert 0x0000 in cpu.block_cache
+        assert_register_equals(cpu, 'R0', 5)
+
+        cpu.memory.write_byte(0x0003, 0x07)
+        assert 0x0000 not in cpu.block_cache
+
+        cpu.halted = False
+        cpu.pc = 0x0000
+        while not cpu.halted:
+            cpu.step_block()
+        assert_register_equals(cpu, 'R0', 7)
+
+    def test_block_stops_after_code_write(self, cpu):
+        """Test that a block patching its own code hands control back early."""
+        # MOV [0x0007], P1; MOV R0, 5; HLT  (the store rewrites the MOV operands)
+        program = [0x06, 0x83, 0x00, 0x07, 0xF2, 0x06, 0x04, 0xE7, 0x05, 0x00]
+        self._load(cpu, program)
+        cpu.Pregisters[1] = 0xE705
+        while not cpu.halted:
+            cpu.step_block()
+        assert_register_equals(cpu, 'R0', 5)
+
+        cpu.halted = False
+        cpu.pc = 0x0000
+        cpu.Pregisters[1] = 0xE709
+        while not cpu.halted:
+            cpu.step_block()
+        assert_register_equals(cpu, 'R0', 9)
+
+
+class TestCPURun:
+    """Test the batched CPU.run() loop and its exit reasons."""
+
+    def _load(self, cpu, program):
+        for i, byte in enumerate(program):
+            cpu.memory.write_byte(i, byte)
+
+    @pytest.mark.parametrize("translate", [True, False])
+    def test_run_until_halt(self, cpu, translate):
+        """Test that run() stops on HLT and reports the instruction count."""
+        self._load(cpu, TestCPUBlockTranslator.LOOP_PROGRAM)
+        result = cpu.run(10000, translate=translate)
+        assert result.reason == RunResult.HALTED
+        assert result.cycles == 2 + 10 * 6 + 2
+        assert cpu.memory.read_word(0x2000) == 45
+
+    @pytest.mark.parametrize("translate", [True, False])
+    def test_run_cycle_budget(self, cpu, translate):
+        """Test that run() never exceeds its cycle budget."""
+        self._load(cpu, TestCPUBlockTranslator.LOOP_PROGRAM)
+        result = cpu.run(20, translate=translate)
+        assert result.reason == RunResult.CYCLE_BUDGET
+        assert result.cycles == 20
+        assert not cpu.halted
+
+    def test_run_breakpoint(self, cpu):
+        """Test that run() stops before executing a breakpoint address."""
+        self._load(cpu, TestCPUBlockTranslator.LOOP_PROGRAM)
+        result = cpu.run(10000, stop_on={0x001F})
+        assert result.reason == RunResult.BREAKPOINT
+        assert result.pc == 0x001F
+        assert cpu.pc == 0x001F
+        assert_register_equals(cpu, 'R0', 10)
+
+    @pytest.mark.parametrize("translate", [True, False])
+    def test_run_infinite_loop(self, cpu, translate):
+        """Test that run() detects a jump to itself when asked to."""
+        # JMP 0x0000
+        self._load(cpu, [0x1E, 0x02, 0x00, 0x00])
+        result = cpu.run(1000, detect_loops=True, translate=translate)
+        assert result.reason == RunResult.INFINITE_LOOP
+        assert result.pc == 0x0000
+
+        result = cpu.run(1000, translate=translate)
+        assert result.reason == RunResult.CYCLE_BUDGET
+
+    def test_run_exception(self, cpu):
+        """Test that run() reports an exception instead of raising it."""
+        self._load(cpu, [0xFF, 0xB7])  # NOP, invalid opcode
+        result = cpu.run(1000)
+        assert result.reason == RunResult.EXCEPTION
+        assert "Unknown opcode" in str(result.error)
+
+    def test_run_fast_forwards_key_polling_loop(self, cpu):
+        """Test that a KEYSTAT polling loop is skipped to the end of the budget."""
+        # LOOP: KEYSTAT R0; CMP R0, 0; JZ LOOP; HLT
+        self._load(cpu, [0x44, 0x00, 0xE7, 0x2E, 0x04, 0xE7, 0x00,
+                         0x1F, 0x02, 0x00, 0x00, 0x00])
+        start = cpu.cycle_count
+        result = cpu.run(100000)
+        assert result.reason == RunResult.CYCLE_BUDGET
+        assert result.cycles == 100000
+        assert result.idle_cycles > 99000
+        assert cpu.cycle_count - start == 100000
+        assert cpu.pc < 0x000B  # Still polling
+
+        cpu.add_key_to_buffer(65)
+        result = cpu.run(100)
+        assert result.reason == RunResult.HALTED
+        assert result.idle_cycles == 0
+        assert_register_equals(cpu, 'R0', 1)
+
+    def test_run_timer_polling_loop_matches_interpreter(self, cpu):
+        """Test that fast-forwarding a TT polling loop keeps exact cycle timing."""
+        # LOOP: MOV R0, TT; CMP R0, 200; JNZ LOOP; HLT
+        program = [0x06, 0x00, 0xE7, 0xE3, 0x2E, 0x04, 0xE7, 0xC8,
+                   0x20, 0x02, 0x00, 0x00, 0x00]
+
+        def load():
+            cpu.reinit()
+            self._load(cpu, program)
+            cpu.timer[3] = 9  # TS: increment every 10 cycles
+            cpu.set_timer_control(1)
+            return cpu.cycle_count
+
+        start = load()
+        while not cpu.halted:
+            cpu.step()
+        expected = cpu.cycle_count - start
+
+        start = load()
+        result = cpu.run(100000)
+        assert result.reason == RunResult.HALTED
+        assert result.idle_cycles > 0
+        assert cpu.cycle_count - start == expected
+        assert_register_equals(cpu, 'R0', 200)
+
+
 class TestCPUErrorHandling:
     """Aggressive error handling and edge case testing for CPU."""
 
@@ -362,9 +733,22 @@ class TestCPUErrorHandling:
             cpu.halted = False
 
             # Should raise exception for unknown opcode
-            with pytest.raises(Exception, match="Unknown opcode"):
+            with pytest.raises(Exception, match=f"Unknown opcode: {opcode:02X}"):
                 cpu.step()
 
+    def test_dispatch_table(self, cpu):
+        """Test the 256-entry dispatch table and mode byte table."""
+        assert len(cpu.dispatch_table) == 256
+        assert len(cpu.has_mode_byte) == 256
+        for opcode in (0x00, 0x01, 0x02, 0x03, 0x1A, 0x3B, 0xFF):
+            assert cpu.has_mode_byte[opcode] == 0
+        assert cpu.has_mode_byte[0x06] == 1  # MOV
+        assert cpu.dispatch_table[0x06].__self__ is cpu.instruction_table[0x06]
+        # Unassigned opcodes share the trap handler and take no mode byte
+        assert cpu.dispatch_table[0x9D].__self__.name == "???"
+        assert cpu.dispatch_table[0x9D].__self__ is cpu.dispatch_table[0xB7].__self__
+        assert cpu.has_mode_byte[0x9D] == 0
+
     def test_register_bounds(self, cpu):
         """Test register access bounds."""
         # Valid register access
@@ -775,6 +1159,59 @@ class TestCPUTimer:
         assert cpu.timer[0] > 0  # Should have incremented
 
 
+    def test_timer_interrupt_exact_cycle(self, cpu):
+        """Test that the timer interrupt is taken on the exact cycle."""
+        cpu.memory.write_word(0x0100, 0x2000)
+        for address in range(0x0000, 0x0010):
+            cpu.memory.write_byte(address, 0xFF)  # NOP
+        cpu.memory.write_byte(0x2000, 0xFF)
+        cpu.timer[1] = 5   # TM
+        cpu.timer[3] = 1   # TS: increment every 2 cycles
+        cpu.set_timer_control(3)
+        cpu.flags[5] = 1
+
+        for _ in range(9):
+            cpu.step()
+        assert cpu.pc == 0x0009
+        assert cpu.get_timer_status()['counter'] == 4
+
+        cpu.step()
+        assert cpu.pc == 0x2001  # Interrupt taken before the tenth instruction
+        assert cpu.timer[0] == 0
+
+    def test_timer_interrupt_same_in_block_engine(self, cpu):
+        """Test that translated blocks take timer interrupts on the same cycles as step()."""
+        def load():
+            cpu.reinit()
+            for i, byte in enumerate(TestCPUBlockTranslator.LOOP_PROGRAM):
+                cpu.memory.write_byte(i, byte)
+            cpu.memory.write_word(0x0100, 0x3000)
+            cpu.memory.write_byte(0x3000, 0x0B)  # INC P2
+            cpu.memory.write_byte(0x3001, 0x00)
+            cpu.memory.write_byte(0x3002, 0xF3)
+            cpu.memory.write_byte(0x3003, 0x02)  # IRET
+            cpu.timer[1] = 7
+            cpu.set_timer_control(3)
+            cpu.flags[5] = 1
+
+        load()
+        start = cpu.cycle_count
+        while not cpu.halted:
+            cpu.step()
+        expected = (list(cpu.Rregisters), list(cpu.Pregisters), list(cpu.flags),
+                    cpu.memory.read_word(0x2000), cpu.cycle_count - start)
+
+        load()
+        start = cpu.cycle_count
+        result = cpu.run(1000)
+        actual = (list(cpu.Rregisters), list(cpu.Pregisters), list(cpu.flags),
+                  cpu.memory.read_word(0x2000), cpu.cycle_count - start)
+
+        assert result.reason == RunResult.HALTED
+        assert actual == expected
+        assert cpu.Pregisters[2] > 0  # Timer handler ran
+
+
 class TestCPUGraphicsInstructions:
     """Test graphics instructions (SWRITE, SREAD, etc.)"""
 
@@ -1040,6 +1477,54 @@ class TestCPUGraphicsInstructions:
 
         # Screen flipping is implementation dependent
 
+    def test_cpu_store_redraws_only_moved_sprite(self, cpu):
+        """Test that a control-block store from code repaints just that sprite's old and new boxes."""
+        cpu.memory.write_block(0x1000, bytes([7] * 4))
+        for sprite_id, x in ((0, 30), (1, 100)):
+            cpu.memory.write_block(0xF000 + sprite_id * 16, bytes([0x10, 0x00, x, 30, 2, 2, 0x01, 0]))
+        cpu.gfx.get_screen()
+        cpu.gfx.layers[5, 200, 200] = 9  # Outside every sprite box: a full redraw would clear it
+
+        # MOV P1, 0x3C1E; MOV [0xF002], P1; HLT  (sprite 0 moves to x=60, y=30)
+        cpu.memory.write_block(0x2000, bytes([0x06, 0x08, 0xF2, 0x3C, 0x1E, 0x06, 0x83, 0xF0, 0x02, 0xF2, 0x00]))
+        cpu.pc = 0x2000
+        cpu.run(100)
+        assert cpu.gfx.dirty_sprites == {0}
+        redraws = []
+        cpu.gfx._draw_sprite = lambda sprite, *box, draw=cpu.gfx._draw_sprite: (redraws.append(box), draw(sprite, *box))
+
+        screen = cpu.gfx.get_screen()
+        assert set(redraws) == {(30, 32, 30, 32), (30, 32, 60, 62)}  # Only the old and new boxes
+        assert cpu.gfx.layers[5, 30, 30] == 0 and cpu.gfx.layers[5, 30, 60] == 7
+        assert screen[30, 60] == 7 and screen[30, 100] == 7
+        assert cpu.gfx.layers[5, 200, 200] == 9
+        assert not cpu.gfx.dirty_sprites
+
+    def test_reinit_forgets_drawn_sprites(self, cpu):
+        """Test that a reset does not leave sprites drawn from the old memory."""
+        cpu.memory.gfx_system = cpu.gfx
+        cpu.memory.write_byte(0x1000, 7)
+        cpu.memory.write_block(0xF000, bytes([0x10, 0x00, 40, 50, 1, 1, 0x01, 0]))
+        cpu.gfx.blit_all_sprites(cpu.memory)
+        assert cpu.gfx.get_screen()[50, 40] == 7
+
+        cpu.reinit()
+        cpu.gfx.blit_all_sprites(cpu.memory)
+        assert cpu.gfx.layers[5, 50, 40] == 0
+        assert cpu.gfx.get_screen()[50, 40] == 0
+
+    def test_reinit_disables_tilemaps(self, cpu):
+        """Test that a reset re-reads the zeroed tilemap control blocks."""
+        cpu.memory.gfx_system = cpu.gfx
+        cpu.memory.write_block(0x4000, bytes([5] * 64))
+        cpu.memory.write_block(0xF100, bytes([0x01, 0x30, 0x00, 0x40, 0x00]))
+        cpu.gfx.get_screen()
+        assert list(cpu.gfx.tilemaps) == [1]
+
+        cpu.reinit()
+        assert not cpu.gfx.tilemaps
+        assert cpu.memory.page_hooks[0x30] is None and cpu.memory.page_hooks[0x40] is None
+
 
 class TestCPUSoundInstructions:
     """Test sound instructions (SPLAY, SSTOP, STRIG)"""
@@ -1426,6 +1911,53 @@ class TestCPUMemoryOperations:
             expected = i % 256
             assert cpu.memory.read_byte(dest_addr + i) == expected
 
+    def test_memcpy_wraps_at_end_of_memory(self, cpu):
+        """Test MEMCPY source and destination wrapping past 0xFFFF."""
+        data = [0xA1, 0xA2, 0xA3, 0xA4]
+        for i, byte in enumerate(data):
+            cpu.memory.write_byte((0xFFFE + i) & 0xFFFF, byte)
+
+        cpu.memory.write_byte(0x0100, 0x4A)  # MEMCPY
+        cpu.memory.write_byte(0x0101, 0x2A)  # Mode: imm16 + imm16 + imm16
+        cpu.memory.write_word(0x0102, 0x3000)
+        cpu.memory.write_word(0x0104, 0xFFFE)
+        cpu.memory.write_word(0x0106, 0x0004)
+        cpu.memory.write_byte(0x0108, 0x7C)  # MEMSET
+        cpu.memory.write_byte(0x0109, 0x26)  # Mode: imm16 + imm8 + imm16
+        cpu.memory.write_word(0x010A, 0xFFFF)
+        cpu.memory.write_byte(0x010C, 0x5A)
+        cpu.memory.write_word(0x010D, 0x0002)
+        cpu.memory.write_byte(0x010F, 0x00)  # HLT
+
+        cpu.pc = 0x0100
+        while not cpu.halted:
+            cpu.step()
+
+        assert cpu.memory.read_bytes_direct(0x3000, 4) == data
+        assert cpu.memory.read_byte(0xFFFF) == 0x5A
+        assert cpu.memory.read_byte(0x0000) == 0x5A
+        assert cpu.memory.read_byte(0x0001) == 0xA4
+
+    def test_memcpy_forward_overlap_repeats_pattern(self, cpu):
+        """Test MEMCPY into a destination starting inside the source keeps byte-copy semantics."""
+        base_addr = 0x1000
+        for i, byte in enumerate([0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08]):
+            cpu.memory.write_byte(base_addr + i, byte)
+
+        cpu.memory.write_byte(0x0000, 0x4A)  # MEMCPY
+        cpu.memory.write_byte(0x0001, 0x2A)  # Mode: imm16 + imm16 + imm16
+        cpu.memory.write_word(0x0002, base_addr + 2)  # Destination (overlaps)
+        cpu.memory.write_word(0x0004, base_addr)      # Source
+        cpu.memory.write_word(0x0006, 0x0006)
+        cpu.memory.write_byte(0x0008, 0x00)  # HLT
+
+        cpu.pc = 0
+        while not cpu.halted:
+            cpu.step()
+
+        expected = [0x01, 0x02, 0x01, 0x02, 0x01, 0x02, 0x01, 0x02]
+        assert cpu.memory.read_bytes_direct(base_addr, 8) == expected
+
     def test_memory_operation_bounds_checking(self, cpu):
         """Test memory operations with boundary conditions."""
         # Test MEMCPY near end of memory
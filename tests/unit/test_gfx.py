@@ -115,6 +115,28 @@ class TestGraphicsBlending:
         expected = min(255, (200 * 100 * 0.5) / 255)  # (20000 * 0.5) / 255 ≈ 39
         assert result == int(expected)
 
+    def test_blend_tables_cached_per_mode(self, graphics):
+        """Test that blend tables are shared and follow mode/alpha changes."""
+        from nova_gfx import blend_table
+        graphics.set_blend_mode(4, alpha=200)
+        assert graphics.blend_lut is blend_table(4, 200)
+        assert graphics.blend_pixel(40, 90) == graphics.blend_lut[40, 90]
+        graphics.blend_mode = 0
+        assert graphics.blend_lut is None
+        assert graphics.blend_pixel(40, 90) == 90
+
+    def test_region_fill_blends(self, graphics):
+        """Test that rectangle fills and lines go through the blend table."""
+        graphics.VL = 1
+        graphics.draw_rectangle(0, 0, 9, 9, 100)
+        graphics.set_blend_mode(1)  # Additive, full alpha
+        graphics.draw_rectangle(5, 0, 14, 9, 100)
+        graphics.draw_line(0, 20, 9, 20, 30)
+        assert graphics.layers[1, 0, 0] == 100
+        assert graphics.layers[1, 0, 5] == 200
+        assert graphics.layers[1, 0, 12] == 100
+        assert graphics.layers[1, 20, 9] == 30
+
 
 class TestGraphicsLayers:
     """Test graphics layer operations."""
@@ -140,6 +162,150 @@ class TestGraphicsLayers:
         assert graphics.VL == 5
 
 
+class TestGraphicsDirtyTiles:
+    """Test dirty-tile tracking and incremental compositing."""
+
+    def test_writes_mark_touched_tiles(self, graphics):
+        """Test that drawing marks only the tiles it touched."""
+        graphics.VL = 2
+        graphics.draw_rectangle(20, 40, 35, 44, 9)
+        assert graphics.layers_dirty
+        dirty = np.argwhere(graphics.dirty_tiles[2])
+        assert sorted(map(tuple, dirty)) == [(2, 1), (2, 2)]
+        assert not graphics.dirty_tiles[1].any()
+
+        graphics.get_screen()
+        assert not graphics.dirty_tiles.any()
+        assert not graphics.layers_dirty
+
+    def test_incremental_composite_matches_full(self, graphics):
+        """Test that recompositing dirty tiles gives the full-frame result."""
+        graphics.VL = 1
+        graphics.fill_layer(3)
+        graphics.get_screen()
+
+        graphics.VL = 5
+        graphics.draw_rectangle(100, 100, 110, 104, 7)
+        graphics.VL = 0
+        graphics.Vregisters[0] = 200
+        graphics.Vregisters[1] = 10
+        graphics.set_screen_val(42)
+        incremental = graphics.get_screen().copy()
+
+        graphics.composite_layers()
+        assert np.array_equal(incremental, graphics.screen)
+        assert incremental[102, 105] == 7
+        assert incremental[0, 0] == 3
+
+
+class TestGraphicsLayerStack:
+    """Test the contiguous layer stack and whole-layer operations."""
+
+    def test_layers_share_one_array(self, graphics):
+        """Test that the screen and layer lists are views of the stack."""
+        assert graphics.layers.shape == (9, 256, 256)
+        assert np.shares_memory(graphics.screen, graphics.layers)
+        graphics.VL = 3
+        graphics.flip_x()
+        graphics.rotate_l(1)
+        assert graphics.background_layers[2].base is graphics.layers
+        graphics.background_layers[2][5, 6] = 11
+        assert graphics.layers[3, 5, 6] == 11
+
+    def test_swap_copy_move_layers(self, graphics):
+        """Test swapping, copying and moving layer contents."""
+        graphics.fill_layer(1, 1)
+        graphics.fill_layer(2, 6)
+        graphics.swap_layers(1, 6)
+        assert np.all(graphics.layers[1] == 2) and np.all(graphics.layers[6] == 1)
+
+        graphics.copy_layer(6, 7)
+        assert np.all(graphics.layers[7] == 1) and np.all(graphics.layers[6] == 1)
+
+        graphics.move_layer(7, 8)
+        assert np.all(graphics.layers[8] == 1) and not graphics.layers[7].any()
+        assert graphics.get_screen()[0, 0] == 1
+
+
+class TestGraphicsScrollRegisters:
+    """Test per-layer scroll registers applied at composite time."""
+
+    def test_roll_moves_registers_not_pixels(self, graphics):
+        """Test that rolling a layer leaves its buffer untouched until drawn to."""
+        graphics.VL = 2
+        graphics.draw_rectangle(0, 0, 3, 3, 9)
+        before = graphics.layers[2].copy()
+        graphics.roll_x(-2)
+        graphics.roll_y(5)
+        assert np.array_equal(graphics.layers[2], before)
+        assert graphics.scroll_x[2] == 254 and graphics.scroll_y[2] == 5
+
+        expected = np.roll(before, (5, -2), axis=(0, 1))
+        assert np.array_equal(graphics.get_screen(), expected)
+
+        graphics.Vregisters[0] = 100
+        graphics.Vregisters[1] = 100
+        graphics.set_screen_val(4)
+        assert not graphics.scroll_pending
+        expected[100, 100] = 4
+        assert np.array_equal(graphics.layers[2], expected)
+        assert np.array_equal(graphics.get_screen(), expected)
+
+    def test_shift_clears_scrolled_in_band(self, graphics):
+        """Test that shifting with registers matches a physical shift."""
+        graphics.fill_layer(6, 1)
+        graphics.shift_layer_x(3, 1)
+        graphics.shift_layer_y(-2, 1)
+        screen = graphics.get_screen()
+        assert not screen[:, :3].any() and not screen[-2:, :].any()
+        assert np.all(screen[:-2, 3:] == 6)
+
+        graphics.settle_scroll()
+        assert np.array_equal(graphics.layers[1], screen)
+
+
+class TestGraphicsPalette:
+    """Test the cached palette lookup table."""
+
+    def test_palette_lut_tracks_palette(self, graphics):
+        """Test that the RGB table follows palette changes and bumps the version."""
+        graphics.set_color_palette()
+        lut = graphics.get_palette_lut()
+        assert lut.shape == (256, 3) and lut.dtype == np.uint8
+        assert tuple(lut[0x1F]) == graphics.get_color(0x1F) == (255, 0, 0)
+
+        version = graphics.palette_version
+        graphics.set_color(0x1F, (1, 2, 3))
+        assert graphics.get_palette_lut() is lut
+        assert tuple(lut[0x1F]) == (1, 2, 3)
+        assert graphics.palette_version == version + 1
+
+        graphics.set_color_palette([(9, 9, 9)] * 256)
+        assert np.all(graphics.get_palette_lut() == 9)
+        assert graphics.palette_version == version + 2
+
+    def test_frame_buffer_skips_unchanged_frames(self, graphics):
+        """Test that only frames with new pixels or a new palette are published."""
+        nova_gui = pytest.importorskip("nova_gui")
+        graphics.set_color_palette()
+        frame_buffer = nova_gui.FrameBuffer(graphics)
+        frame_buffer.publish(graphics.get_screen())
+        sequence = frame_buffer.sequence
+        frame_buffer.publish(graphics.get_screen())
+        assert frame_buffer.sequence == sequence
+
+        graphics.clear()  # Layer 0 changes in place without recompositing
+        frame_buffer.publish(graphics.get_screen())
+        assert frame_buffer.sequence == sequence + 1
+
+        graphics.draw_rectangle(10, 10, 20, 20, 5, filled=True)
+        frame_buffer.publish(graphics.get_screen())
+        graphics.set_color(5, (1, 2, 3))
+        frame_buffer.publish(graphics.get_screen())
+        frame_buffer.publish(graphics.get_screen())
+        assert frame_buffer.sequence == sequence + 3
+
+
 class TestGraphicsClear:
     """Test graphics clear operations."""
 
@@ -280,6 +446,106 @@ class TestGraphicsSprites:
         assert graphics.screen[21, 10] == 200
         assert graphics.screen[21, 11] == 250
 
+    def test_moving_sprite_redraws_only_its_boxes(self, graphics, memory):
+        """Test that blit_all_sprites repaints just the old and new boxes of a moved sprite."""
+        memory.gfx_system = graphics
+        for sprite_id, x in ((0, 10), (1, 100)):
+            block = 0xF000 + sprite_id * 16
+            memory.write_block(block, bytes([0x10, 0x00, x, 20, 2, 2, 0x01, 0]))
+        memory.write_block(0x1000, bytes([100, 150, 200, 250]))
+        graphics.blit_all_sprites(memory)
+        assert graphics.layers[5, 20, 100] == 100
+        bitmap = graphics.sprite_bitmaps[(0x1000, 2, 2)]
+
+        graphics.dirty_tiles[:] = False
+        memory.write_byte(0xF002, 40)  # Move sprite 0
+        assert graphics.dirty_sprites == {0}
+        graphics.blit_all_sprites(memory)
+        assert graphics.layers[5, 20, 10] == 0
+        assert graphics.layers[5, 21, 41] == 250
+        assert sorted(map(tuple, np.argwhere(graphics.dirty_tiles[5]))) == [(1, 0), (1, 2)]
+        assert graphics.sprite_bitmaps[(0x1000, 2, 2)] is bitmap
+
+        memory.write_byte(0x1003, 7)  # Sprite data changed: both users repaint
+        assert graphics.dirty_sprites == {0, 1}
+        graphics.blit_all_sprites(memory)
+        assert graphics.layers[5, 21, 41] == 7 and graphics.layers[5, 21, 101] == 7
+
+    def test_sprite_bitmap_cache_unhooks_and_caps(self, graphics, memory):
+        """Test that dropped bitmaps release their pages and the cache keeps drawn sprites."""
+        hook = graphics._sprite_data_write_hook
+        memory.write_block(0xF000, bytes([0x10, 0x00, 10, 20, 2, 2, 0x01, 0]))
+        graphics.blit_all_sprites(memory)
+        assert hook in memory.page_hooks[0x10]
+
+        memory.write_byte(0x1000, 5)  # Bitmap dropped: nothing reads page 0x10 any more
+        assert (0x1000, 2, 2) not in graphics.sprite_bitmaps
+        assert memory.page_hooks[0x10] is None
+
+        graphics.sprite_bitmap_capacity = 2
+        for data_addr in (0x1000, 0x2000, 0x3000, 0x1000):
+            memory.write_word(0xF000, data_addr)
+            graphics.blit_all_sprites(memory)
+        assert list(graphics.sprite_bitmaps) == [(0x3000, 2, 2), (0x1000, 2, 2)]
+        assert memory.page_hooks[0x20] is None and hook in memory.page_hooks[0x10]
+
+        graphics.sprite_bitmap_capacity = 0  # The bitmap on screen is still kept
+        graphics.blit_all_sprites(memory)
+        assert list(graphics.sprite_bitmaps) == [(0x1000, 2, 2)]
+
+    def test_collision_registers(self, graphics, memory):
+        """Test box and pixel collision masks, respecting transparency."""
+        memory.write_block(0x1000, bytes([9, 0, 0, 9]))  # Diagonal 2x2 sprite, 0 transparent
+        for sprite_id, x in ((0, 10), (1, 11), (2, 50)):
+            block = 0xF000 + sprite_id * 16
+            memory.write_block(block, bytes([0x10, 0x00, x, 20, 2, 2, 0x03, 0]))
+        graphics.blit_all_sprites(memory)
+
+        # Sprites 0 and 1 share a column, but only transparent pixels meet there
+        assert graphics.sprite_box_collisions[:3] == [0b10, 0b01, 0]
+        assert graphics.sprite_collisions[:3] == [0, 0, 0]
+
+        memory.write_byte(0xF013, 21)  # Sprite 1 down a row: (11, 21) is opaque in both
+        graphics.blit_all_sprites(memory)
+        assert graphics.sprite_collisions[:3] == [0b10, 0b01, 0]
+        assert memory.read_word(0xF008) == 0b10 and memory.read_word(0xF01A) == 0b01
+
+    def test_collision_registers_run_write_hooks(self, graphics, memory):
+        """Test that mirroring collisions runs the other hooks on the control block page."""
+        memory.write_block(0x1000, bytes([9] * 4))
+        for sprite_id, x in ((0, 10), (1, 11)):
+            memory.write_block(0xF000 + sprite_id * 16, bytes([0x10, 0x00, x, 20, 2, 2, 0x03, 0]))
+        memory.gfx_system = graphics
+        writes, marked = [], []
+        memory.add_write_hook(lambda address, length: writes.append((address, length)), 0xF008, 0xF00B)
+        graphics.mark_sprites_dirty = lambda address, length: marked.append(address)
+
+        graphics.blit_all_sprites(memory)
+        assert (0xF008, 4) in writes and (0xF018, 4) in writes
+        assert marked == []  # The sprite control hook was skipped
+
+    def test_tilemap_layer(self, graphics, memory):
+        """Test that an enabled tilemap gathers patterns and tracks map writes."""
+        memory.gfx_system = graphics
+        memory.write_block(0x4000, bytes([0]) * 64 + bytes(range(64)))  # Pattern 0 blank, pattern 1 a ramp
+        memory.write_byte(0x3000 + 2 * 32 + 3, 1)  # Map cell (row 2, column 3) uses pattern 1
+        memory.write_block(0xF108, bytes([0x01, 0x30, 0x00, 0x40, 0x00]))  # Tilemap on layer 2
+
+        graphics.get_screen()
+        expected = np.arange(64, dtype=np.uint8).reshape(8, 8)
+        assert np.array_equal(graphics.layers[2][16:24, 24:32], expected)
+        assert np.count_nonzero(graphics.layers[2]) == 63
+
+        memory.write_byte(0x3000 + 2 * 32 + 3, 0)
+        memory.write_byte(0x3000, 1)
+        graphics.get_screen()
+        assert not np.any(graphics.layers[2][16:24, 24:32])
+        assert np.array_equal(graphics.layers[2][0:8, 0:8], expected)
+
+        memory.write_byte(0xF108, 0x00)
+        assert not graphics.tilemaps
+        assert memory.page_hooks[0x30] is None
+
 
 class TestGraphicsText:
     """Test text rendering operations."""
@@ -302,6 +568,28 @@ class TestGraphicsText:
         # Should have drawn something
         assert np.any(graphics.screen != 0)
 
+    def test_draw_string_uses_glyph_atlas(self, graphics):
+        """Test that strings render atlas cells with background and clipping."""
+        from nova_gfx import GLYPH_MASKS
+        graphics.VL = 1
+        graphics.draw_string("A!", 250, 4, 9, background=2)
+        expected = np.where(GLYPH_MASKS[ord('A') - 32], 9, 2)
+        assert np.array_equal(graphics.layers[1, 4:12, 250:256], expected[:, :6])
+        assert graphics.layers[1, 12, 0] == 0  # '!' wrapped to the next line
+        assert graphics.dirty_tiles[1, 0, 15]
+
+    def test_draw_text_from_memory(self, graphics, memory):
+        """Test drawing a NUL-terminated string read from memory."""
+        memory.write_block(0x2000, b"Hi\x00X")
+        graphics.VL = 0
+        graphics.draw_text(0, 0, 0x2000, 7, memory)
+        reference = graphics.screen.copy()
+
+        graphics.clear()
+        graphics.draw_string("Hi", 0, 0, 7)
+        assert np.array_equal(graphics.screen, reference)
+        assert np.any(reference)
+
 
 class TestGraphicsFill:
     """Test fill operations."""
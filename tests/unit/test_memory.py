@@ -19,6 +19,16 @@ class TestMemoryInitialization:
         """Test that memory is initialized to zeros."""
         assert np.all(memory.memory == 0)
 
+    def test_numpy_view_shares_buffer(self, memory):
+        """Test that memory.memory is a view over the bytearray backing store."""
+        assert isinstance(memory.data, bytearray)
+        assert memory.memory.dtype == np.uint8
+        memory.write_byte(0x1234, 0x5A)
+        assert memory.memory[0x1234] == 0x5A
+        memory.memory[0x2000:0x2004] = [1, 2, 3, 4]
+        assert memory.read_word(0x2002) == 0x0304
+        assert memory.data[0x2000:0x2004] == bytearray([1, 2, 3, 4])
+
     def test_timer_initialization(self, memory):
         """Test timer initialization."""
         assert memory.timer == 0
@@ -144,6 +154,60 @@ class TestMemorySpriteIntegration:
         assert graphics.sprites_dirty == False
 
 
+class TestMemoryWriteHooks:
+    """Test the per-page write hook table."""
+
+    def test_plain_ram_pages_have_no_hooks(self, memory):
+        """Test that only the sprite and tilemap control pages carry hooks on a fresh memory."""
+        assert len(memory.page_hooks) == 256
+        hooked = [page for page, hooks in enumerate(memory.page_hooks) if hooks is not None]
+        assert hooked == [0xF0, 0xF1]
+
+    def test_hook_receives_writes_on_its_pages(self, memory):
+        """Test that byte, word and multi-byte writes reach a registered hook."""
+        writes = []
+        hook = lambda address, length: writes.append((address, length))
+        memory.add_write_hook(hook, 0x3000, 0x30FF)
+
+        memory.write_byte(0x3010, 1)
+        memory.write_word(0x3020, 0x1234)
+        memory.write(0x3030, 0x11223344, bytes=4)
+        memory.write_byte(0x3100, 1)
+        assert writes == [(0x3010, 1), (0x3020, 2), (0x3030, 4)]
+
+        memory.remove_write_hook(hook, 0x3000, 0x30FF)
+        memory.write_byte(0x3010, 2)
+        assert len(writes) == 3
+        assert memory.page_hooks[0x30] is None
+
+    def test_word_write_across_page_boundary(self, memory):
+        """Test that a word ending a page runs the next page's hooks."""
+        writes = []
+        memory.add_write_hook(lambda address, length: writes.append((address, length)), 0x4100, 0x41FF)
+        memory.write_word(0x40FF, 0xABCD)
+        assert writes == [(0x4100, 1)]
+        assert memory.read_word(0x40FF) == 0xABCD
+
+
+class TestMemoryBulkAccess:
+    """Test wrapping block and string access."""
+
+    def test_block_round_trip_wraps(self, memory):
+        """Test that block writes and reads wrap at the end of memory."""
+        memory.write_block(0xFFFD, b'\x01\x02\x03\x04\x05')
+        assert memory.read_byte(0xFFFF) == 0x03
+        assert memory.read_byte(0x0001) == 0x05
+        assert memory.read_block(0xFFFD, 5) == b'\x01\x02\x03\x04\x05'
+
+    def test_read_string_stops_at_terminator(self, memory):
+        """Test NUL-terminated string scans, including across 0xFFFF."""
+        memory.write_block(0x2000, b'Nova\x00-16')
+        assert memory.read_string(0x2000) == b'Nova'
+        assert memory.read_string(0x2000, 2) == b'No'
+        memory.write_block(0xFFFE, b'ABC\x00')
+        assert memory.read_string(0xFFFE) == b'ABC'
+
+
 class TestMemoryDump:
     """Test memory dump functionality."""
 
@@ -2,8 +2,12 @@
 Unit tests for nova_sound.py - Nova-16 sound system.
 """
 
+import wave
+
 import pytest
 import numpy as np
+from nova_cpu import CPU
+from nova_sound import NovaSound, NullAudioBackend, OfflineAudioBackend, pink_filter, NOTE_OFF, CPU_CLOCK_HZ
 
 
 class TestSoundInitialization:
@@ -107,6 +111,26 @@ class TestSoundWaveformGeneration:
             assert isinstance(sample, np.ndarray)
             assert len(sample) > 0
 
+    def test_pink_filter_matches_recursive_definition(self):
+        """Test that the vectorized pink noise filter equals the per-sample recursion."""
+        white = np.random.default_rng(7).uniform(-1.0, 1.0, 1000)
+        expected = np.empty_like(white)
+        state = 0.25
+        for i, sample in enumerate(white):
+            state = 0.99 * state + 0.01 * sample
+            expected[i] = state
+        pink, last = pink_filter(white, 0.25)
+        assert np.allclose(pink, expected, atol=1e-12)
+        assert last == pytest.approx(expected[-1])
+
+    def test_effects_are_rendered_once(self, sound_system):
+        """Test that STRIG replays effect buffers from the bank."""
+        assert sound_system.strig(3) == True
+        explosion = sound_system.effect_bank[3]
+        assert sound_system.strig(3) == True
+        assert sound_system.effect_bank[3] is explosion
+        assert sound_system.effect_voices[0][0] is explosion and sound_system.effect_voices[1][0] is explosion
+
     def test_frequency_conversion(self, sound_system):
         """Test frequency register conversion."""
         freq = sound_system._register_to_frequency(128)  # Around middle C area
@@ -118,6 +142,98 @@ class TestSoundWaveformGeneration:
         assert note == 69  # A4 is MIDI note 69
 
 
+class TestSoundMixer:
+    """Test the block-based software mixer."""
+
+    def test_channel_renders_continuous_blocks(self, sound_system):
+        """Test that a looping channel renders its waveform seamlessly across blocks."""
+        sound_system.update_registers(sf=128, sv=255, sw=0xC2)  # Looping sine, channel 0
+        sound_system.splay()
+        first = sound_system.mix_block().copy()
+        second = sound_system.mix_block().copy()
+
+        expected = sound_system._generate_waveform_sample(
+            2, sound_system._register_to_frequency(128), 2 * sound_system.block_size / sound_system.sample_rate)
+        assert np.allclose(np.concatenate([first, second]), expected, atol=1e-4)
+
+        sound_system.sstop(0)
+        assert not np.any(sound_system.mix_block())
+
+    def test_one_shot_and_effects_finish(self, sound_system):
+        """Test that one-shot channels and effect buffers stop after their length."""
+        sound_system.update_registers(sf=100, sv=128, sw=0x81)
+        sound_system.splay()
+        sound_system.strig(0)
+        assert len(sound_system.effect_voices) == 1
+
+        blocks = int(sound_system.sample_rate * 0.5) // sound_system.block_size + 1
+        for _ in range(blocks):
+            sound_system.mix_block()
+        assert not sound_system.get_channel_status(0)['playing']
+        assert sound_system.effect_voices == []
+        assert not np.any(sound_system.mix_block())
+
+    def test_render_block_is_int16_stereo(self, sound_system):
+        """Test that rendered blocks are clipped int16 stereo frames."""
+        for channel in range(4):
+            sound_system.update_registers(sf=200, sv=255, sw=0xC1 | (channel << 3))  # Looping squares
+            sound_system.splay()
+        block = sound_system.render_block()
+        assert block.dtype == np.int16 and block.shape == (sound_system.block_size, 2)
+        assert np.array_equal(block[:, 0], block[:, 1])
+        assert np.abs(block.astype(np.int32)).max() == 32767
+
+
+class TestSoundBackends:
+    """Test the pluggable audio output backends."""
+
+    def test_null_backend_produces_no_output(self, sound_system):
+        """Test that the null backend leaves the mixer usable without starting output."""
+        assert isinstance(sound_system.backend, NullAudioBackend)
+        assert sound_system.mixer_initialized == False
+        sound_system.cleanup()
+
+    def test_null_backend_is_silent_on_stdout(self, capsys):
+        """Test that only the pygame backend announces itself."""
+        NovaSound(backend=NullAudioBackend()).cleanup()
+        assert capsys.readouterr().out == ""
+
+    def test_offline_backend_is_deterministic(self, tmp_path):
+        """Test that offline rendering follows emulated time and repeats exactly."""
+        def render(path):
+            backend = OfflineAudioBackend(str(path))
+            system = NovaSound(backend=backend)
+            system.update_registers(sf=90, sv=200, sw=0xC5)  # Looping white noise, channel 0
+            system.splay()
+            system.strig(3)
+            backend.advance(0.25)
+            system.cleanup()
+            return backend.samples()
+
+        first = render(tmp_path / "first.wav")
+        second = render(tmp_path / "second.wav")
+        assert len(first) >= int(0.25 * 22050) and len(first) % 512 == 0
+        assert np.any(first) and np.array_equal(first, second)
+
+        with wave.open(str(tmp_path / "first.wav"), 'rb') as wav_file:
+            assert wav_file.getnchannels() == 2 and wav_file.getframerate() == 22050
+            data = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype='<i2')
+        assert np.array_equal(data.reshape(-1, 2), first)
+
+    def test_offline_backend_follows_cpu_cycles(self, memory, graphics, keyboard_device):
+        """Test that CPU.run advances offline audio by the emulated cycles it ran."""
+        backend = OfflineAudioBackend()
+        system = NovaSound(backend=backend)
+        processor = CPU(memory, graphics, keyboard_device, system)
+        cycles = CPU_CLOCK_HZ // 4
+        memory.write_block(0x0000, bytes([0xFF] * cycles))  # A quarter second of NOPs
+
+        result = processor.run(cycles)
+        assert result.cycles == cycles
+        frames = int(0.25 * system.sample_rate)
+        assert frames <= len(backend.samples()) < frames + system.block_size
+
+
 class TestSoundMemoryIntegration:
     """Test sound system memory integration."""
 
@@ -145,6 +261,123 @@ class TestSoundMemoryIntegration:
         assert sound_system.memory is memory
 
 
+class TestSoundMemorySamples:
+    """Test memory-based sample playback (waveform 7)."""
+
+    def test_sample_streams_from_memory(self, sound_system, memory):
+        """Test that samples longer than 1024 bytes stream and loop straight from RAM."""
+        sound_system.set_memory_reference(memory)
+        data = np.arange(3000) % 251
+        memory.write_block(0x3000, bytes(data.tolist()))
+        memory.write_word(0xF120, 3000)  # Sample length register
+        sound_system.update_registers(sa=0x3000, sf=150, sv=255, sw=0xC7)  # Looping memory sample
+        sound_system.splay()
+        sound_system.channel_states[0]['frequency'] = 440.0  # Native rate: one byte per frame
+
+        rendered = np.concatenate([sound_system.mix_block().copy() for _ in range(6)])
+        expected = np.resize(data, len(rendered)) / 127.5 - 1.0
+        assert np.allclose(rendered, expected, atol=1e-5)
+
+        # Writes to the sample are heard on the next block
+        position = int(sound_system.channel_states[0]['sample_position'])
+        memory.write_block(0x3000 + position, bytes([255] * 16))
+        assert np.allclose(sound_system.mix_block()[:16], 1.0)
+
+    def test_one_shot_sample_plays_once(self, sound_system, memory):
+        """Test that a one-shot sample stops after one pass at the SF playback rate."""
+        sound_system.set_memory_reference(memory)
+        memory.write_block(0x3000, bytes([200] * 2000))
+        memory.write_word(0xF120, 2000)
+        sound_system.update_registers(sa=0x3000, sf=200, sv=255, sw=0x87)
+        sound_system.splay()
+
+        step = sound_system._register_to_frequency(200) / 440.0
+        assert sound_system.channel_states[0]['length'] == int(np.ceil(2000 / step))
+        while sound_system.get_channel_status(0)['playing']:
+            sound_system.mix_block()
+        assert sound_system.channel_states[0]['position'] == sound_system.channel_states[0]['length']
+
+
+class TestSoundSequencer:
+    """Test the memory-mapped music sequencer."""
+
+    def _load_song(self, memory):
+        """Two 2-row patterns on 2 channels, played in the order 1, 0."""
+        song = [2, 1, 0]
+        song += [40, 0x42, 200, 0, 0, 0,          # Pattern 0, row 0: sine on channel 0
+                 NOTE_OFF, 0, 0, 0, 0, 0]         # Pattern 0, row 1: note off
+        song += [80, 0, 0, 120, 0x41, 100,        # Pattern 1, row 0: both channels
+                 0, 0, 50, 0, 0, 0]               # Pattern 1, row 1: channel 0 volume only
+        memory.write_block(0x4000, bytes(song))
+        memory.write_block(0xF132, bytes([0x40, 0x00, 240, 2, 2]))  # Song, tempo, rows, channels
+
+    def test_song_plays_on_the_audio_clock(self, sound_system, memory):
+        """Test that rows trigger at the tempo, update status and end the song."""
+        sound_system.set_memory_reference(memory)
+        self._load_song(memory)
+        row_frames = round(22050 * 60 / (240 * 4))
+        memory.write_byte(0xF130, 0x01)  # Play once
+
+        sound_system.mix_block()
+        channel0, channel1 = sound_system.channel_states[0], sound_system.channel_states[1]
+        assert channel0['playing'] and channel1['playing']
+        assert channel0['frequency'] == sound_system._register_to_frequency(80)
+        assert channel0['waveform'] == 1 and channel0['loop']  # Default instrument: looping square
+        assert channel1['waveform'] == 1 and channel1['volume'] == 100 / 255
+        assert memory.read_byte(0xF131) == 0 and memory.read_byte(0xF137) == 0
+
+        frames = 512
+        while frames <= row_frames:
+            sound_system.mix_block()
+            frames += 512
+        assert channel0['volume'] == 50 / 255 and channel0['position'] == frames  # Not retriggered
+        assert memory.read_byte(0xF131) == 1
+
+        while frames <= 2 * row_frames:
+            sound_system.mix_block()
+            frames += 512
+        assert channel0['waveform'] == 2 and channel0['position'] == frames - 2 * row_frames  # Exact row start
+        assert channel0['volume'] == 200 / 255
+
+        while frames <= 3 * row_frames:
+            sound_system.mix_block()
+            frames += 512
+        assert memory.read_byte(0xF137) == 1 and memory.read_byte(0xF131) == 1
+        assert channel0['waveform'] == 2 and not channel0['playing']  # Note off after the sine row
+        assert channel1['playing']
+
+        while frames <= 4 * row_frames:
+            sound_system.mix_block()
+            frames += 512
+        assert not sound_system.sequencer.playing
+        assert memory.read_byte(0xF130) == 0x00 and not channel1['playing']
+
+    def test_loop_and_stop(self, sound_system, memory):
+        """Test that the loop bit restarts the song and clearing play stops it."""
+        sound_system.set_memory_reference(memory)
+        self._load_song(memory)
+        memory.write_byte(0xF130, 0x03)  # Play, loop
+        for _ in range(30):
+            sound_system.mix_block()
+        assert sound_system.sequencer.playing and memory.read_byte(0xF130) == 0x03
+
+        memory.write_byte(0xF130, 0x00)
+        assert not sound_system.sequencer.playing
+        assert not any(sound_system.get_channel_status(channel)['playing'] for channel in range(2))
+        assert not np.any(sound_system.mix_block())
+
+    def test_song_follows_cpu_cycles_without_output(self, cpu, memory):
+        """Test that rows advance with emulated cycles on the null backend."""
+        self._load_song(memory)
+        memory.write_byte(0xF130, 0x01)  # Play once
+        cycles = CPU_CLOCK_HZ * 60 // (240 * 4) + 1000  # Just past the second row
+        memory.write_block(0x0000, bytes([0xFF] * cycles))  # NOPs
+
+        cpu.run(cycles)
+        assert memory.read_byte(0xF131) == 1 and memory.read_byte(0xF137) == 0
+        assert cpu.sound.channel_states[0]['volume'] == 50 / 255
+
+
 class TestSoundTimerIntegration:
     """Test sound system timer integration."""
 